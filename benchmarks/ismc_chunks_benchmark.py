@@ -0,0 +1,82 @@
+"""
+Benchmark of the building of the ISMC `<c t d r>` chunks of a stream:
+chunk by chunk Decimal arithmetic against ChunkTimelineBuilder.
+
+Run from the repository root:
+    python -m benchmarks.ismc_chunks_benchmark [-hours 3]
+"""
+import argparse
+import decimal
+import time
+from typing import List
+
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.chunk_timeline_builder import ChunkTimelineBuilder
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.chunk_data import ChunkData
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_timeline import TrackTimeline
+
+TIME_SCALE = 10000000
+
+# (name, timescale, repeated pattern of chunk durations in ticks)
+TRACKS = [
+    ('video, 2 s fragments', 90000, [180000]),
+    ('audio, 48 kHz AAC', 48000, [96256, 96256, 95232]),
+    ('video, 29.97 fps frames', 30000, [1001]),
+]
+
+
+def get_chunks_per_chunk(chunk_durations: List[float], timescale: int) -> List[ChunkData]:
+    """Chunks built by IsmcGenerator before ChunkTimelineBuilder"""
+    c = []
+    current_r = 1
+    time_start = 0
+    time_start_round = 0
+    for index, chunk in enumerate(chunk_durations):
+        duration = decimal.Decimal(str(chunk * timescale))
+        if index == 0:
+            c.append(ChunkData(time_start=str(time_start), duration=duration, r=str(current_r)))
+            continue
+        time_start += c[-1].duration
+        time_start_round += round(c[-1].duration)
+        diff = round(time_start) - time_start_round
+        if diff != 0:
+            if int(c[-1].r) > 1:
+                c[-1].r = str(int(c[-1].r) - 1)
+                c.append(ChunkData(duration=c[-1].duration + diff, r='1'))
+            else:
+                c[-1].duration += diff
+            time_start_round += diff
+        if c[-1].duration == duration:
+            current_r += 1
+            c[-1].r = str(current_r)
+        else:
+            current_r = 1
+            c.append(ChunkData(duration=duration, r=str(current_r)))
+    return c
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the building of the ISMC chunks.')
+    parser.add_argument('-hours', type=float, default=3, help='Duration of the generated tracks in hours. Default is 3.')
+    args = parser.parse_args()
+
+    for name, timescale, pattern in TRACKS:
+        chunks_count = int(args.hours * 3600 * timescale / (sum(pattern) / len(pattern)))
+        timeline = TrackTimeline.from_durations(timescale, (pattern[index % len(pattern)] for index in range(chunks_count)))
+        chunk_durations = timeline.to_seconds()
+
+        start = time.perf_counter()
+        before = get_chunks_per_chunk(chunk_durations, TIME_SCALE)
+        before_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        after = ChunkTimelineBuilder.build(timeline, TIME_SCALE)
+        after_elapsed = time.perf_counter() - start
+
+        assert [(chunk.time_start, str(chunk.duration), chunk.r) for chunk in before] == \
+               [(chunk.time_start, str(chunk.duration), chunk.r) for chunk in after], f'Different chunks for {name}'
+        print(f'{name:<25} {chunks_count} chunks, {len(after)} c elements: '
+              f'chunk by chunk {before_elapsed:8.3f} s, builder {after_elapsed * 1000:8.3f} ms, x{before_elapsed / after_elapsed:.0f}')
+
+
+if __name__ == '__main__':
+    main()
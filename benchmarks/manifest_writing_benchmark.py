@@ -0,0 +1,84 @@
+"""
+Benchmark of the writing of a client manifest (.ismc):
+whole ElementTree serialization against the streaming XmlStreamWriter, in time and peak memory.
+
+Run from the repository root:
+    python -m benchmarks.manifest_writing_benchmark [-hours 24]
+"""
+import argparse
+import io
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from external_asset_ism_ismc_generation_tool.common.xml_stream_writer import XmlStreamWriter
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.chunk_data import ChunkData
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.quality_level import QualityLevel
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.smooth_streaming_media import SmoothStreamingMedia
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.stream_index import StreamIndex
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.stream_type import StreamType
+
+# (name, chunk durations in 100 ns pattern, stream count)
+STREAMS = [
+    ('audio', [20053333, 20053334, 19840000], 4),
+    ('video', [20020000, 20020000, 10010000], 2),
+]
+
+
+def get_document(hours: float) -> SmoothStreamingMedia:
+    document = SmoothStreamingMedia(duration=str(int(hours * 3600 * 10000000)))
+    for name, pattern, stream_count in STREAMS:
+        chunks_count = int(hours * 3600 * 10000000 * len(pattern) / sum(pattern))
+        for index in range(stream_count):
+            stream_index = StreamIndex(StreamType.VIDEO if name == 'video' else StreamType.AUDIO, str(chunks_count), '1',
+                                       'QualityLevels({bitrate})/Fragments(' + name + '={start time})', name=f'{name}_{index}')
+            stream_index.add_quality_level(QualityLevel(index='0', bitrate='128000', four_cc='mp4a'))
+            for chunk_index in range(chunks_count):
+                stream_index.add_chunk_data(ChunkData(time_start='0' if chunk_index == 0 else None,
+                                                      duration=pattern[chunk_index % len(pattern)], r='1'))
+            document.add_stream_index(stream_index)
+    return document
+
+
+def write_with_element_tree(document: SmoothStreamingMedia) -> str:
+    xml_ismc = document.to_xml()
+    ET.indent(xml_ismc)
+    return ET.tostring(xml_ismc, encoding="utf-8", method="xml", xml_declaration=True).decode("utf-8")
+
+
+def write_with_stream_writer(document: SmoothStreamingMedia) -> str:
+    sink = io.StringIO()
+    writer = XmlStreamWriter(sink)
+    document.write_xml(writer)
+    writer.close()
+    return sink.getvalue()
+
+
+def measure(function, document: SmoothStreamingMedia):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(document)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the writing of a client manifest.')
+    parser.add_argument('-hours', type=float, default=24, help='Duration of the generated archive in hours. Default is 24.')
+    args = parser.parse_args()
+
+    document = get_document(args.hours)
+    chunks_count = sum(len(stream_index.chunk_datas) for stream_index in document.stream_indexes)
+    before, before_elapsed, before_peak = measure(write_with_element_tree, document)
+    after, after_elapsed, after_peak = measure(write_with_stream_writer, document)
+
+    assert before == after, 'Different manifests'
+    print(f'{chunks_count} chunks, {len(after) // 1024} KiB manifest')
+    print(f'ElementTree:     {before_elapsed:8.3f} s, peak memory {before_peak / 2 ** 20:8.1f} MiB')
+    print(f'XmlStreamWriter: {after_elapsed:8.3f} s, peak memory {after_peak / 2 ** 20:8.1f} MiB (the returned string included)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark of the moof boxes decoding: pymp4 (construct) parsing against TrackFragmentDecoder.
+
+Run from the repository root:
+    python -m benchmarks.moof_decoding_benchmark [-fragments 10000]
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from tools.pymp4.src.pymp4.parser import Box
+
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.media_box_extractor import MediaBoxExtractor
+from external_asset_ism_ismc_generation_tool.media_data_parser.moof_demuxer import MoofDemuxer
+from external_asset_ism_ismc_generation_tool.media_data_parser.track_fragment_decoder import TrackFragmentDecoder
+from tests.test_utils.common.mp4_box_builder import Mp4BoxBuilder
+
+VIDEO_SAMPLES = 48  # 2 s at 24 fps
+AUDIO_SAMPLES = 94  # 2 s of 48 kHz AAC
+
+
+def build_moof_boxes(fragments_count: int) -> List[bytes]:
+    """Moof boxes of a 2-second fragmented asset with a video and an audio track interleaved"""
+    moof_boxes = []
+    for index in range(fragments_count):
+        video_traf = Mp4BoxBuilder.traf(
+            Mp4BoxBuilder.tfhd(1),
+            Mp4BoxBuilder.tfdt(index * VIDEO_SAMPLES * 1001),
+            Mp4BoxBuilder.trun([1001] * VIDEO_SAMPLES, [5000 + sample for sample in range(VIDEO_SAMPLES)],
+                               sample_flags=True, composition_time_offsets=True, data_offset=0),
+        )
+        audio_traf = Mp4BoxBuilder.traf(
+            Mp4BoxBuilder.tfhd(2),
+            Mp4BoxBuilder.tfdt(index * AUDIO_SAMPLES * 1024),
+            Mp4BoxBuilder.trun([1024] * AUDIO_SAMPLES, [380] * AUDIO_SAMPLES, data_offset=0),
+        )
+        moof_boxes.append(Mp4BoxBuilder.moof(video_traf, audio_traf, sequence_number=index + 1))
+    return moof_boxes
+
+
+def decode_with_pymp4(moof_boxes: List[bytes]) -> None:
+    """Decoding done by MediaDataParser before TrackFragmentDecoder"""
+    for moof_box in moof_boxes:
+        moof_atom = MediaBoxExtractor.get_mp4_box(MediaBoxExtractor.extract_media_boxes(moof_box), 'moof')
+        for traf_atom in MediaBoxExtractor.get_all_mp4_sub_boxes(moof_atom, 'traf'):
+            MediaBoxExtractor.get_mp4_sub_box(traf_atom, 'tfhd')
+            trun_atom = MediaBoxExtractor.get_mp4_sub_box(traf_atom, 'trun')
+            sum(sample.sample_duration for sample in trun_atom.sample_info)
+            sum(sample.sample_size for sample in trun_atom.sample_info)
+
+
+def decode_with_track_fragment_decoder(moof_boxes: List[bytes]) -> None:
+    for moof_box in moof_boxes:
+        TrackFragmentDecoder.decode_moof(moof_box)
+
+
+def measure(name: str, decode: Callable[[List[bytes]], None], moof_boxes: List[bytes]) -> float:
+    start = time.perf_counter()
+    decode(moof_boxes)
+    elapsed = time.perf_counter() - start
+    print(f'{name:<28} {elapsed:8.3f} s total, {elapsed / len(moof_boxes) * 1e6:10.1f} us per moof')
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the moof boxes decoding.')
+    parser.add_argument('-fragments', type=int, default=10000, help='Number of moof boxes of the generated asset. Default is 10000.')
+    args = parser.parse_args()
+
+    moof_boxes = build_moof_boxes(args.fragments)
+    print(f'{len(moof_boxes)} moof boxes, {sum(len(moof_box) for moof_box in moof_boxes)} bytes')
+    trex_atoms = [Box.parse(Mp4BoxBuilder.trex(1)), Box.parse(Mp4BoxBuilder.trex(2))]
+
+    before = measure('pymp4 (construct)', decode_with_pymp4, moof_boxes)
+    after = measure('TrackFragmentDecoder', decode_with_track_fragment_decoder, moof_boxes)
+    measure('MoofDemuxer (all tracks)', lambda boxes: MoofDemuxer.demux(boxes, trex_atoms), moof_boxes)
+    print(f'Speedup: x{before / after:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark of the chunking of progressive MP4 video tracks from their stts and stss boxes:
+sample by sample chunking against the run-length chunking of STTSParser.
+
+Run from the repository root:
+    python -m benchmarks.stts_chunking_benchmark [-hours 3]
+"""
+import argparse
+import time
+from array import array
+from typing import List, Optional
+
+from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.stts_parser import STTSParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.sample_table import TimeToSampleTable
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_type import TrackType
+
+# (name, timescale, sample delta, key frame interval in samples)
+TRACKS = [
+    ('50 fps, 2 s GOP', 50000, 1000, 100),
+    ('59.94 fps, 2 s GOP', 60000, 1001, 120),
+    ('60 fps, 1 s GOP', 60000, 1000, 60),
+]
+
+
+def get_chunk_durations_per_sample(stts_table: TimeToSampleTable, timescale: int, key_frames_numbers: Optional[List[str]]) -> list:
+    """Chunking done by STTSParser before the run-length engine, key frames given as strings by the former STSSParser"""
+    chunk_durations = []
+    sample_number = 1
+    chunk_duration = 0
+    cumulative = 0
+    for sample_count, sample_duration in zip(stts_table.sample_counts, stts_table.sample_deltas):
+        cumulative += sample_count
+        while sample_number <= cumulative:
+            if chunk_duration >= 2 * timescale and str(sample_number) in key_frames_numbers:
+                chunk_durations.append(chunk_duration / timescale)
+                chunk_duration = 0
+            elif chunk_duration > 2 * timescale:
+                chunk_durations.append(chunk_duration / timescale)
+                chunk_duration = 0
+            chunk_duration += sample_duration
+            sample_number += 1
+    chunk_durations.append(chunk_duration / timescale)
+    return chunk_durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the chunking of video tracks from stts and stss.')
+    parser.add_argument('-hours', type=float, default=3, help='Duration of the generated tracks in hours. Default is 3.')
+    args = parser.parse_args()
+
+    for name, timescale, sample_delta, key_frame_interval in TRACKS:
+        samples_count = int(args.hours * 3600 * timescale / sample_delta)
+        # A few frames with a different duration split the stts box in several entries
+        stts_table = TimeToSampleTable(array('I', [samples_count // 2, 1, samples_count - samples_count // 2 - 1]),
+                                       array('I', [sample_delta, sample_delta * 2, sample_delta]))
+        key_frames = array('I', range(1, samples_count + 1, key_frame_interval))
+
+        start = time.perf_counter()
+        before = get_chunk_durations_per_sample(stts_table, timescale, [str(key_frame) for key_frame in key_frames])
+        before_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        after = STTSParser(stts_table).get_chunk_durations_from_stts(TrackType.VIDEO, timescale, key_frames)
+        after_elapsed = time.perf_counter() - start
+
+        assert before == after.to_seconds(), f'Different chunks for {name}'
+        print(f'{name:<20} {samples_count} samples, {len(after)} chunks: '
+              f'sample by sample {before_elapsed:8.3f} s, run-length {after_elapsed * 1000:8.3f} ms, x{before_elapsed / after_elapsed:.0f}')
+
+
+if __name__ == '__main__':
+    main()
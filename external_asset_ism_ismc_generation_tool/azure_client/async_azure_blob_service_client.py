@@ -0,0 +1,110 @@
+import asyncio
+from typing import Dict, IO, List, Optional, Union
+
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.storage.blob import BlobProperties
+from azure.storage.blob.aio import BlobServiceClient, BlobClient
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+
+
+class AsyncAzureBlobServiceClient:
+    """
+    asyncio counterpart of AzureBlobServiceClient built on azure.storage.blob.aio.
+    At most `max_in_flight_requests` requests are outstanding at once, whatever the number of blobs processed concurrently.
+    Shall be used as an async context manager: `async with AsyncAzureBlobServiceClient(settings) as client:`
+    """
+    _DEFAULT_MAX_IN_FLIGHT_REQUESTS = 256
+    _DEFAULT_CONNECTION_TIMEOUT = 20  # seconds
+    _DEFAULT_READ_TIMEOUT = 60  # seconds
+    __logger: ILogger = Logger("AsyncAzureBlobServiceClient")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    def __init__(self, settings: dict):
+
+        try:
+            self.container_name = settings["container_name"]
+        except KeyError as exc:
+            missing_key = exc.args[0] if exc.args else "unknown"
+            self.__logger.error(f"Required setting '{missing_key}' is missing.")
+            raise ValueError(f"Missing required setting: {missing_key}") from exc
+
+        self.connection_string = self.__get_connection_string(settings)
+        self.fragment_read_workers = settings.get('fragment_read_workers', 8)
+        self.read_block_size = settings.get('read_block_size', 65536)
+        self.read_cache_blocks = settings.get('read_cache_blocks', 32)
+        self.max_in_flight_requests = settings.get('max_in_flight_requests', self._DEFAULT_MAX_IN_FLIGHT_REQUESTS)
+        self.http_pool_size = settings.get('http_pool_size') or self.max_in_flight_requests
+        self.__connection_timeout = settings.get('http_connection_timeout', self._DEFAULT_CONNECTION_TIMEOUT)
+        self.__read_timeout = settings.get('http_read_timeout', self._DEFAULT_READ_TIMEOUT)
+
+        self.blob_service_client: Optional[BlobServiceClient] = None
+        self.container_client = None
+        self.__blob_clients: Dict[str, BlobClient] = {}
+        self.__requests_semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        # The aiohttp session and the semaphore are bound to the running event loop
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.http_pool_size))
+        self.blob_service_client = BlobServiceClient.from_connection_string(
+            self.connection_string,
+            transport=AioHttpTransport(session=session, session_owner=True,
+                                       connection_timeout=self.__connection_timeout, read_timeout=self.__read_timeout)
+        )
+        self.container_client = self.blob_service_client.get_container_client(self.container_name)
+        self.__requests_semaphore = asyncio.Semaphore(self.max_in_flight_requests)
+        self.__logger.info(f'Azure async I/O with at most {self.max_in_flight_requests} requests in flight')
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.blob_service_client.close()
+
+    async def get_list_of_blobs(self) -> List[BlobProperties]:
+        async with self.__requests_semaphore:
+            return [blob async for blob in self.container_client.list_blobs()]
+
+    async def download_part_of_blob(self, blob_name: str, offset=None, length=None) -> bytes:
+        blob_client = self.get_blob_client(blob_name)
+        async with self.__requests_semaphore:
+            stream = await blob_client.download_blob(offset=offset, length=length)
+            return await stream.readall()
+
+    async def get_blob_size(self, blob_name: str) -> int:
+        blob_client = self.get_blob_client(blob_name)
+        async with self.__requests_semaphore:
+            properties = await blob_client.get_blob_properties()
+            return properties.size
+
+    async def upload_blob_to_container(self, blob_name: str, content: Union[str, IO[bytes]], overwrite: bool = False):
+        """Upload `content`, a string or a binary stream read from its current position"""
+        blob_client = self.get_blob_client(blob_name)
+        async with self.__requests_semaphore:
+            await blob_client.upload_blob(content.encode() if isinstance(content, str) else content, overwrite=overwrite)
+
+    async def blob_exists(self, blob_name: str) -> bool:
+        blob_client = self.get_blob_client(blob_name)
+        async with self.__requests_semaphore:
+            return await blob_client.exists()
+
+    def get_blob_client(self, blob_name: str) -> BlobClient:
+        blob_client = self.__blob_clients.get(blob_name)
+        if blob_client is None:
+            blob_client = self.container_client.get_blob_client(blob_name)
+            self.__blob_clients[blob_name] = blob_client
+        return blob_client
+
+    def __get_connection_string(self, settings: dict):
+        if 'connection_string' in settings:
+            return settings['connection_string']
+        elif 'account_name' in settings and 'account_key' in settings:
+            return f"DefaultEndpointsProtocol=https;" \
+                   f"AccountName={settings['account_name']};" \
+                   f"AccountKey={settings['account_key']};" \
+                   f"EndpointSuffix=core.windows.net"
+        else:
+            self.__logger.error(f'Azure Connection string is not defined in settings: {settings}')
+            raise ValueError("Azure connection string is not defined")
@@ -1,11 +1,18 @@
 import io
+from os import cpu_count
+from threading import Lock
+from typing import Dict, IO, Union
 
+import requests
+from azure.core.pipeline.transport import RequestsTransport
 from azure.storage.blob import BlobServiceClient, BlobClient
 from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
 from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
 
 
 class AzureBlobServiceClient:
+    _DEFAULT_CONNECTION_TIMEOUT = 20  # seconds
+    _DEFAULT_READ_TIMEOUT = 60  # seconds
     __logger: ILogger = Logger("AzureBlobServiceClient")
 
     @classmethod
@@ -23,28 +30,72 @@ class AzureBlobServiceClient:
 
         self.connection_string = self.__get_connection_string(settings)
 
-        self.blob_service_client: BlobServiceClient = BlobServiceClient.from_connection_string(self.connection_string)
-        self.container_client = self.blob_service_client.get_container_client(self.container_name)
         self.is_multithreading = settings['is_multithreading']
+        self.fragment_read_workers = settings.get('fragment_read_workers', 8)
+        self.http_pool_size = settings.get('http_pool_size') or self.__get_default_http_pool_size()
+
+        self.blob_service_client: BlobServiceClient = BlobServiceClient.from_connection_string(
+            self.connection_string,
+            transport=self.__create_transport(settings)
+        )
+        self.container_client = self.blob_service_client.get_container_client(self.container_name)
+        self.__blob_clients: Dict[str, BlobClient] = {}
+        self.__blob_clients_lock = Lock()
+        self.read_block_size = settings.get('read_block_size', 65536)
+        self.read_cache_blocks = settings.get('read_cache_blocks', 32)
 
     def get_list_of_blobs(self):
         return self.container_client.list_blobs()
 
     def download_part_of_blob(self, blob_name: str, offset=None, length=None):
-        blob_client = BlobClient.from_connection_string(conn_str=self.connection_string,
-                                                        container_name=self.container_name,
-                                                        blob_name=blob_name)
+        blob_client = self.get_blob_client(blob_name)
         return blob_client.download_blob(offset=offset, length=length).readall()
 
-    def upload_blob_to_container(self, blob_name: str, content: str, overwrite: bool = False):
-        stream = io.BytesIO(content.encode())
-        blob_client = self.container_client.get_blob_client(blob_name)
+    def get_blob_size(self, blob_name: str) -> int:
+        blob_client = self.get_blob_client(blob_name)
+        return blob_client.get_blob_properties().size
+
+    def get_blob_client(self, blob_name: str) -> BlobClient:
+        """
+        Returns the client of the blob, created once per blob from the container client
+        so all the range reads share the same pipeline and HTTP connection pool
+        """
+        blob_client = self.__blob_clients.get(blob_name)
+        if blob_client is None:
+            with self.__blob_clients_lock:
+                blob_client = self.__blob_clients.get(blob_name)
+                if blob_client is None:
+                    blob_client = self.container_client.get_blob_client(blob_name)
+                    self.__blob_clients[blob_name] = blob_client
+        return blob_client
+
+    def upload_blob_to_container(self, blob_name: str, content: Union[str, IO[bytes]], overwrite: bool = False):
+        """Upload `content`, a string or a binary stream read from its current position"""
+        stream = io.BytesIO(content.encode()) if isinstance(content, str) else content
+        blob_client = self.get_blob_client(blob_name)
         blob_client.upload_blob(stream, overwrite=overwrite)
 
     def blob_exists(self, blob_name: str):
-        blob_client = self.container_client.get_blob_client(blob_name)
+        blob_client = self.get_blob_client(blob_name)
         return blob_client.exists()
 
+    def __get_default_http_pool_size(self) -> int:
+        # One connection per concurrent range read: blob workers times fragment read workers
+        blob_workers = cpu_count() if self.is_multithreading else 1
+        return blob_workers * max(self.fragment_read_workers, 1)
+
+    def __create_transport(self, settings: dict) -> RequestsTransport:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.http_pool_size, pool_maxsize=self.http_pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        self.__logger.info(f'Azure HTTP connection pool size: {self.http_pool_size}')
+        return RequestsTransport(
+            session=session,
+            connection_timeout=settings.get('http_connection_timeout', self._DEFAULT_CONNECTION_TIMEOUT),
+            read_timeout=settings.get('http_read_timeout', self._DEFAULT_READ_TIMEOUT)
+        )
+
     def __get_connection_string(self, settings: dict):
         if 'connection_string' in settings:
             return settings['connection_string']
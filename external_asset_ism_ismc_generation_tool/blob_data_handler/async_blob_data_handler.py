@@ -0,0 +1,91 @@
+import asyncio
+from typing import Dict, Union, Tuple, Optional
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.common.common import Common
+from external_asset_ism_ismc_generation_tool.azure_client.async_azure_blob_service_client import AsyncAzureBlobServiceClient
+from external_asset_ism_ismc_generation_tool.file_processor.async_file_processor import AsyncFileProcessor
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_format import MediaFormat
+from external_asset_ism_ismc_generation_tool.blob_data_handler.model.blob_media_data import BlobMediaData
+from external_asset_ism_ismc_generation_tool.text_data_parser.model.text_data_info import TextDataInfo
+
+
+class AsyncBlobDataHandler:
+    """
+    asyncio counterpart of BlobDataHandler: all the blobs are processed as concurrent coroutines,
+    the number of outstanding requests is bounded by the client.
+    """
+    __logger: ILogger = Logger("AsyncBlobDataHandler")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    @staticmethod
+    async def get_data_from_blobs(az_blob_service_client: AsyncAzureBlobServiceClient, settings: Optional[dict] = None) -> BlobMediaData:
+        AsyncBlobDataHandler.__logger.info(msg="Get blobs list from Azure container")
+        blobs_list = await az_blob_service_client.get_list_of_blobs()
+        if blobs_list is None:
+            AsyncBlobDataHandler.__logger.error(msg=f"Cannot find blobs inside the container {az_blob_service_client.container_name}")
+            raise ValueError(f"Cannot find blobs inside the container {az_blob_service_client.container_name}")
+
+        manifest_name = ""
+        media_datas = None
+        media_index_datas = None
+        text_datas_info = []
+
+        # Check if VTT files should be converted to CMFT (default: False)
+        convert_webvtt = settings.get('convert_webvtt', False) if settings else False
+
+        # If an ISM manifest already exists in the container, use its name (without extension) for the new manifests
+        for blob in blobs_list:
+            if blob.name.lower().endswith('.ism'):
+                manifest_name = blob.name.rsplit('.', 1)[0]
+                AsyncBlobDataHandler.__logger.info(f"Found existing manifest: {blob.name}, will use name: {manifest_name}")
+                break
+
+        results = await asyncio.gather(
+            *(AsyncBlobDataHandler.__process_blob(blob, az_blob_service_client, convert_webvtt) for blob in blobs_list),
+            return_exceptions=True
+        )
+
+        for blob, blob_result in zip(blobs_list, results):
+            blob_name = blob.name
+            if isinstance(blob_result, Exception):
+                AsyncBlobDataHandler.__logger.error(f"Error processing blob {blob_name}: {blob_result}")
+                continue
+            key, result = blob_result
+
+            # Set manifest name from first non-text file if not already set
+            # Skip VTT, TTML and CMFT files when determining manifest name
+            if not manifest_name and key:
+                is_text_file = blob_name.lower().endswith(('.vtt', '.ttml', '.cmft'))
+                if not is_text_file:
+                    manifest_name = key
+                    AsyncBlobDataHandler.__logger.info(f"Using manifest name from media file: {manifest_name}")
+
+            if MediaFormat.is_media_format(blob_name):
+                if not MediaFormat.is_mpi_format(blob_name):
+                    media_datas = Common.merge_dicts([media_datas, result])
+                else:
+                    media_index_datas = Common.merge_dicts([media_index_datas, result])
+            elif MediaFormat.is_text_format(blob_name):
+                if result is not None:
+                    text_datas_info.append(result)
+
+        return BlobMediaData(manifest_name, media_datas, media_index_datas, text_datas_info)
+
+    @staticmethod
+    async def __process_blob(blob, az_blob_service_client: AsyncAzureBlobServiceClient, convert_webvtt: bool = True) -> Tuple[Optional[str], Optional[Union[Dict[str, Dict], TextDataInfo]]]:
+        AsyncBlobDataHandler.__logger.info(msg=f"Handle blob {blob.name}")
+        key, format = Common.get_key_and_format(blob.name)
+        format = format.lower() if format else format
+
+        # Skip VTT files early if they will be converted to CMFT
+        if blob.name.lower().endswith('.vtt') and convert_webvtt:
+            AsyncBlobDataHandler.__logger.info(f"Skipping VTT file {blob.name} - will be converted to CMFT")
+            return key, None
+
+        result = await AsyncFileProcessor.process_file(format, blob.name, az_blob_service_client)
+        return key, result
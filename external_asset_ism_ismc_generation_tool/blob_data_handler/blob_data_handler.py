@@ -1,18 +1,22 @@
-from typing import Dict, Union, Tuple, Optional
+from typing import Dict, Iterator, List, Union, Tuple, Optional
 from os import cpu_count
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
 from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
 from external_asset_ism_ismc_generation_tool.common.common import Common
 from external_asset_ism_ismc_generation_tool.azure_client.azure_blob_service_client import AzureBlobServiceClient
 from external_asset_ism_ismc_generation_tool.file_processor.file_processor import FileProcessor
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_data_parser import MediaDataParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_data_pipeline import MediaDataPipeline
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_format import MediaFormat
 from external_asset_ism_ismc_generation_tool.blob_data_handler.model.blob_media_data import BlobMediaData
 from external_asset_ism_ismc_generation_tool.text_data_parser.model.text_data_info import TextDataInfo
 
 
 class BlobDataHandler:
+    # With a media data pipeline, blobs read and not yet consumed per reading thread
+    _PENDING_BLOBS_PER_THREAD = 2
     __logger: ILogger = Logger("BlobDataHandler")
     
     @classmethod
@@ -20,7 +24,15 @@ class BlobDataHandler:
         cls.__logger = logger
 
     @staticmethod
-    def get_data_from_blobs(az_blob_service_client: AzureBlobServiceClient, settings: Optional[dict] = None) -> BlobMediaData:
+    def get_data_from_blobs(az_blob_service_client: AzureBlobServiceClient, settings: Optional[dict] = None,
+                            media_data_pipeline: Optional[MediaDataPipeline] = None) -> BlobMediaData:
+        """
+        Read the blobs of the container.
+
+        With a media data pipeline, the boxes of a media blob are submitted to the pipeline as soon as they are read
+        instead of being returned in the BlobMediaData, while the next blobs are read: a blob is read only when
+        fewer than `_PENDING_BLOBS_PER_THREAD` blobs per reading thread are waiting to be consumed.
+        """
         BlobDataHandler.__logger.info(msg="Get blobs list from Azure container")
         blobs = az_blob_service_client.get_list_of_blobs()
         if blobs is None:
@@ -28,11 +40,18 @@ class BlobDataHandler:
             raise ValueError(f"Cannot find blobs inside the container {az_blob_service_client.container_client.container_name}")
 
         executor = None
+        max_pending_blobs = 0
         try:
             if az_blob_service_client.is_multithreading:
                 threads_num = cpu_count()
                 executor = ThreadPoolExecutor(max_workers=threads_num)
-            blob_media_data: BlobMediaData = BlobDataHandler.__process_blobs(blobs, az_blob_service_client, executor, settings)
+                max_pending_blobs = threads_num * BlobDataHandler._PENDING_BLOBS_PER_THREAD
+            elif media_data_pipeline:
+                # A single reading thread, the blobs are parsed by the calling thread
+                executor = ThreadPoolExecutor(max_workers=1)
+                max_pending_blobs = BlobDataHandler._PENDING_BLOBS_PER_THREAD
+            blob_media_data: BlobMediaData = BlobDataHandler.__process_blobs(blobs, az_blob_service_client, executor, settings,
+                                                                             media_data_pipeline, max_pending_blobs)
 
         finally:
             if executor:
@@ -41,14 +60,19 @@ class BlobDataHandler:
         return blob_media_data
 
     @staticmethod
-    def __process_blobs(blobs, az_blob_service_client: AzureBlobServiceClient, executor: ThreadPoolExecutor, settings: Optional[dict] = None) -> BlobMediaData:
+    def __process_blobs(blobs, az_blob_service_client: AzureBlobServiceClient, executor: ThreadPoolExecutor, settings: Optional[dict] = None,
+                        media_data_pipeline: Optional[MediaDataPipeline] = None, max_pending_blobs: int = 0) -> BlobMediaData:
         manifest_name = ""
         media_datas = None
         media_index_datas = None
         text_datas_info = []
+        media_blob_names = []
+        media_index_blob_names = []
         
         # Check if VTT files should be converted to CMFT (default: False)
         convert_webvtt = settings.get('convert_webvtt', False) if settings else False
+        # The media files are read by the worker processes parsing them, only their names are collected here
+        parse_in_workers = MediaDataParser.is_parse_in_workers(settings)
         
         # Convert iterator to list to allow multiple iterations
         blobs_list = list(blobs)
@@ -62,12 +86,15 @@ class BlobDataHandler:
                 BlobDataHandler.__logger.info(f"Found existing manifest: {blob.name}, will use name: {manifest_name}")
                 break
 
-        task_mapping = BlobDataHandler.__map_blob_tasks(blobs_list, az_blob_service_client, executor, convert_webvtt)
+        process_blob = lambda blob: BlobDataHandler.__process_blob(blob, az_blob_service_client, convert_webvtt, parse_in_workers)
+        if media_data_pipeline:
+            completed_tasks = BlobDataHandler.__get_bounded_completed_tasks(blobs_list, process_blob, executor, max_pending_blobs)
+        else:
+            completed_tasks = BlobDataHandler.__get_completed_tasks(BlobDataHandler.__map_blob_tasks(blobs_list, process_blob, executor), executor)
 
-        for task in Common.get_completed_tasks(task_mapping, executor):
-            blob_name = task_mapping[task] if executor else task
+        for blob_name, task in completed_tasks:
             try:
-                key, result = task.result() if executor else task_mapping[task]
+                key, result = task.result() if isinstance(task, Future) else task
                 
                 # Set manifest name from first non-text file if not already set
                 # Skip VTT, TTML and CMFT files when determining manifest name
@@ -77,7 +104,13 @@ class BlobDataHandler:
                         manifest_name = key
                         BlobDataHandler.__logger.info(f"Using manifest name from media file: {manifest_name}")
 
-                if MediaFormat.is_media_format(blob_name):
+                if MediaFormat.is_media_format(blob_name) and parse_in_workers:
+                    (media_index_blob_names if MediaFormat.is_mpi_format(blob_name) else media_blob_names).append(blob_name)
+                elif MediaFormat.is_media_format(blob_name) and media_data_pipeline:
+                    # The boxes are released once parsed, instead of being merged with the boxes of all the blobs
+                    for media_blob_name, media_data in (result or {}).items():
+                        media_data_pipeline.submit(media_blob_name, media_data)
+                elif MediaFormat.is_media_format(blob_name):
                     if not MediaFormat.is_mpi_format(blob_name):
                         media_datas = Common.merge_dicts([media_datas, result])
                     else:
@@ -89,10 +122,11 @@ class BlobDataHandler:
             except Exception as e:
                 BlobDataHandler.__logger.error(f"Error processing blob {blob_name}: {e}")
 
-        return BlobMediaData(manifest_name, media_datas, media_index_datas, text_datas_info)
+        return BlobMediaData(manifest_name, media_datas, media_index_datas, text_datas_info, media_blob_names, media_index_blob_names)
 
     @staticmethod
-    def __process_blob(blob, az_blob_service_client: AzureBlobServiceClient, convert_webvtt: bool = True) -> Tuple[Optional[str], Optional[Union[Dict[str, Dict], TextDataInfo]]]:
+    def __process_blob(blob, az_blob_service_client: AzureBlobServiceClient, convert_webvtt: bool = True,
+                       parse_in_workers: bool = False) -> Tuple[Optional[str], Optional[Union[Dict[str, Dict], TextDataInfo]]]:
         BlobDataHandler.__logger.info(msg=f"Handle blob {blob.name}")
         key, format = Common.get_key_and_format(blob.name)
         # Normalize format to lowercase for consistent processing
@@ -103,13 +137,26 @@ class BlobDataHandler:
         if is_vtt and convert_webvtt:
             BlobDataHandler.__logger.info(f"Skipping VTT file {blob.name} - will be converted to CMFT")
             return key, None
+
+        if parse_in_workers and MediaFormat.is_media_format(blob.name):
+            return key, None
         
         result = FileProcessor.process_file(format, blob.name, az_blob_service_client)
         return key, result
 
     @staticmethod
-    def __map_blob_tasks(blobs, az_blob_service_client: AzureBlobServiceClient, executor: ThreadPoolExecutor, convert_webvtt: bool = True) -> any:
+    def __map_blob_tasks(blobs, process_blob, executor: ThreadPoolExecutor) -> any:
         if executor:
-            return {executor.submit(BlobDataHandler.__process_blob, blob, az_blob_service_client, convert_webvtt): blob.name for blob in blobs}
+            return {executor.submit(process_blob, blob): blob.name for blob in blobs}
         else:
-            return {blob.name: BlobDataHandler.__process_blob(blob, az_blob_service_client, convert_webvtt) for blob in blobs}
+            return {blob.name: process_blob(blob) for blob in blobs}
+
+    @staticmethod
+    def __get_completed_tasks(task_mapping, executor: ThreadPoolExecutor) -> Iterator[Tuple[str, any]]:
+        for task in Common.get_completed_tasks(task_mapping, executor):
+            yield (task_mapping[task], task) if executor else (task, task_mapping[task])
+
+    @staticmethod
+    def __get_bounded_completed_tasks(blobs: List, process_blob, executor: ThreadPoolExecutor, max_pending_blobs: int) -> Iterator[Tuple[str, Future]]:
+        for blob, task in Common.get_bounded_completed_tasks(blobs, process_blob, executor, max_pending_blobs):
+            yield blob.name, task
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from external_asset_ism_ismc_generation_tool.common.base_model import BaseModel
 from external_asset_ism_ismc_generation_tool.text_data_parser.model.text_data_info import TextDataInfo
@@ -10,6 +10,9 @@ media_datas has the next structure:
     "moofs": [b"moof box in bytes", ...]
 },
 "file_2": {...}
+
+When the media files are parsed in worker processes, their boxes are not read by the data handler:
+media_datas and media_index_datas are empty and media_blob_names and media_index_blob_names list the files to parse.
 """
 
 
@@ -18,12 +21,18 @@ class BlobMediaData(BaseModel):
     media_datas: Dict[str, dict]
     media_index_datas: Dict[str, dict]
     text_data_info_list: List[TextDataInfo]
+    media_blob_names: List[str]
+    media_index_blob_names: List[str]
 
     def __init__(self, manifest_name: str,
                  media_datas: Dict[str, dict],
                  media_index_datas: Dict[str, dict],
-                 text_data_info_list: List[TextDataInfo]):
+                 text_data_info_list: List[TextDataInfo],
+                 media_blob_names: Optional[List[str]] = None,
+                 media_index_blob_names: Optional[List[str]] = None):
         self.manifest_name = manifest_name
         self.media_datas = media_datas
         self.media_index_datas = media_index_datas
         self.text_data_info_list = text_data_info_list
+        self.media_blob_names = media_blob_names or []
+        self.media_index_blob_names = media_index_blob_names or []
@@ -1,10 +1,11 @@
 import json
 import os
 import re
-from typing import Optional, Tuple, Union, List
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union, List
 import pycountry
 
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait
 
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_format import MediaFormat
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_track_info import MediaTrackInfo
@@ -72,6 +73,24 @@ class Common:
     def get_completed_tasks(task_mapping, executor: Union[ThreadPoolExecutor, ProcessPoolExecutor]) -> any:
         return as_completed(task_mapping) if executor else task_mapping
 
+    @staticmethod
+    def get_bounded_completed_tasks(items: Iterable, function: Callable, executor: Union[ThreadPoolExecutor, ProcessPoolExecutor],
+                                    max_pending_tasks: int) -> Iterator[Tuple[any, Future]]:
+        """
+        Submit `function(item)` for each item and yield the items with their futures as the tasks complete.
+        At most `max_pending_tasks` tasks are submitted and not yet yielded: a task is submitted when another one is yielded,
+        so the results are released by the consumer while the next tasks run instead of piling up.
+        """
+        items = iter(items)
+        pending_tasks = {executor.submit(function, item): item for item in islice(items, max_pending_tasks)}
+        while pending_tasks:
+            done_tasks, _ = wait(pending_tasks, return_when=FIRST_COMPLETED)
+            for task in done_tasks:
+                item = pending_tasks.pop(task)
+                for next_item in islice(items, 1):
+                    pending_tasks[executor.submit(function, next_item)] = next_item
+                yield item, task
+
     @staticmethod
     def extract_language_from_filename(filename: str) -> Optional[str]:
         """
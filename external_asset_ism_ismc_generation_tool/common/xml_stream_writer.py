@@ -0,0 +1,88 @@
+import xml.etree.ElementTree as ET
+from typing import Dict, List, TextIO
+
+
+class XmlStreamWriter:
+    """
+    Writes an XML document element by element to a text sink (file, io.StringIO, upload buffer...).
+
+    The output is the same as `ET.indent()` (two spaces) followed by
+    `ET.tostring(..., encoding="utf-8", xml_declaration=True).decode("utf-8")` of the whole document,
+    without building the whole tree: large documents can be written one small element at a time.
+    Elements shall not have text nor tail, as the elements of the manifests models.
+    """
+    XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+    DEFAULT_BUFFER_SIZE = 65536  # 64 KiB
+    __INDENTATION = "  "
+
+    def __init__(self, sink: TextIO, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            sink: Text stream the document is written to
+            buffer_size: Number of characters buffered before a write to the sink
+        """
+        self.__sink = sink
+        self.__buffer_size = buffer_size
+        self.__buffer: List[str] = [self.XML_DECLARATION]
+        self.__buffered_length = len(self.XML_DECLARATION)
+        self.__open_tags: List[str] = []
+        # True while the start tag of the last opened element is not closed, so it can still become an empty element
+        self.__is_start_tag_pending = False
+        self.__indentations = ["\n"]
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        """Open an element, its children are the elements written until the matching end()"""
+        if self.__is_start_tag_pending:
+            self.__write(">")
+        # The root element directly follows the XML declaration
+        indentation = self.__get_indentation(len(self.__open_tags)) if self.__open_tags else ""
+        self.__write(f"{indentation}<{tag}")
+        for name, value in attrib.items():
+            self.__write(f' {name}="{XmlStreamWriter.__escape_attribute(value)}"')
+        self.__open_tags.append(tag)
+        self.__is_start_tag_pending = True
+
+    def end(self) -> None:
+        """Close the last opened element"""
+        tag = self.__open_tags.pop()
+        if self.__is_start_tag_pending:
+            self.__write(" />")
+            self.__is_start_tag_pending = False
+        else:
+            self.__write(f"{self.__get_indentation(len(self.__open_tags))}</{tag}>")
+
+    def write(self, element: ET.Element) -> None:
+        """Write a whole element with its children"""
+        self.start(element.tag, element.attrib)
+        for child in element:
+            self.write(child)
+        self.end()
+
+    def flush(self) -> None:
+        """Write the buffered characters to the sink"""
+        if self.__buffer:
+            self.__sink.write("".join(self.__buffer))
+            self.__buffer = []
+            self.__buffered_length = 0
+
+    def close(self) -> None:
+        """Close the elements left open and flush the document to the sink"""
+        while self.__open_tags:
+            self.end()
+        self.flush()
+
+    def __write(self, text: str) -> None:
+        self.__buffer.append(text)
+        self.__buffered_length += len(text)
+        if self.__buffered_length >= self.__buffer_size:
+            self.flush()
+
+    def __get_indentation(self, level: int) -> str:
+        while len(self.__indentations) <= level:
+            self.__indentations.append("\n" + self.__INDENTATION * len(self.__indentations))
+        return self.__indentations[level]
+
+    @staticmethod
+    def __escape_attribute(value: str) -> str:
+        # Same escaping as ElementTree serialization
+        return ET._escape_attrib(value)
@@ -7,6 +7,7 @@ from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
 from external_asset_ism_ismc_generation_tool.common.common import Common
 from external_asset_ism_ismc_generation_tool.local_file_client.local_file_service_client import LocalFileServiceClient
 from external_asset_ism_ismc_generation_tool.file_processor.local_file_processor import LocalFileProcessor
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_data_parser import MediaDataParser
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_format import MediaFormat
 from external_asset_ism_ismc_generation_tool.blob_data_handler.model.blob_media_data import BlobMediaData
 from external_asset_ism_ismc_generation_tool.text_data_parser.model.text_data_info import TextDataInfo
@@ -20,7 +21,7 @@ class LocalDataHandler:
         cls.__logger = logger
 
     @staticmethod
-    def get_data_from_local_files(local_file_service_client: LocalFileServiceClient) -> BlobMediaData:
+    def get_data_from_local_files(local_file_service_client: LocalFileServiceClient, settings: Optional[dict] = None) -> BlobMediaData:
         LocalDataHandler.__logger.info(msg="Get files list from local directory")
         files = local_file_service_client.get_list_of_files()
         if files is None or len(files) == 0:
@@ -32,22 +33,26 @@ class LocalDataHandler:
             if local_file_service_client.is_multithreading:
                 threads_num = cpu_count()
                 executor = ThreadPoolExecutor(max_workers=threads_num)
-            file_media_data: BlobMediaData = LocalDataHandler.__process_files(files, local_file_service_client, executor)
+            file_media_data: BlobMediaData = LocalDataHandler.__process_files(files, local_file_service_client, executor,
+                                                                              MediaDataParser.is_parse_in_workers(settings))
 
         finally:
             if executor:
                 executor.shutdown()
+            local_file_service_client.close()
 
         return file_media_data
 
     @staticmethod
-    def __process_files(files, local_file_service_client: LocalFileServiceClient, executor: ThreadPoolExecutor) -> BlobMediaData:
+    def __process_files(files, local_file_service_client: LocalFileServiceClient, executor: ThreadPoolExecutor, parse_in_workers: bool = False) -> BlobMediaData:
         manifest_name = ""
         media_datas = None
         media_index_datas = None
         text_datas_info = []
+        media_file_names = []
+        media_index_file_names = []
 
-        task_mapping = LocalDataHandler.__map_file_tasks(files, local_file_service_client, executor)
+        task_mapping = LocalDataHandler.__map_file_tasks(files, local_file_service_client, executor, parse_in_workers)
 
         for task in Common.get_completed_tasks(task_mapping, executor):
             file_name = task_mapping[task] if executor else task
@@ -55,7 +60,9 @@ class LocalDataHandler:
                 key, result = task.result() if executor else task_mapping[task]
                 manifest_name = manifest_name or key
 
-                if MediaFormat.is_media_format(file_name):
+                if MediaFormat.is_media_format(file_name) and parse_in_workers:
+                    (media_index_file_names if MediaFormat.is_mpi_format(file_name) else media_file_names).append(file_name)
+                elif MediaFormat.is_media_format(file_name):
                     if not MediaFormat.is_mpi_format(file_name):
                         media_datas = Common.merge_dicts([media_datas, result])
                     else:
@@ -65,18 +72,21 @@ class LocalDataHandler:
             except Exception as e:
                 LocalDataHandler.__logger.error(f"Error processing file {file_name}: {e}")
 
-        return BlobMediaData(manifest_name, media_datas, media_index_datas, text_datas_info)
+        return BlobMediaData(manifest_name, media_datas, media_index_datas, text_datas_info, media_file_names, media_index_file_names)
 
     @staticmethod
-    def __process_file(file, local_file_service_client: LocalFileServiceClient) -> Tuple[Optional[str], Optional[Union[Dict[str, Dict], TextDataInfo]]]:
+    def __process_file(file, local_file_service_client: LocalFileServiceClient, parse_in_workers: bool = False) -> Tuple[Optional[str], Optional[Union[Dict[str, Dict], TextDataInfo]]]:
         LocalDataHandler.__logger.info(msg=f"Handle file {file.name}")
         key, format = Common.get_key_and_format(file.name)
+        # The media files are read by the worker processes parsing them
+        if parse_in_workers and MediaFormat.is_media_format(file.name):
+            return key, None
         result = LocalFileProcessor.process_file(format, file.name, local_file_service_client)
         return key, result
 
     @staticmethod
-    def __map_file_tasks(files, local_file_service_client: LocalFileServiceClient, executor: ThreadPoolExecutor) -> any:
+    def __map_file_tasks(files, local_file_service_client: LocalFileServiceClient, executor: ThreadPoolExecutor, parse_in_workers: bool = False) -> any:
         if executor:
-            return {executor.submit(LocalDataHandler.__process_file, file, local_file_service_client): file.name for file in files}
+            return {executor.submit(LocalDataHandler.__process_file, file, local_file_service_client, parse_in_workers): file.name for file in files}
         else:
-            return {file.name: LocalDataHandler.__process_file(file, local_file_service_client) for file in files}
+            return {file.name: LocalDataHandler.__process_file(file, local_file_service_client, parse_in_workers) for file in files}
@@ -1,5 +1,7 @@
+import mmap
 import os
-from typing import List, Optional
+from threading import Lock
+from typing import Callable, Dict, List, Optional, TextIO, Union
 
 from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
 from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
@@ -34,6 +36,11 @@ class LocalFileServiceClient:
             raise ValueError(f"Path is not a directory: {self.local_directory}")
 
         self.is_multithreading = settings.get('is_multithreading', False)
+        self.__mappings: Dict[str, Union[mmap.mmap, bytes]] = {}
+        self.__mappings_lock = Lock()
+        self.fragment_read_workers = settings.get('fragment_read_workers', 1)
+        self.read_block_size = settings.get('read_block_size', 65536)
+        self.read_cache_blocks = settings.get('read_cache_blocks', 32)
         self.__logger.info(f'Initialized LocalFileServiceClient with directory: {self.local_directory}')
 
     def get_list_of_files(self) -> List[LocalFileItem]:
@@ -47,27 +54,44 @@ class LocalFileServiceClient:
 
     def download_part_of_file(self, file_name: str, offset: Optional[int] = None, length: Optional[int] = None) -> bytes:
         """Download (read) part of a local file"""
+        return bytes(self.read_view(file_name, offset, length))
+
+    def read_view(self, file_name: str, offset: Optional[int] = None, length: Optional[int] = None) -> memoryview:
+        """Read part of a local file without copy: a view on the memory mapping kept open for the file"""
+        mapping = self.__get_mapping(file_name)
+        start = offset or 0
+        stop = len(mapping) if length is None else min(start + length, len(mapping))
+        return memoryview(mapping)[start:max(start, stop)]
+
+    def close(self):
+        """Close the memory mappings of the files read so far"""
+        with self.__mappings_lock:
+            mappings = list(self.__mappings.values())
+            self.__mappings.clear()
+        for mapping in mappings:
+            try:
+                if isinstance(mapping, mmap.mmap):
+                    mapping.close()
+            except BufferError:
+                # A view on the mapping is still referenced, the mapping is closed when released
+                pass
+
+    def get_file_size(self, file_name: str) -> int:
+        """Get size of a local file in bytes"""
         file_path = os.path.join(self.local_directory, file_name)
-        
-        if not os.path.exists(file_path):
-            self.__logger.error(f'File does not exist: {file_path}')
-            raise FileNotFoundError(f"File does not exist: {file_path}")
-        
-        with open(file_path, 'rb') as f:
-            if offset is not None:
-                f.seek(offset)
-            
-            if length is not None:
-                return f.read(length)
-            else:
-                return f.read()
+        return os.path.getsize(file_path)
 
-    def write_file(self, file_name: str, content: str):
-        """Write content to a local file"""
+    def write_file(self, file_name: str, content: Union[str, Callable[[TextIO], None]]):
+        """Write content to a local file, `content` is a string or a function writing it to the opened file"""
         file_path = os.path.join(self.local_directory, file_name)
+        with self.__mappings_lock:
+            self.__mappings.pop(file_name, None)
         
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            if callable(content):
+                content(f)
+            else:
+                f.write(content)
         
         self.__logger.info(f'Written file: {file_path}')
 
@@ -75,3 +99,22 @@ class LocalFileServiceClient:
         """Check if a file exists in the local directory"""
         file_path = os.path.join(self.local_directory, file_name)
         return os.path.exists(file_path) and os.path.isfile(file_path)
+
+    def __get_mapping(self, file_name: str) -> Union[mmap.mmap, bytes]:
+        mapping = self.__mappings.get(file_name)
+        if mapping is not None:
+            return mapping
+
+        file_path = os.path.join(self.local_directory, file_name)
+        if not os.path.exists(file_path):
+            self.__logger.error(f'File does not exist: {file_path}')
+            raise FileNotFoundError(f"File does not exist: {file_path}")
+
+        with self.__mappings_lock:
+            mapping = self.__mappings.get(file_name)
+            if mapping is None:
+                with open(file_path, 'rb') as f:
+                    # An empty file cannot be mapped
+                    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+                self.__mappings[file_name] = mapping
+        return mapping
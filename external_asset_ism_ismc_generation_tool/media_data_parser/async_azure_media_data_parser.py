@@ -0,0 +1,85 @@
+from typing import Awaitable, Callable, Dict, List, Tuple
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.azure_client.async_azure_blob_service_client import AsyncAzureBlobServiceClient
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.atom.atom_type import AtomType
+from external_asset_ism_ismc_generation_tool.media_data_parser.fragment_index_parser import FragmentIndexParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.fragment_walker import FragmentWalker
+from external_asset_ism_ismc_generation_tool.media_data_parser.range_reader import RangeReader
+from external_asset_ism_ismc_generation_tool.media_data_parser.read_plan import ReadPlanRunner
+
+class AsyncAzureMediaDataParser:
+    _MEDIA_HEADER_LENGTH = 8  # 8 bytes
+    _MOOFS = 'moofs'
+    __logger: ILogger = Logger("AsyncAzureMediaDataParser")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    @staticmethod
+    async def get_media_data(az_blob_service_client: AsyncAzureBlobServiceClient, blob_name: str) -> Dict[str, any]:
+        media_data: Dict[str, any] = {}
+
+        try:
+            read_part = lambda offset, length: az_blob_service_client.download_part_of_blob(blob_name=blob_name, offset=offset, length=length)
+            range_reader = RangeReader(read_part, block_size=az_blob_service_client.read_block_size, max_blocks=az_blob_service_client.read_cache_blocks)
+            moov_size, moov_data, start_byte = await AsyncAzureMediaDataParser.__find_atom(range_reader, AtomType.MOOV_ATOM_TYPE.value)
+            media_data[AtomType.MOOV_ATOM_TYPE.value] = moov_data
+            if AtomType.MVEX_ATOM_TYPE.value.encode() in moov_data:
+                end_byte = await az_blob_service_client.get_blob_size(blob_name)
+                media_data[AsyncAzureMediaDataParser._MOOFS] = await AsyncAzureMediaDataParser.__collect_moof_boxes(
+                    range_reader, read_part, start_byte + moov_size, end_byte
+                )
+            else:
+                media_data[AsyncAzureMediaDataParser._MOOFS] = []
+        except Exception as e:
+            raise Exception(f"An unexpected error occurred: {str(e)}")
+
+        return media_data
+
+
+    @staticmethod
+    async def __collect_moof_boxes(range_reader: RangeReader, read_part: Callable[[int, int], Awaitable[bytes]], offset: int, end_byte: int) -> List[bytes]:
+        # The fragments are read directly: the read-ahead blocks would mostly hold mdat payload
+        fragment_walker = FragmentWalker(end_byte)
+        fragment_index = await ReadPlanRunner.run_async(FragmentIndexParser.find_fragment_index(offset, end_byte), range_reader.read_async)
+        if fragment_index:
+            try:
+                return await ReadPlanRunner.run_async(fragment_walker.walk_indexed_moof_boxes(fragment_index, offset), read_part)
+            except ValueError as e:
+                AsyncAzureMediaDataParser.__logger.warning(f'Fragment index is not usable, fragments will be scanned: {e}')
+        return await ReadPlanRunner.run_async(fragment_walker.walk_moof_boxes(offset), read_part)
+
+    @staticmethod
+    async def __find_atom(range_reader: RangeReader, atom_type_to_find: str, offset: int = 0) -> Tuple[int, bytes, int]:
+        start_byte = offset
+
+        while True:
+            try:
+                atom_header_data = await range_reader.read_async(start_byte, AsyncAzureMediaDataParser._MEDIA_HEADER_LENGTH)
+            except Exception as e:
+                raise Exception(f"Error downloading data at offset {start_byte}: {str(e)}")
+
+            atom_size, atom_type = AsyncAzureMediaDataParser.__parse_atom_header(atom_header_data)
+            start_byte += AsyncAzureMediaDataParser._MEDIA_HEADER_LENGTH
+
+            try:
+                if atom_type == atom_type_to_find:
+                    atom_data = atom_header_data + await range_reader.read_async(start_byte, atom_size - AsyncAzureMediaDataParser._MEDIA_HEADER_LENGTH)
+                    return atom_size, atom_data, start_byte - AsyncAzureMediaDataParser._MEDIA_HEADER_LENGTH
+            except Exception as e:
+                raise Exception(f"Error downloading data at offset {start_byte} for atom {atom_type_to_find}: {str(e)}")
+
+            start_byte += atom_size - AsyncAzureMediaDataParser._MEDIA_HEADER_LENGTH
+
+    @staticmethod
+    def __parse_atom_header(data: bytes) -> Tuple[int, str]:
+        if len(data) != AsyncAzureMediaDataParser._MEDIA_HEADER_LENGTH:
+            AsyncAzureMediaDataParser.__logger.error(f'Cannot parse media file: Invalid atom header length: {data}')
+            raise ValueError("Invalid atom header length")
+
+        size = int.from_bytes(data[:4], byteorder='big')
+        atom_type = data[4:8].decode('utf-8')
+
+        return size, atom_type
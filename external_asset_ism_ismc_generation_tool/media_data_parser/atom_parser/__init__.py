@@ -7,3 +7,4 @@ from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.stss_
 from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.stsz_parser import STSZParser
 from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.stts_parser import STTSParser
 from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.trak_parser import TRAKParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.sample_table_decoder import SampleTableDecoder
@@ -0,0 +1,73 @@
+import struct
+import sys
+from array import array
+from typing import Callable, Dict
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.sample_table import SampleSizeTable, SyncSampleTable, TimeToSampleTable
+
+_UINT32_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+_FULL_BOX_FIELDS = struct.Struct('>II')  # version and flags, entry count
+
+
+class SampleTableDecoder:
+    """
+    Decodes the sample tables used by the tool (`stts`, `stss`, `stsz`) from the payload of their boxes
+    into typed arrays of unsigned 32-bit integers, without building a construct container per entry.
+
+    get_decoders() is the parse profile given to BoxIndex: the other sample tables (`stsc`, `stco`, `co64`, `ctts`, `sdtp`...)
+    are never decoded and stay byte ranges of the index.
+    """
+    __logger: ILogger = Logger("SampleTableDecoder")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    @staticmethod
+    def get_decoders() -> Dict[str, Callable[[memoryview], object]]:
+        return {
+            'stts': SampleTableDecoder.decode_stts,
+            'stss': SampleTableDecoder.decode_stss,
+            'stsz': SampleTableDecoder.decode_stsz,
+        }
+
+    @staticmethod
+    def decode_stts(payload: memoryview) -> TimeToSampleTable:
+        entries = SampleTableDecoder.__read_entries(payload, 'stts', 2)
+        return TimeToSampleTable(entries[0::2], entries[1::2])
+
+    @staticmethod
+    def decode_stss(payload: memoryview) -> SyncSampleTable:
+        return SyncSampleTable(SampleTableDecoder.__read_entries(payload, 'stss', 1))
+
+    @staticmethod
+    def decode_stsz(payload: memoryview) -> SampleSizeTable:
+        if len(payload) < 12:
+            SampleTableDecoder.__logger.error(f'stsz box is too short: {len(payload)} bytes')
+            raise ValueError("stsz box is too short")
+        sample_size, sample_count = struct.unpack_from('>II', payload, 4)
+        entry_sizes = SampleTableDecoder.__read_array(payload, 'stsz', 12, sample_count) if sample_size == 0 else array(_UINT32_TYPECODE)
+        return SampleSizeTable(sample_size, sample_count, entry_sizes)
+
+    @staticmethod
+    def __read_entries(payload: memoryview, box_type: str, entry_values_count: int) -> array:
+        if len(payload) < 8:
+            SampleTableDecoder.__logger.error(f'{box_type} box is too short: {len(payload)} bytes')
+            raise ValueError(f"{box_type} box is too short")
+        _, entry_count = _FULL_BOX_FIELDS.unpack_from(payload)
+        return SampleTableDecoder.__read_array(payload, box_type, 8, entry_count * entry_values_count)
+
+    @staticmethod
+    def __read_array(payload: memoryview, box_type: str, offset: int, values_count: int) -> array:
+        end = offset + values_count * 4
+        if end > len(payload):
+            SampleTableDecoder.__logger.error(f'{box_type} box is too short for {values_count} values: {len(payload)} bytes')
+            raise ValueError(f"{box_type} box is too short")
+        values = array(_UINT32_TYPECODE)
+        values.frombytes(payload[offset:end])
+        if sys.byteorder == 'little':
+            values.byteswap()
+        return values
+
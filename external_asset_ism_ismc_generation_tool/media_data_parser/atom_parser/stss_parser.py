@@ -1,9 +1,9 @@
+from array import array
 from typing import Optional
 
-from tools.pymp4.src.pymp4.parser import Box
-
 from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
 from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.sample_table import SyncSampleTable
 
 
 class STSSParser:
@@ -13,9 +13,18 @@ class STSSParser:
     def redefine_logger(cls, logger: ILogger):
         cls.__logger = logger
 
-    def __init__(self, stss_atom: Box):
-        self.stss_atom = stss_atom
+    def __init__(self, stss_table: Optional[SyncSampleTable]):
+        self.stss_table = stss_table
 
-    def get_key_frames_numbers_from_stss(self) -> Optional[list]:
-        if self.stss_atom:
-            return [str(entry.sample_number) for entry in self.stss_atom['entries']]
+    def get_key_frames_numbers_from_stss(self) -> Optional[array]:
+        """
+        Returns:
+            Sorted 1-based numbers of the key frames, None if there is no stss box (all the samples are key frames)
+        """
+        if self.stss_table:
+            sample_numbers = self.stss_table.sample_numbers
+            # The stss entries shall be in increasing order, they are sorted for files that do not follow it
+            if any(previous > current for previous, current in zip(sample_numbers, sample_numbers[1:])):
+                STSSParser.__logger.warning('stss entries are not sorted')
+                return array(sample_numbers.typecode, sorted(sample_numbers))
+            return sample_numbers
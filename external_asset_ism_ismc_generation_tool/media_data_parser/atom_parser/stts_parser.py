@@ -1,9 +1,10 @@
-from typing import Optional, List
-
-from tools.pymp4.src.pymp4.parser import Box
+from bisect import bisect_left
+from typing import Optional, List, Sequence
 
 from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
 from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.sample_table import TimeToSampleTable
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_timeline import TrackTimeline
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_type import TrackType
 
 
@@ -14,39 +15,86 @@ class STTSParser:
     def redefine_logger(cls, logger: ILogger):
         cls.__logger = logger
 
-    def __init__(self, stts_atom: Box):
-        self.stts_atom = stts_atom
-        self.stts_atom_entries = stts_atom['entries']
+    def __init__(self, stts_table: TimeToSampleTable):
+        self.stts_table = stts_table
 
     def get_sample_count(self) -> int:
-        return sum(entry.sample_count for entry in self.stts_atom_entries)
+        return sum(self.stts_table.sample_counts)
 
     def aggregate_sample_info(self) -> List:
         sample_info = []
         cumulative = 0
-        for entry in self.stts_atom_entries:
-            cumulative += entry.sample_count
-            sample_info.append((cumulative, entry.sample_delta))
+        for sample_count, sample_delta in zip(self.stts_table.sample_counts, self.stts_table.sample_deltas):
+            cumulative += sample_count
+            sample_info.append((cumulative, sample_delta))
         return sample_info
 
-    def get_chunk_durations_from_stts(self, track_type: TrackType, timescale: int, key_frames_numbers: Optional[list] = None) -> list:
+    def get_chunk_durations_from_stts(self, track_type: TrackType, timescale: int, key_frames_numbers: Optional[Sequence[int]] = None) -> TrackTimeline:
+        """
+        Split the track into chunks of about 2 seconds. A chunk is cut before the first sample reached once the chunk is longer
+        than 2 seconds, or, for video tracks, before the first key frame reached once the chunk lasts exactly 2 seconds.
+
+        The cut points are computed per run of samples with the same duration (stts entry) instead of per sample.
+
+        Args:
+            track_type: Type of the track
+            timescale: Timescale of the track
+            key_frames_numbers: Sorted 1-based numbers of the key frames (see STSSParser), used for video tracks
+
+        Returns:
+            Chunk durations in ticks of the track timescale
+        """
         _SEGMENT_DURATION = 2  # 2 sec TODO: move to general settings
-        chunk_durations: list = []
+        segment_duration = _SEGMENT_DURATION * timescale
+        key_frames = key_frames_numbers if track_type == TrackType.VIDEO and key_frames_numbers else ()
+        chunk_durations = TrackTimeline(timescale)
 
-        sample_info_list = self.aggregate_sample_info()
         sample_number = 1
         chunk_duration = 0
-        for sample_count, sample_duration in sample_info_list:
-            while sample_number <= sample_count:
-                if track_type == TrackType.VIDEO and chunk_duration >= _SEGMENT_DURATION * timescale and str(sample_number) in key_frames_numbers:
-                    chunk_durations.append(chunk_duration / timescale)
-                    chunk_duration = 0
-                elif chunk_duration > _SEGMENT_DURATION * timescale:
-                    chunk_durations.append(chunk_duration / timescale)
-                    chunk_duration = 0
-                chunk_duration += sample_duration
-                sample_number += 1
-
-        chunk_durations.append(chunk_duration / timescale)
+        for sample_count, sample_delta in zip(self.stts_table.sample_counts, self.stts_table.sample_deltas):
+            remaining_count = sample_count
+            while remaining_count:
+                cut_index = STTSParser.__find_cut_index(chunk_duration, sample_delta, sample_number, remaining_count, segment_duration, key_frames)
+                if cut_index is None:
+                    chunk_duration += remaining_count * sample_delta
+                    sample_number += remaining_count
+                    break
+                chunk_durations.append(chunk_duration + cut_index * sample_delta)
+                # The sample at the cut point starts the next chunk
+                chunk_duration = sample_delta
+                sample_number += cut_index + 1
+                remaining_count -= cut_index + 1
+
+        chunk_durations.append(chunk_duration)
 
         return chunk_durations
+
+    @staticmethod
+    def __find_cut_index(chunk_duration: int, sample_delta: int, sample_number: int, sample_count: int,
+                         segment_duration: int, key_frames: Sequence[int]) -> Optional[int]:
+        """
+        Index in the run of `sample_count` samples of `sample_delta` starting at `sample_number` of the first sample
+        before which the chunk is cut, None if the chunk is not cut in the run
+        """
+        if chunk_duration > segment_duration:
+            return 0
+        if sample_delta == 0:
+            # The chunk duration stays the same during the run: only a key frame can cut it
+            if key_frames and chunk_duration == segment_duration:
+                key_frame_index = bisect_left(key_frames, sample_number)
+                if key_frame_index < len(key_frames) and key_frames[key_frame_index] < sample_number + sample_count:
+                    return key_frames[key_frame_index] - sample_number
+            return None
+
+        steps_to_segment_duration, remainder = divmod(segment_duration - chunk_duration, sample_delta)
+        if key_frames and remainder == 0 and steps_to_segment_duration < sample_count \
+                and STTSParser.__is_key_frame(key_frames, sample_number + steps_to_segment_duration):
+            return steps_to_segment_duration
+        # First sample reached once the chunk is longer than the segment duration
+        cut_index = steps_to_segment_duration + 1
+        return cut_index if cut_index < sample_count else None
+
+    @staticmethod
+    def __is_key_frame(key_frames: Sequence[int], sample_number: int) -> bool:
+        key_frame_index = bisect_left(key_frames, sample_number)
+        return key_frame_index < len(key_frames) and key_frames[key_frame_index] == sample_number
@@ -1,8 +1,12 @@
-from typing import Tuple, Dict
+from typing import Callable, Dict, List, Tuple
 from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
 from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
 from external_asset_ism_ismc_generation_tool.azure_client.azure_blob_service_client import AzureBlobServiceClient
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.atom.atom_type import AtomType
+from external_asset_ism_ismc_generation_tool.media_data_parser.fragment_index_parser import FragmentIndexParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.fragment_walker import FragmentWalker
+from external_asset_ism_ismc_generation_tool.media_data_parser.range_reader import RangeReader
+from external_asset_ism_ismc_generation_tool.media_data_parser.read_plan import ReadPlanRunner
 
 class AzureMediaDataParser:
     _MEDIA_HEADER_LENGTH = 8  # 8 bytes
@@ -18,16 +22,15 @@ class AzureMediaDataParser:
         media_data: Dict[str, any] = {}
 
         try:
-            moov_size, moov_data, start_byte = AzureMediaDataParser.__find_atom(az_blob_service_client, blob_name, AtomType.MOOV_ATOM_TYPE.value)
+            read_part = lambda offset, length: az_blob_service_client.download_part_of_blob(blob_name=blob_name, offset=offset, length=length)
+            range_reader = RangeReader(read_part, block_size=az_blob_service_client.read_block_size, max_blocks=az_blob_service_client.read_cache_blocks)
+            moov_size, moov_data, start_byte = AzureMediaDataParser.__find_atom(range_reader, AtomType.MOOV_ATOM_TYPE.value)
             media_data[AtomType.MOOV_ATOM_TYPE.value] = moov_data
             if AtomType.MVEX_ATOM_TYPE.value.encode() in moov_data:
-                start_byte += moov_size
-                moof_size, moof_data, start_byte = AzureMediaDataParser.__find_atom(az_blob_service_client, blob_name, AtomType.MOOF_ATOM_TYPE.value, start_byte)
-                try:
-                    remaining_data = moof_data + az_blob_service_client.download_part_of_blob(blob_name=blob_name, offset=start_byte + moof_size)
-                except Exception as e:
-                    raise Exception(f"Error downloading data for moof box {start_byte + moof_size}: {str(e)}")
-                AzureMediaDataParser.__find_and_process_moof_atoms(remaining_data, media_data)
+                end_byte = az_blob_service_client.get_blob_size(blob_name)
+                media_data[AzureMediaDataParser._MOOFS] = AzureMediaDataParser.__collect_moof_boxes(
+                    range_reader, read_part, start_byte + moov_size, end_byte, az_blob_service_client.fragment_read_workers
+                )
             else:
                 media_data[AzureMediaDataParser._MOOFS] = []
         except Exception as e:
@@ -37,16 +40,25 @@ class AzureMediaDataParser:
 
 
     @staticmethod
-    def __find_atom(az_blob_service_client: AzureBlobServiceClient, blob_name: str, atom_type_to_find: str, offset: int = 0) -> Tuple[int, bytes, int]:
+    def __collect_moof_boxes(range_reader: RangeReader, read_part: Callable[[int, int], bytes], offset: int, end_byte: int,
+                             max_workers: int) -> List[bytes]:
+        # The fragments are read directly: the read-ahead blocks would mostly hold mdat payload
+        fragment_walker = FragmentWalker(end_byte)
+        fragment_index = ReadPlanRunner.run(FragmentIndexParser.find_fragment_index(offset, end_byte), range_reader.read)
+        if fragment_index:
+            try:
+                return ReadPlanRunner.run(fragment_walker.walk_indexed_moof_boxes(fragment_index, offset), read_part, max_workers)
+            except ValueError as e:
+                AzureMediaDataParser.__logger.warning(f'Fragment index is not usable, fragments will be scanned: {e}')
+        return ReadPlanRunner.run(fragment_walker.walk_moof_boxes(offset), read_part)
+
+    @staticmethod
+    def __find_atom(range_reader: RangeReader, atom_type_to_find: str, offset: int = 0) -> Tuple[int, bytes, int]:
         start_byte = offset
 
         while True:
             try:
-                atom_header_data = az_blob_service_client.download_part_of_blob(
-                    blob_name=blob_name,
-                    offset=start_byte,
-                    length=AzureMediaDataParser._MEDIA_HEADER_LENGTH
-                )
+                atom_header_data = range_reader.read(start_byte, AzureMediaDataParser._MEDIA_HEADER_LENGTH)
             except Exception as e:
                 raise Exception(f"Error downloading data at offset {start_byte}: {str(e)}")
 
@@ -55,11 +67,7 @@ class AzureMediaDataParser:
 
             try:
                 if atom_type == atom_type_to_find:
-                    atom_data = atom_header_data + az_blob_service_client.download_part_of_blob(
-                        blob_name=blob_name,
-                        offset=start_byte,
-                        length=atom_size - AzureMediaDataParser._MEDIA_HEADER_LENGTH
-                    )
+                    atom_data = atom_header_data + range_reader.read(start_byte, atom_size - AzureMediaDataParser._MEDIA_HEADER_LENGTH)
                     return atom_size, atom_data, start_byte - AzureMediaDataParser._MEDIA_HEADER_LENGTH
             except Exception as e:
                 raise Exception(f"Error downloading data at offset {start_byte} for atom {atom_type_to_find}: {str(e)}")
@@ -76,25 +84,3 @@ class AzureMediaDataParser:
         atom_type = data[4:8].decode('utf-8')
 
         return size, atom_type
-
-    @staticmethod
-    def __get_atom_header(data: bytes, offset: int) -> Tuple[int, str]:
-        atom_header_data = data[offset:offset + AzureMediaDataParser._MEDIA_HEADER_LENGTH]
-        atom_size, atom_type = AzureMediaDataParser.__parse_atom_header(atom_header_data)
-        return atom_size, atom_type
-
-    @staticmethod
-    def __find_and_process_moof_atoms(data: bytes, media_data: Dict[str, any]) -> Dict[str, any]:
-        start_byte = 0
-        while start_byte < len(data):
-            atom_size, atom_type = AzureMediaDataParser.__get_atom_header(data, start_byte)
-
-            if atom_type == AtomType.MOOF_ATOM_TYPE.value:
-                end_byte = start_byte + atom_size
-                media_data.setdefault(AzureMediaDataParser._MOOFS, []).append(data[start_byte:end_byte])
-                start_byte += len(data[start_byte:end_byte])
-            elif atom_type == AtomType.MFRA_ATOM_TYPE.value:
-                break
-            else:
-                start_byte += atom_size
-        return media_data
\ No newline at end of file
@@ -0,0 +1,170 @@
+import struct
+from typing import List, Optional, Tuple
+
+from tools.pymp4.src.pymp4.parser import Box
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.atom.atom_type import AtomType
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.fragment_index import FragmentIndex, FragmentIndexEntry, FragmentIndexSource
+from external_asset_ism_ismc_generation_tool.media_data_parser.read_plan import ReadPlan
+
+
+class FragmentIndexParser:
+    """
+    Locates fragments of a fragmented MP4 file from its indexes instead of scanning it box by box:
+    - the `mfra` box at the tail of the file, found through the trailing `mfro` box, with one `tfra` box per track
+    - the `sidx` box placed between the `moov` box and the first `moof` box
+    """
+    _MEDIA_HEADER_LENGTH = 8  # 8 bytes
+    _MFRO_BOX_LENGTH = 16  # 8 bytes header + 4 bytes version/flags + 4 bytes mfra size
+    _MAX_BOXES_BEFORE_SIDX = 4
+    __logger: ILogger = Logger("FragmentIndexParser")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    @staticmethod
+    def find_fragment_index(first_fragment_offset: int, end: int) -> ReadPlan[Optional[FragmentIndex]]:
+        """
+        Read plan (see ReadPlanRunner) locating the fragment index of the file.
+
+        Args:
+            first_fragment_offset: Offset of the first top-level box after the `moov` box
+            end: Size of the file in bytes
+
+        Returns:
+            FragmentIndex with fragments sorted by offset, or None if the file has no usable index
+        """
+        try:
+            fragment_index = yield from FragmentIndexParser.__find_mfra_index(first_fragment_offset, end)
+            if not fragment_index:
+                fragment_index = yield from FragmentIndexParser.__find_sidx_index(first_fragment_offset, end)
+        except Exception as e:
+            FragmentIndexParser.__logger.warning(f'Cannot parse fragment index, fragments will be scanned: {e}')
+            return None
+
+        if fragment_index:
+            FragmentIndexParser.__logger.info(f'Found {len(fragment_index.entries)} fragments in the {fragment_index.source.value} index')
+        return fragment_index
+
+    @staticmethod
+    def __find_mfra_index(first_fragment_offset: int, end: int) -> ReadPlan[Optional[FragmentIndex]]:
+        if end - first_fragment_offset < FragmentIndexParser._MFRO_BOX_LENGTH:
+            return None
+        mfro_data = yield from FragmentIndexParser.__read(end - FragmentIndexParser._MFRO_BOX_LENGTH, FragmentIndexParser._MFRO_BOX_LENGTH)
+        mfro_size, mfro_type = FragmentIndexParser.__parse_box_header(mfro_data)
+        if mfro_type != AtomType.MFRO_ATOM_TYPE.value or mfro_size != FragmentIndexParser._MFRO_BOX_LENGTH:
+            return None
+
+        mfra_size = int.from_bytes(mfro_data[12:16], byteorder='big')
+        mfra_offset = end - mfra_size
+        if mfra_offset < first_fragment_offset:
+            FragmentIndexParser.__logger.warning(f'Invalid mfra size {mfra_size} in the mfro box')
+            return None
+
+        mfra_data = yield from FragmentIndexParser.__read(mfra_offset, mfra_size)
+        if FragmentIndexParser.__parse_box_header(mfra_data) != (mfra_size, AtomType.MFRA_ATOM_TYPE.value):
+            FragmentIndexParser.__logger.warning(f'No mfra box at offset {mfra_offset}')
+            return None
+
+        entries_by_offset = {}
+        tfra_count = 0
+        position = FragmentIndexParser._MEDIA_HEADER_LENGTH
+        while position + FragmentIndexParser._MEDIA_HEADER_LENGTH <= mfra_size:
+            box_size, box_type = FragmentIndexParser.__parse_box_header(mfra_data[position:])
+            if box_size < FragmentIndexParser._MEDIA_HEADER_LENGTH:
+                break
+            if box_type == AtomType.TFRA_ATOM_TYPE.value:
+                tfra_count += 1
+                for time, moof_offset in FragmentIndexParser.__parse_tfra(mfra_data[position:position + box_size]):
+                    # The first track wins when several tracks reference the same moof box
+                    entries_by_offset.setdefault(moof_offset, FragmentIndexEntry(offset=moof_offset, time=time))
+            position += box_size
+
+        entries = FragmentIndexParser.__get_validated_entries(list(entries_by_offset.values()), first_fragment_offset, mfra_offset)
+        if not entries:
+            return None
+        # Times of different tracks may use different timescales, durations are derived for a single track only
+        FragmentIndexParser.__fill_sizes_and_durations(entries, mfra_offset, tfra_count == 1)
+        return FragmentIndex(FragmentIndexSource.MFRA, entries)
+
+    @staticmethod
+    def __parse_tfra(tfra_data: bytes) -> List[Tuple[int, int]]:
+        version = tfra_data[8]
+        length_sizes = int.from_bytes(tfra_data[16:20], byteorder='big')
+        traf_number_length = ((length_sizes >> 4) & 0x03) + 1
+        trun_number_length = ((length_sizes >> 2) & 0x03) + 1
+        sample_number_length = (length_sizes & 0x03) + 1
+        number_of_entries = int.from_bytes(tfra_data[20:24], byteorder='big')
+
+        time_and_offset_format = '>QQ' if version == 1 else '>II'
+        time_and_offset_length = struct.calcsize(time_and_offset_format)
+        entry_length = time_and_offset_length + traf_number_length + trun_number_length + sample_number_length
+        if 24 + number_of_entries * entry_length > len(tfra_data):
+            raise ValueError(f"tfra box is too short for {number_of_entries} entries")
+
+        return [struct.unpack_from(time_and_offset_format, tfra_data, 24 + index * entry_length) for index in range(number_of_entries)]
+
+    @staticmethod
+    def __find_sidx_index(first_fragment_offset: int, end: int) -> ReadPlan[Optional[FragmentIndex]]:
+        position = first_fragment_offset
+        for _ in range(FragmentIndexParser._MAX_BOXES_BEFORE_SIDX):
+            if position + FragmentIndexParser._MEDIA_HEADER_LENGTH > end:
+                return None
+            header_data = yield from FragmentIndexParser.__read(position, FragmentIndexParser._MEDIA_HEADER_LENGTH)
+            box_size, box_type = FragmentIndexParser.__parse_box_header(header_data)
+            if box_type == AtomType.SIDX_ATOM_TYPE.value:
+                sidx_data = yield from FragmentIndexParser.__read(position, box_size)
+                return FragmentIndexParser.__parse_sidx(sidx_data, position + box_size, end)
+            if box_type == AtomType.MOOF_ATOM_TYPE.value or box_size < FragmentIndexParser._MEDIA_HEADER_LENGTH:
+                return None
+            position += box_size
+        return None
+
+    @staticmethod
+    def __parse_sidx(sidx_data: bytes, sidx_end: int, end: int) -> Optional[FragmentIndex]:
+        sidx_box = Box.parse(sidx_data)
+        entries = []
+        offset = sidx_end + sidx_box.first_offset
+        time = sidx_box.earliest_presentation_time
+        for reference in sidx_box.references:
+            if reference.reference_type != "MEDIA":
+                # Hierarchical indexes are not supported, the fragments will be scanned
+                FragmentIndexParser.__logger.info('sidx box references another sidx box')
+                return None
+            entries.append(FragmentIndexEntry(offset=offset, time=time, duration=reference.segment_duration, size=reference.referenced_size))
+            offset += reference.referenced_size
+            time += reference.segment_duration
+
+        entries = FragmentIndexParser.__get_validated_entries(entries, sidx_end, end)
+        if not entries:
+            return None
+        return FragmentIndex(FragmentIndexSource.SIDX, entries, sidx_box.timescale)
+
+    @staticmethod
+    def __get_validated_entries(entries: List[FragmentIndexEntry], start: int, end: int) -> List[FragmentIndexEntry]:
+        entries = sorted(entries, key=lambda entry: entry.offset)
+        if not entries or entries[0].offset < start or entries[-1].offset + FragmentIndexParser._MEDIA_HEADER_LENGTH > end:
+            FragmentIndexParser.__logger.warning(f'Fragment index offsets are out of the [{start}, {end}) range')
+            return []
+        return entries
+
+    @staticmethod
+    def __fill_sizes_and_durations(entries: List[FragmentIndexEntry], index_offset: int, with_durations: bool) -> None:
+        for entry, next_entry in zip(entries, entries[1:] + [None]):
+            entry.size = (next_entry.offset if next_entry else index_offset) - entry.offset
+            if with_durations and next_entry and entry.time is not None and next_entry.time is not None:
+                entry.duration = next_entry.time - entry.time
+
+    @staticmethod
+    def __read(offset: int, length: int) -> ReadPlan[bytes]:
+        datas = yield [(offset, length)]
+        return datas[0]
+
+    @staticmethod
+    def __parse_box_header(data: bytes) -> Tuple[int, str]:
+        if len(data) < FragmentIndexParser._MEDIA_HEADER_LENGTH:
+            raise ValueError("Invalid box header length")
+        return int.from_bytes(data[:4], byteorder='big'), bytes(data[4:8]).decode('utf-8', errors='replace')
@@ -0,0 +1,173 @@
+from typing import List, Optional, Tuple
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.atom.atom_type import AtomType
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.fragment_index import FragmentIndex
+from external_asset_ism_ismc_generation_tool.media_data_parser.read_plan import ReadPlan, ReadRequest
+
+
+class FragmentWalker:
+    """
+    Walks the top-level boxes of a fragmented MP4 file by their headers only.
+
+    The payload of a box is read only for `moof` boxes; `mdat` and any other boxes are skipped
+    by offset, so the cost of a fragmented file is the size of its `moof` boxes instead of the whole media payload.
+    The header of the box following a `moof` is read in the same request as the `moof` payload.
+
+    The walks are read plans (see ReadPlanRunner): they yield the range reads they need and do no I/O themselves.
+    """
+    _MEDIA_HEADER_LENGTH = 8  # 8 bytes
+    _LARGE_MEDIA_HEADER_LENGTH = 16  # 8 bytes header + 8 bytes largesize
+    _INDEXED_READ_BATCH_SIZE = 64
+    __logger: ILogger = Logger("FragmentWalker")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    def __init__(self, end: int):
+        """
+        Args:
+            end: Size of the file in bytes
+        """
+        self.__end = end
+
+    def walk_moof_boxes(self, offset: int) -> ReadPlan[List[bytes]]:
+        """
+        Collect all `moof` boxes located after `offset`. The walk stops at the end of the file or at the `mfra` box.
+
+        Args:
+            offset: Offset of the first top-level box to inspect (usually the end of the `moov` box)
+
+        Returns:
+            Read plan returning the list of complete `moof` boxes (header included) in file order
+        """
+        moof_boxes = []
+        yield from self.__walk(offset, self.__end, moof_boxes)
+        FragmentWalker.__logger.info(f'Found {len(moof_boxes)} moof boxes')
+        return moof_boxes
+
+    def walk_indexed_moof_boxes(self, fragment_index: FragmentIndex, offset: int) -> ReadPlan[List[bytes]]:
+        """
+        Collect all `moof` boxes located after `offset` using the fragments positions from `fragment_index`.
+        The headers of the indexed `moof` boxes, then their payloads, are read in batches of parallel requests.
+        The ranges between indexed fragments are walked by header, so fragments missing from the index
+        (e.g. without a random access point) are still collected.
+
+        Raises:
+            ValueError: if the index is inconsistent with the boxes found in the file
+        """
+        offsets = fragment_index.offsets
+        last_entry = fragment_index.entries[-1]
+        indexed_end = last_entry.offset + last_entry.size if last_entry.size else self.__end
+        moof_boxes = []
+        FragmentWalker.__check_walk_end((yield from self.__walk(offset, offsets[0], moof_boxes)), offsets[0])
+
+        fragments = list(zip(offsets, offsets[1:] + [indexed_end]))
+        for batch_start in range(0, len(fragments), self._INDEXED_READ_BATCH_SIZE):
+            batch = fragments[batch_start:batch_start + self._INDEXED_READ_BATCH_SIZE]
+            header_datas = yield from FragmentWalker.__read_batch(
+                [(moof_offset, min(self._MEDIA_HEADER_LENGTH, stop - moof_offset)) for moof_offset, stop in batch]
+            )
+            box_sizes = [FragmentWalker.__get_indexed_moof_size(moof_offset, stop, header_data)
+                         for (moof_offset, stop), header_data in zip(batch, header_datas)]
+            payload_datas = yield from FragmentWalker.__read_batch(
+                [FragmentWalker.__get_indexed_moof_payload_read(moof_offset, stop, box_size)
+                 for (moof_offset, stop), box_size in zip(batch, box_sizes)]
+            )
+            for (moof_offset, stop), header_data, box_size, data in zip(batch, header_datas, box_sizes, payload_datas):
+                header_data = bytes(header_data)
+                payload_length = box_size - len(header_data)
+                moof_boxes.append(header_data + data[:payload_length])
+                walk_end = yield from self.__walk(moof_offset + box_size, stop, moof_boxes, data[payload_length:])
+                FragmentWalker.__check_walk_end(walk_end, stop)
+
+        # Fragments appended after the indexed ones, the walk stops at the `mfra` box
+        yield from self.__walk(indexed_end, self.__end, moof_boxes)
+        FragmentWalker.__logger.info(f'Found {len(moof_boxes)} moof boxes with the {fragment_index.source.value} index')
+        return moof_boxes
+
+    @staticmethod
+    def __get_indexed_moof_size(moof_offset: int, stop: int, header_data: bytes) -> int:
+        # A moof box with a largesize header gets a size of 0 here and makes the index unusable
+        box_size, box_type, _ = FragmentWalker.__parse_box_header(header_data, moof_offset)
+        if box_type != AtomType.MOOF_ATOM_TYPE.value or box_size < FragmentWalker._MEDIA_HEADER_LENGTH or moof_offset + box_size > stop:
+            FragmentWalker.__logger.error(f'Indexed fragment at offset {moof_offset} is not a moof box: {box_type}')
+            raise ValueError(f"Indexed fragment at offset {moof_offset} is not a moof box")
+        return box_size
+
+    @staticmethod
+    def __get_indexed_moof_payload_read(moof_offset: int, stop: int, box_size: int) -> ReadRequest:
+        lookahead_length = min(FragmentWalker._MEDIA_HEADER_LENGTH, stop - moof_offset - box_size)
+        return moof_offset + FragmentWalker._MEDIA_HEADER_LENGTH, box_size - FragmentWalker._MEDIA_HEADER_LENGTH + lookahead_length
+
+    def __walk(self, position: int, stop: int, moof_boxes: List[bytes], prefetched_data: bytes = b'') -> ReadPlan[int]:
+        header_data = yield from self.__read_header(position, stop, prefetched_data)
+        while header_data:
+            box_size, box_type, header_length = FragmentWalker.__parse_box_header(header_data, position)
+            if box_type == AtomType.MFRA_ATOM_TYPE.value or box_size == 0:
+                break
+            if box_size < header_length or position + box_size > self.__end:
+                FragmentWalker.__logger.error(f'Invalid size {box_size} of the {box_type} box at offset {position}')
+                raise ValueError(f"Invalid size {box_size} of the {box_type} box at offset {position}")
+
+            next_position = position + box_size
+            if box_type == AtomType.MOOF_ATOM_TYPE.value:
+                payload_length = box_size - len(header_data)
+                lookahead_length = max(0, min(self._MEDIA_HEADER_LENGTH, stop - next_position))
+                data = yield from FragmentWalker.__read(position + len(header_data), payload_length + lookahead_length)
+                moof_boxes.append(header_data + data[:payload_length])
+                header_data = yield from self.__read_header(next_position, stop, data[payload_length:])
+            else:
+                header_data = yield from self.__read_header(next_position, stop)
+            position = next_position
+        return position
+
+    @staticmethod
+    def __check_walk_end(position: int, stop: int) -> None:
+        if position != stop:
+            FragmentWalker.__logger.error(f'Box boundaries do not match the fragment index: {position} != {stop}')
+            raise ValueError(f"Box boundaries do not match the fragment index at offset {stop}")
+
+    @staticmethod
+    def __read(offset: int, length: int) -> ReadPlan[bytes]:
+        if length <= 0:
+            return b''
+        datas = yield from FragmentWalker.__read_batch([(offset, length)])
+        return datas[0]
+
+    @staticmethod
+    def __read_batch(requests: List[ReadRequest]) -> ReadPlan[List[bytes]]:
+        datas = yield requests
+        for (offset, length), data in zip(requests, datas):
+            if len(data) != length:
+                FragmentWalker.__logger.error(f'Unexpected end of data at offset {offset}: expected {length} bytes, got {len(data)}')
+                raise ValueError(f"Unexpected end of data at offset {offset}")
+        return datas
+
+    def __read_header(self, position: int, stop: int, prefetched_data: bytes = b'') -> ReadPlan[Optional[bytes]]:
+        if position + self._MEDIA_HEADER_LENGTH > stop:
+            return None
+        # The read data may be a memoryview, the small header is copied so it can be concatenated with the payload
+        if len(prefetched_data) >= self._MEDIA_HEADER_LENGTH:
+            header_data = bytes(prefetched_data[:self._MEDIA_HEADER_LENGTH])
+        else:
+            header_data = bytes((yield from FragmentWalker.__read(position, self._MEDIA_HEADER_LENGTH)))
+        if int.from_bytes(header_data[:4], byteorder='big') == 1:
+            header_data += yield from FragmentWalker.__read(position + self._MEDIA_HEADER_LENGTH,
+                                                            self._LARGE_MEDIA_HEADER_LENGTH - self._MEDIA_HEADER_LENGTH)
+        return header_data
+
+    @staticmethod
+    def __parse_box_header(data: bytes, position: int) -> Tuple[int, str, int]:
+        size = int.from_bytes(data[:4], byteorder='big')
+        try:
+            box_type = bytes(data[4:8]).decode('utf-8')
+        except UnicodeDecodeError:
+            FragmentWalker.__logger.error(f'Cannot parse media file: Invalid box header at offset {position}: {data}')
+            raise ValueError(f"Invalid box header at offset {position}")
+
+        if size == 1:
+            return int.from_bytes(data[8:16], byteorder='big'), box_type, FragmentWalker._LARGE_MEDIA_HEADER_LENGTH
+        return size, box_type, FragmentWalker._MEDIA_HEADER_LENGTH
@@ -0,0 +1,170 @@
+import re
+import struct
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from tools.pymp4.src.pymp4.parser import Box
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.box_index_node import BoxIndexNode
+
+_BOX_HEADER = struct.Struct('>I4s')
+_LARGE_SIZE = struct.Struct('>Q')
+_PATH_SEGMENT = re.compile(r'^(?P<type>[^\[\]/]{4})(\[(?P<index>\*|\d+)\])?$')
+
+
+class BoxIndex:
+    """
+    Index of the boxes of an MP4 byte range (typically the `moov` box) built in one pass over a memoryview of the data.
+
+    Only the box headers are read while indexing; a box is decoded with pymp4 when it is requested (see get_box()),
+    and each decoded box is cached. The container boxes, the sample descriptions (`stsd`) and the audio and video sample entries
+    are indexed with their child boxes. Boxes are located with path queries relative to the top-level boxes or to a node:
+        `moov/trak[*]/mdia/minf/stbl/stsz` - the `stsz` boxes of all the tracks
+        `moov/trak[1]/tkhd` - the `tkhd` box of the second track
+        `stsd/mp4a/esds` - the `esds` box of the `mp4a` sample entry, relative to a `stbl` node
+    A path segment without index matches all the boxes of that type, like `[*]`.
+    """
+    # The container boxes of pymp4, whose payload is a plain list of boxes
+    _CONTAINER_BOX_TYPES = frozenset(('moov', 'moof', 'traf', 'mvex', 'trak', 'mdia', 'minf', 'dinf', 'stbl', 'schi', 'vttc', 'vttx'))
+    # Boxes whose child boxes follow fixed fields: the sample descriptions and the sample entries (esds, dec3, avcC...)
+    _SAMPLE_DESCRIPTION_FIELDS_LENGTH = 8  # version, flags and entry count
+    _AUDIO_SAMPLE_ENTRY_TYPES = frozenset(('mp4a', 'enca', 'ec-3', 'ac-3'))
+    _AUDIO_SAMPLE_ENTRY_FIELDS_LENGTH = 28
+    _AUDIO_SAMPLE_ENTRY_VERSION_FIELDS_LENGTH = {1: 16, 2: 36}  # QuickTime sound sample description versions
+    _VIDEO_SAMPLE_ENTRY_TYPES = frozenset(('avc1', 'avc3', 'hvc1', 'hev1', 'encv'))
+    _VIDEO_SAMPLE_ENTRY_FIELDS_LENGTH = 78
+    __logger: ILogger = Logger("BoxIndex")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    def __init__(self, data: Union[bytes, memoryview], decoders: Optional[Dict[str, Callable[[memoryview], Any]]] = None):
+        """
+        Args:
+            data: Bytes of the top-level boxes
+            decoders: Parse profile: decoders by box type, called with the box payload instead of pymp4 for these types
+        """
+        self.__data = memoryview(data)
+        self.__decoders = decoders or {}
+        self.__decoded_boxes: Dict[int, Any] = {}
+        self.root = BoxIndexNode('', 0, 0, len(self.__data))
+        self.root.children = self.__index_boxes(0, len(self.__data))
+
+    def find_all(self, path: str, node: Optional[BoxIndexNode] = None) -> List[BoxIndexNode]:
+        """
+        Args:
+            path: Path of the boxes, relative to `node`
+            node: Box the path starts from, the top-level boxes if not set
+
+        Returns:
+            Matching boxes in file order
+        """
+        nodes = [node or self.root]
+        for segment in path.strip('/').split('/'):
+            box_type, index = BoxIndex.__parse_path_segment(segment)
+            matched_nodes = []
+            for parent in nodes:
+                children = [child for child in parent.children if child.type == box_type]
+                if index is None:
+                    matched_nodes.extend(children)
+                elif index < len(children):
+                    matched_nodes.append(children[index])
+            nodes = matched_nodes
+        return nodes
+
+    def find(self, path: str, node: Optional[BoxIndexNode] = None) -> Optional[BoxIndexNode]:
+        """
+        Returns:
+            First box matching the path, None if there is none
+        """
+        nodes = self.find_all(path, node)
+        return nodes[0] if nodes else None
+
+    def get_box(self, path: str, node: Optional[BoxIndexNode] = None) -> Optional[Box]:
+        """
+        Returns:
+            First box matching the path decoded with pymp4 or with the decoder of its type, None if there is none
+        """
+        found_node = self.find(path, node)
+        return self.decode(found_node) if found_node else None
+
+    def get_all_boxes(self, path: str, node: Optional[BoxIndexNode] = None) -> List[Box]:
+        return [self.decode(found_node) for found_node in self.find_all(path, node)]
+
+    def get_data(self, node: BoxIndexNode) -> memoryview:
+        """
+        Returns:
+            Bytes of the box (header included), without copy
+        """
+        return self.__data[node.offset:node.end]
+
+    def decode(self, node: BoxIndexNode) -> Any:
+        box = self.__decoded_boxes.get(node.offset)
+        if box is None:
+            decoder = self.__decoders.get(node.type)
+            try:
+                box = decoder(self.__data[node.payload_offset:node.end]) if decoder else Box.parse(self.get_data(node))
+            except Exception as e:
+                BoxIndex.__logger.error(f'Cannot parse the {node.type} box at offset {node.offset}: {e}')
+                raise ValueError(f"Cannot parse the {node.type} box at offset {node.offset}")
+            self.__decoded_boxes[node.offset] = box
+        return box
+
+    def __index_boxes(self, position: int, end: int) -> List[BoxIndexNode]:
+        nodes = []
+        while position + 8 <= end:
+            size, raw_type = _BOX_HEADER.unpack_from(self.__data, position)
+            payload_offset = position + 8
+            if size == 1:
+                if payload_offset + 8 > end:
+                    break
+                size = _LARGE_SIZE.unpack_from(self.__data, payload_offset)[0]
+                payload_offset += 8
+            elif size == 0:
+                size = end - position
+            if size < payload_offset - position or position + size > end:
+                BoxIndex.__logger.error(f'Invalid size {size} of the {raw_type} box at offset {position}')
+                raise ValueError(f"Invalid size {size} of the {raw_type} box at offset {position}")
+
+            node = BoxIndexNode(raw_type.decode('latin-1'), position, payload_offset, position + size)
+            if node.type in self._CONTAINER_BOX_TYPES:
+                node.children = self.__index_boxes(payload_offset, node.end)
+            else:
+                node.children = self.__index_nested_boxes(node)
+            nodes.append(node)
+            position = node.end
+        return nodes
+
+    def __index_nested_boxes(self, node: BoxIndexNode) -> List[BoxIndexNode]:
+        children_offset = self.__get_children_offset(node)
+        if children_offset is None or children_offset > node.end:
+            return []
+        # The layout of the sample entries varies between writers: a sample entry that cannot be indexed is kept as a leaf
+        try:
+            return self.__index_boxes(children_offset, node.end)
+        except ValueError:
+            BoxIndex.__logger.warning(f'Cannot index the child boxes of the {node.type} box at offset {node.offset}')
+            return []
+
+    def __get_children_offset(self, node: BoxIndexNode) -> Optional[int]:
+        if node.type == 'stsd':
+            return node.payload_offset + self._SAMPLE_DESCRIPTION_FIELDS_LENGTH
+        if node.type in self._AUDIO_SAMPLE_ENTRY_TYPES:
+            if node.payload_offset + 10 > node.end:
+                return None
+            version = int.from_bytes(self.__data[node.payload_offset + 8:node.payload_offset + 10], byteorder='big')
+            return node.payload_offset + self._AUDIO_SAMPLE_ENTRY_FIELDS_LENGTH + self._AUDIO_SAMPLE_ENTRY_VERSION_FIELDS_LENGTH.get(version, 0)
+        if node.type in self._VIDEO_SAMPLE_ENTRY_TYPES:
+            return node.payload_offset + self._VIDEO_SAMPLE_ENTRY_FIELDS_LENGTH
+        return None
+
+    @staticmethod
+    def __parse_path_segment(segment: str):
+        match = _PATH_SEGMENT.match(segment)
+        if not match:
+            BoxIndex.__logger.error(f'Invalid box path segment: {segment}')
+            raise ValueError(f"Invalid box path segment: {segment}")
+        index = match.group('index')
+        return match.group('type'), None if index in (None, '*') else int(index)
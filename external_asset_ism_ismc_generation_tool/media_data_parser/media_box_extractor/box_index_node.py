@@ -0,0 +1,27 @@
+from typing import List
+
+
+class BoxIndexNode:
+    """
+    Position of a box inside the data indexed by BoxIndex: the box spans [offset, end), its payload starts at payload_offset.
+    children is filled for the container boxes only.
+    """
+    type: str
+    offset: int
+    payload_offset: int
+    end: int
+    children: List['BoxIndexNode']
+
+    def __init__(self, type: str, offset: int, payload_offset: int, end: int):
+        self.type = type
+        self.offset = offset
+        self.payload_offset = payload_offset
+        self.end = end
+        self.children = []
+
+    @property
+    def size(self) -> int:
+        return self.end - self.offset
+
+    def __repr__(self):
+        return f'BoxIndexNode({self.type}, offset={self.offset}, size={self.size})'
@@ -1,13 +1,15 @@
-from typing import Tuple, Dict, List, Union
+from typing import Tuple, Dict, List, Optional, Union
 from concurrent.futures import ProcessPoolExecutor
 from os import cpu_count
-from tools.pymp4.src.pymp4.parser import Box
 
 from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
 from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
 from external_asset_ism_ismc_generation_tool.common.common import Common
-from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.media_box_extractor import MediaBoxExtractor
+from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.sample_table_decoder import SampleTableDecoder
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.box_index import BoxIndex
 from external_asset_ism_ismc_generation_tool.media_data_parser.media_track_info_extractor import MediaTrackInfoExtractor
+from external_asset_ism_ismc_generation_tool.media_data_parser.moof_demuxer import MoofDemuxer
+from external_asset_ism_ismc_generation_tool.media_data_parser.storage_worker import StorageWorker
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_type import TrackType
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_track_info import MediaTrackInfo
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_data import MediaData
@@ -39,44 +41,92 @@ class MediaDataParser:
 
         return media_data
 
+    @staticmethod
+    def is_parse_in_workers(settings: Optional[dict]) -> bool:
+        """The media files are read and parsed by the worker processes with `parse_in_workers` in multi-threaded mode"""
+        return bool(settings and settings.get('parse_in_workers', False) and settings.get('is_multithreading', False))
+
+    @staticmethod
+    def get_media_data_in_workers(media_blob_names: List[str], media_index_blob_names: List[str], settings: dict) -> MediaData:
+        """
+        Read and parse the media files in worker processes: a worker receives only the name of a file,
+        reads its `moov` and `moof` boxes with its own storage client (see StorageWorker) and returns the parsed MediaData,
+        so the raw boxes are neither held by the parent process nor copied between the processes.
+
+        Args:
+            media_blob_names: Names of the media files
+            media_index_blob_names: Names of the media index (.mpi) files
+            settings: Settings the storage client of each worker is created from
+        """
+        executor = ProcessPoolExecutor(max_workers=cpu_count(), initializer=StorageWorker.initialize, initargs=(settings,))
+        try:
+            media_data = MediaDataParser.aggregate_media_tasks(MediaDataParser.__map_worker_tasks(media_blob_names, executor),
+                                                               MediaDataParser.__map_worker_tasks(media_index_blob_names, executor), executor)
+
+        finally:
+            executor.shutdown()
+
+        return media_data
+
+    @staticmethod
+    def aggregate_media_tasks(media_tasks: dict, media_index_tasks: dict, executor: Optional[ProcessPoolExecutor]) -> MediaData:
+        """
+        Aggregate the tracks of the parsed media files, then update them with the parsed media index (.mpi) files.
+
+        Args:
+            media_tasks: Futures of the parsing of the media files mapped to their names with an executor,
+                names of the media files mapped to their MediaData without
+            media_index_tasks: Same as media_tasks for the media index files
+            executor: Executor the files are parsed with, if any
+        """
+        media_data = MediaData(0, [])
+        MediaDataParser.__process_media_tasks_and_update_media_data(media_tasks, executor, media_data)
+        if media_index_tasks:
+            MediaDataParser.__process_media_tasks_and_update_media_data(media_index_tasks, executor, media_data)
+        MediaDataParser.__update_media_track_info_list(media_data)
+        return media_data
+
+    @staticmethod
+    def fetch_and_parse_media_data(blob_name: str) -> MediaData:
+        """Read the boxes of a media file with the storage client of the worker process and parse them"""
+        return MediaDataParser.parse_media_data(blob_name, StorageWorker.get_media_data(blob_name))
+
     @staticmethod
     def parse_media_data(blob_name: str, media_data: Dict[str, Union[bytes, List[bytes]]]) -> Tuple[int, List[MediaTrackInfo]]:
-        moof_fragments = {}
         media_track_info_list = []
         media_duration = 0
 
-        parsed_moov_box = MediaBoxExtractor.extract_media_boxes(media_data["moov"])
-        if not parsed_moov_box:
-            MediaDataParser.__logger.error(f'Cannot parse moov box: {media_data["moov"]} for {blob_name}')
+        try:
+            box_index = BoxIndex(media_data["moov"], SampleTableDecoder.get_decoders())
+        except ValueError:
+            MediaDataParser.__logger.error(f'Cannot parse moov box for {blob_name}')
             raise ValueError("Cannot parse moov box")
 
-        moov_atom = MediaBoxExtractor.get_mp4_box(parsed_moov_box, 'moov')
-        if moov_atom:
-            mvhd_atom = MediaBoxExtractor.get_mp4_sub_box(moov_atom, 'mvhd')
+        moov_node = box_index.find('moov')
+        if moov_node:
+            # Only the boxes requested below are decoded: stts/stss/stsz into typed arrays, the other sample tables are skipped
+            mvhd_atom = box_index.get_box('mvhd', moov_node)
             media_duration = mvhd_atom['duration'] / mvhd_atom['timescale']
-            trak_atoms = MediaBoxExtractor.get_all_mp4_sub_boxes(moov_atom, 'trak')
-            mvex_atom = MediaBoxExtractor.get_mp4_sub_box(moov_atom, 'mvex')
-            mehd_atom = MediaBoxExtractor.get_mp4_sub_box(mvex_atom, 'mehd')
+            trak_nodes = box_index.find_all('trak[*]', moov_node)
+            mehd_atom = box_index.get_box('mvex/mehd', moov_node)
             if mehd_atom:
                 MediaDataParser.__logger.info(f'Moof boxes are detected in {blob_name}')
                 media_duration = mehd_atom["fragment_duration"] / mvhd_atom['timescale']
-            trex_atom = MediaBoxExtractor.get_mp4_sub_box(mvex_atom, 'trex')
+            trex_atoms = box_index.get_all_boxes('mvex/trex[*]', moov_node)
+            # The moof boxes are parsed once for all the tracks of the file
+            track_timelines = MoofDemuxer.demux(media_data.get(MediaDataParser._MOOFS), trex_atoms)
 
-            for trak_atom in trak_atoms:
-                media_track_info_creator = MediaTrackInfoExtractor(trak_atom, mvhd_atom['duration'], mvhd_atom['timescale'], blob_name, mvex_atom)
-                timescale = media_track_info_creator.timescale
-                MediaDataParser.__fill_moof_fragments_from_boxes(media_data.get(MediaDataParser._MOOFS), moof_fragments, trex_atom, timescale)
-                track_info = media_track_info_creator.get_track_info(moof_fragments)
+            for trak_node in trak_nodes:
+                media_track_info_creator = MediaTrackInfoExtractor(box_index, trak_node, mvhd_atom['duration'], mvhd_atom['timescale'], blob_name)
+                track_info = media_track_info_creator.get_track_info(track_timelines.get(media_track_info_creator.track_id))
                 media_track_info_list.append(track_info)
         else:
-            MediaDataParser.__logger.error(f'Cannot get tracks info: There is no `moov` atom in mp4 data for {blob_name}: {moov_atom}')
+            MediaDataParser.__logger.error(f'Cannot get tracks info: There is no `moov` atom in mp4 data for {blob_name}')
             raise ValueError("There is no 'moov' atom in mp4 data")
         return MediaData(media_duration, media_track_info_list)
 
     @staticmethod
-    def __process_media_tasks_and_update_media_data(media_datas: Dict[str, dict], executor: ProcessPoolExecutor, media_data: MediaData):
-        task_mapping = MediaDataParser.__map_media_tasks(media_datas, executor)
-
+    def __process_media_tasks_and_update_media_data(task_mapping: dict, executor: ProcessPoolExecutor, media_data: MediaData):
         for task in Common.get_completed_tasks(task_mapping, executor):
             blob_name = task_mapping[task] if executor else task
             try:
@@ -97,9 +147,9 @@ class MediaDataParser:
     def __aggregate_media_data(media_datas: Dict[str, dict], media_index_datas: Dict[str, dict], executor: ProcessPoolExecutor) -> MediaData:
         media_data = MediaData(0, [])
 
-        MediaDataParser.__process_media_tasks_and_update_media_data(media_datas, executor, media_data)
+        MediaDataParser.__process_media_tasks_and_update_media_data(MediaDataParser.__map_media_tasks(media_datas, executor), executor, media_data)
         if media_index_datas:
-            MediaDataParser.__process_media_tasks_and_update_media_data(media_index_datas, executor, media_data)
+            MediaDataParser.__process_media_tasks_and_update_media_data(MediaDataParser.__map_media_tasks(media_index_datas, executor), executor, media_data)
 
         return media_data
 
@@ -110,6 +160,10 @@ class MediaDataParser:
         else:
             return {blob_name: MediaDataParser.parse_media_data(blob_name, media_data) for blob_name, media_data in media_datas.items()}
 
+    @staticmethod
+    def __map_worker_tasks(blob_names: List[str], executor: ProcessPoolExecutor) -> dict:
+        return {executor.submit(MediaDataParser.fetch_and_parse_media_data, blob_name): blob_name for blob_name in blob_names}
+
     @staticmethod
     def __update_media_track_info(track_info_lists: List[List[MediaTrackInfo]]) -> List[MediaTrackInfo]:
         media_track_info_list = track_info_lists[0]
@@ -120,35 +174,6 @@ class MediaDataParser:
                     MediaDataParser.__change_track_info(track=media_track, track_index=track)
         return media_track_info_list
 
-    @staticmethod
-    def __get_moof_fragment_duration(trun_atom: Box) -> int:
-        return sum(sample.sample_duration for sample in trun_atom.sample_info)
-
-    @staticmethod
-    def __get_moof_fragment_size(trun_atom: Box) -> int:
-        return sum(sample.sample_size for sample in trun_atom.sample_info)
-
-    @staticmethod
-    def __is_default_sample_duration_set(track_id: int, atom: Box) -> bool:
-        return atom and atom.track_ID == track_id and atom.default_sample_duration
-
-    @staticmethod
-    def __is_default_sample_size_set(track_id: int, trex_atom: Box) -> bool:
-        return trex_atom and trex_atom.track_ID == track_id and trex_atom.default_sample_size
-
-    @staticmethod
-    def __fill_moof_fragment(moof_fragments: Dict[int, List], tfhd_atom: Box, trun_atom: Box, trex_atom: Box, timescale: int) -> None:
-        track_id = tfhd_atom.track_ID
-        sample_count = trun_atom.sample_count
-        fragment = moof_fragments.setdefault(track_id, [[], []])
-        duration = (trex_atom.default_sample_duration * sample_count if MediaDataParser.__is_default_sample_duration_set(track_id, trex_atom)
-                    else tfhd_atom.default_sample_duration * sample_count if MediaDataParser.__is_default_sample_duration_set(track_id, tfhd_atom)
-                    else MediaDataParser.__get_moof_fragment_duration(trun_atom))
-        duration /= timescale
-        fragment[0].append(duration)
-        size = trex_atom.default_sample_size * sample_count if MediaDataParser.__is_default_sample_size_set(track_id, trex_atom) else MediaDataParser.__get_moof_fragment_size(trun_atom)
-        fragment[1].append(size)
-
     @staticmethod
     def __should_change_track_info(track: MediaTrackInfo, track_index: MediaTrackInfo) -> bool:
         return track.track_id == track_index.track_id and track.codec_private_data == track_index.codec_private_data and track.bit_rate == track_index.bit_rate and\
@@ -163,25 +188,6 @@ class MediaDataParser:
         track.bit_rate = track_index.bit_rate
         MediaDataParser.__logger.info(f'Changed chunks, bitrate, added index_blob_name {track.index_blob_name} for {track.blob_name} with track_id {track.track_id}')
 
-    @staticmethod
-    def __fill_moof_fragments_from_boxes(moof_boxes: List[bytes], moof_fragments: Dict[int, List], trex_atom: Box, timescale: int) -> None:
-        if not moof_boxes:
-            return
-        for moof_box in moof_boxes:
-            parsed_moof_box = MediaBoxExtractor.extract_media_boxes(moof_box)
-            if not parsed_moof_box:
-                MediaDataParser.__logger.error(f'Cannot parse moof box: {moof_box}')
-                raise ValueError("Cannot parse moof box")
-            moof_atom = MediaBoxExtractor.get_mp4_box(parsed_moof_box, 'moof')
-            if not moof_atom:
-                MediaDataParser.__logger.error(f'Cannot get moof box from {parsed_moof_box}')
-                raise ValueError("There is no 'moof' atom in mp4 data")
-            traf_atoms = MediaBoxExtractor.get_all_mp4_sub_boxes(moof_atom, 'traf')
-            for traf_atom in traf_atoms:
-                tfhd_atom = MediaBoxExtractor.get_mp4_sub_box(traf_atom, 'tfhd')
-                trun_atom = MediaBoxExtractor.get_mp4_sub_box(traf_atom, 'trun')
-                MediaDataParser.__fill_moof_fragment(moof_fragments, tfhd_atom, trun_atom, trex_atom, timescale)
-
     @staticmethod
     def __update_media_track_info_list(media_data: MediaData) -> None:
         track_names_list = []
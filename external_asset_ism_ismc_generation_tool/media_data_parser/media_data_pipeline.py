@@ -0,0 +1,59 @@
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from typing import Dict, Union
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_data_parser import MediaDataParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_data import MediaData
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_format import MediaFormat
+
+
+class MediaDataPipeline:
+    """
+    Parses the media files while the next ones are being read.
+
+    The boxes of a file are submitted as soon as they are read (see BlobDataHandler) and parsed right away,
+    in the submitting thread or in a worker process in multi-threaded mode; the pipeline keeps only the parsed MediaData,
+    so the boxes of the whole container are never held at once.
+    The tracks of the media index (.mpi) files are applied when all the files are parsed (see get_media_data).
+    """
+    __logger: ILogger = Logger("MediaDataPipeline")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    def __init__(self, is_multithreading: bool = False):
+        # The worker processes are started by the first submission
+        self.__executor = ProcessPoolExecutor(max_workers=cpu_count()) if is_multithreading else None
+        self.__media_tasks: Dict[any, Union[str, MediaData]] = {}
+        self.__media_index_tasks: Dict[any, Union[str, MediaData]] = {}
+
+    def __enter__(self) -> 'MediaDataPipeline':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def submit(self, blob_name: str, media_data: Dict[str, any]) -> None:
+        """Parse the `moov` and `moof` boxes of a media file, the caller drops its references to the boxes"""
+        tasks = self.__media_index_tasks if MediaFormat.is_mpi_format(blob_name) else self.__media_tasks
+        if self.__executor:
+            tasks[self.__executor.submit(MediaDataParser.parse_media_data, blob_name, media_data)] = blob_name
+            return
+        try:
+            tasks[blob_name] = MediaDataParser.parse_media_data(blob_name, media_data)
+        except Exception as e:
+            MediaDataPipeline.__logger.error(f"Error processing blob {blob_name}: {e}")
+
+    def get_media_data(self) -> MediaData:
+        """Wait for the files submitted so far to be parsed and aggregate their tracks"""
+        media_data = MediaDataParser.aggregate_media_tasks(self.__media_tasks, self.__media_index_tasks, self.__executor)
+        self.__media_tasks = {}
+        self.__media_index_tasks = {}
+        return media_data
+
+    def close(self) -> None:
+        if self.__executor:
+            self.__executor.shutdown()
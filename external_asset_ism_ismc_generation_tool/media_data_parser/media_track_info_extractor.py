@@ -1,5 +1,5 @@
 from collections import namedtuple
-from typing import Tuple
+from typing import Optional, Tuple
 
 from tools.pymp4.src.pymp4.parser import Box
 
@@ -15,9 +15,12 @@ from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.stsz_
 from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.stts_parser import STTSParser
 from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.trak_parser import TRAKParser
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_track_info import MediaTrackInfo
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_fragment_timeline import TrackFragmentTimeline
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_timeline import TrackTimeline
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_type import TrackType
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_format import TrackFormat
-from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.media_box_extractor import MediaBoxExtractor
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.box_index import BoxIndex
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.box_index_node import BoxIndexNode
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.audio_track_data import AudioTrackData
 from external_asset_ism_ismc_generation_tool.common.common import Common
 
@@ -32,17 +35,17 @@ class MediaTrackInfoExtractor:
     def redefine_logger(cls, logger: ILogger):
         cls.__logger = logger
 
-    def __init__(self, trak_atom: Box, mvhd_duration: int, mvhd_timescale: int, blob_name: str, mvex_atom: Box):
-        self.trak_parser = TRAKParser(trak_atom)
-        mdia_atom = MediaBoxExtractor.get_mp4_sub_box(trak_atom, 'mdia')
-        minf_atom = MediaBoxExtractor.get_mp4_sub_box(mdia_atom, 'minf')
-        stbl_atom = MediaBoxExtractor.get_mp4_sub_box(minf_atom, 'stbl')
-        trex_atom = MediaBoxExtractor.get_mp4_sub_box(mvex_atom, 'trex')
-        self.stss_parser = STSSParser(MediaBoxExtractor.get_mp4_sub_box(stbl_atom, 'stss'))
-        self.stts_parser = STTSParser(MediaBoxExtractor.get_mp4_sub_box(stbl_atom, 'stts'))
-        self.stsz_parser = STSZParser(MediaBoxExtractor.get_mp4_sub_box(stbl_atom, 'stsz'))
-        self.stsd_parser = STSDParser(MediaBoxExtractor.get_mp4_sub_box(stbl_atom, 'stsd'))
-        self.audio_parser = self.__get_audio_parser(stbl_atom)
+    def __init__(self, box_index: BoxIndex, trak_node: BoxIndexNode, mvhd_duration: int, mvhd_timescale: int, blob_name: str):
+        self.box_index = box_index
+        self.trak_parser = TRAKParser(box_index, trak_node)
+        stbl_node = box_index.find('mdia/minf/stbl', trak_node)
+        mvex_node = box_index.find('moov/mvex')
+        trex_atom = self.__get_trex_atom(mvex_node)
+        self.stss_parser = STSSParser(self.__get_stbl_box(stbl_node, 'stss'))
+        self.stts_parser = STTSParser(self.__get_stbl_box(stbl_node, 'stts'))
+        self.stsz_parser = STSZParser(self.__get_stbl_box(stbl_node, 'stsz'))
+        self.stsd_parser = STSDParser(self.__get_stbl_box(stbl_node, 'stsd'))
+        self.audio_parser = self.__get_audio_parser(stbl_node)
         self.track_type = self.trak_parser.get_track_type()
         # moof box case
         if trex_atom:
@@ -61,24 +64,24 @@ class MediaTrackInfoExtractor:
             # Duration will be calculated from moof fragments later
             self.duration = 0
         self.blob_name = blob_name
-        self.mvex_atom = mvex_atom
+        self.mvex_node = mvex_node
 
-    def get_track_info(self, moof_fragments: dict) -> MediaTrackInfo:
+    def get_track_info(self, track_timeline: Optional[TrackFragmentTimeline]) -> MediaTrackInfo:
         MediaTrackInfoExtractor.__logger.info(f'Get {self.track_type.value} track info from {self.blob_name}')
         if self.track_type == TrackType.VIDEO:
-            return self.__extract_video_track_info(moof_fragments)
+            return self.__extract_video_track_info(track_timeline)
         elif self.track_type == TrackType.AUDIO:
-            return self.__extract_audio_track_info(moof_fragments)
+            return self.__extract_audio_track_info(track_timeline)
         elif self.track_type == TrackType.TEXT:
-            return self.__extract_text_track_info(moof_fragments)
+            return self.__extract_text_track_info(track_timeline)
 
-    def __extract_text_track_info(self, moof_fragments: dict) -> MediaTrackInfo:
-        if not self.mvex_atom:
+    def __extract_text_track_info(self, track_timeline: Optional[TrackFragmentTimeline]) -> MediaTrackInfo:
+        if not self.mvex_node:
             MediaTrackInfoExtractor.__logger.error('No mvex atom in a cmft file')
             raise ValueError('No mvex atom in a cmft file')
 
         four_cc = self.__determine_four_cc()
-        chunks, bitrate = self.__extract_chunks_and_bitrate_from_moof(moof_fragments)
+        chunks, bitrate = self.__extract_chunks_and_bitrate_from_moof(track_timeline)
         
         # Try to get language from track metadata first, then from filename
         # If track language is 'und' (undefined), prefer filename extraction
@@ -100,17 +103,17 @@ class MediaTrackInfoExtractor:
             language=language
         )
 
-    def __extract_video_track_info(self, moof_fragments: dict) -> MediaTrackInfo:
+    def __extract_video_track_info(self, track_timeline: Optional[TrackFragmentTimeline]) -> MediaTrackInfo:
         key_frames_numbers = self.stss_parser.get_key_frames_numbers_from_stss()
 
         if key_frames_numbers:
             chunks = self.stts_parser.get_chunk_durations_from_stts(TrackType.VIDEO, self.timescale, key_frames_numbers)
             bitrate = self.__calculate_bit_rate(self.track_size)
-        elif not self.mvex_atom:
+        elif not self.mvex_node:
             MediaTrackInfoExtractor.__logger.error('stss atom is not defined. Cannot get key frames numbers from stss atom')
             raise ValueError('Cannot extract video track info: stss atom is not defined')
         else:
-            chunks, bitrate = self.__extract_chunks_and_bitrate_from_moof(moof_fragments)
+            chunks, bitrate = self.__extract_chunks_and_bitrate_from_moof(track_timeline)
 
         return MediaTrackInfo(
             track_type=TrackType.VIDEO,
@@ -125,9 +128,9 @@ class MediaTrackInfoExtractor:
             height=self.stsd_parser.get_height()
         )
 
-    def __extract_audio_track_info(self, moof_fragments: dict) -> MediaTrackInfo:
-        if moof_fragments:
-            chunks, calculated_bit_rate = self.__extract_chunks_and_bitrate_from_moof(moof_fragments)
+    def __extract_audio_track_info(self, track_timeline: Optional[TrackFragmentTimeline]) -> MediaTrackInfo:
+        if track_timeline:
+            chunks, calculated_bit_rate = self.__extract_chunks_and_bitrate_from_moof(track_timeline)
         else:
             chunks = self.stts_parser.get_chunk_durations_from_stts(TrackType.AUDIO, self.timescale)
             calculated_bit_rate = self.__calculate_bit_rate(self.track_size)
@@ -187,9 +190,12 @@ class MediaTrackInfoExtractor:
         size_in_bits = size * 8
         return int(size_in_bits / duration)
 
-    def __extract_chunks_and_bitrate_from_moof(self, moof_fragments: dict) -> Tuple[list, int]:
-        track_id_info = moof_fragments.get(self.track_id)
-        chunks, chunk_sizes = track_id_info
+    def __extract_chunks_and_bitrate_from_moof(self, track_timeline: Optional[TrackFragmentTimeline]) -> Tuple[TrackTimeline, int]:
+        if not track_timeline:
+            MediaTrackInfoExtractor.__logger.error(f'No moof fragments for track {self.track_id} in {self.blob_name}')
+            raise ValueError(f'No moof fragments for track {self.track_id}')
+        chunks = TrackTimeline.from_durations(self.timescale, track_timeline.durations)
+        chunk_sizes = track_timeline.sizes
         
         # Calculate bitrate
         # If we have a valid duration from mvhd, use it for consistency with regular MP4 files
@@ -198,10 +204,24 @@ class MediaTrackInfoExtractor:
             bitrate = self.__calculate_bit_rate(sum(chunk_sizes))
         else:
             # For files with invalid mvhd duration (timescale=0), calculate from fragments
-            total_duration = sum(chunks)
+            total_duration = sum(chunks.to_seconds())
             bitrate = self.__calculate_bit_rate(sum(chunk_sizes), total_duration)
         return chunks, bitrate
 
+    def __get_stbl_box(self, stbl_node: Optional[BoxIndexNode], box_name: str) -> Optional[Box]:
+        return self.box_index.get_box(box_name, stbl_node) if stbl_node else None
+
+    def __get_sample_entry_box(self, stbl_node: Optional[BoxIndexNode], box_name: str) -> Optional[Box]:
+        # The decoder configuration box of the first sample entry, or a box of the same type placed directly in `stbl`
+        sample_entry_type = self.stsd_parser.stsd_atom_entries[0].format.decode('latin-1')
+        return self.__get_stbl_box(stbl_node, f'stsd/{sample_entry_type}/{box_name}') or self.__get_stbl_box(stbl_node, box_name)
+
+    def __get_trex_atom(self, mvex_node: Optional[BoxIndexNode]) -> Optional[Box]:
+        # The trex box of this track, or the first one if none matches the tkhd track ID
+        trex_atoms = self.box_index.get_all_boxes('trex', mvex_node) if mvex_node else []
+        track_id = self.trak_parser.get_track_id()
+        return next((trex_atom for trex_atom in trex_atoms if trex_atom.track_ID == track_id), trex_atoms[0] if trex_atoms else None)
+
     def __determine_four_cc(self) -> str:
         if self.stsd_parser.is_stpp:
             return "IMSC"
@@ -211,11 +231,11 @@ class MediaTrackInfoExtractor:
             MediaTrackInfoExtractor.__logger.error('No known FourCC for a text format was found')
             raise ValueError('No known FourCC for a text format was found')
 
-    def __get_audio_parser(self, stbl_atom: Box) -> AudioParser:
+    def __get_audio_parser(self, stbl_node: Optional[BoxIndexNode]) -> AudioParser:
         if self.stsd_parser.stsd_atom_entries[0].format == b'ec-3':
-            return DEC3Parser(MediaBoxExtractor.get_mp4_sub_box(stbl_atom, 'dec3'))
+            return DEC3Parser(self.__get_sample_entry_box(stbl_node, 'dec3'))
         elif self.stsd_parser.stsd_atom_entries[0].format == b'ac-3':
-            dac3_box = MediaBoxExtractor.get_mp4_sub_box(stbl_atom, 'dac3')
+            dac3_box = self.__get_stbl_box(stbl_node, 'dac3')
             if not dac3_box:
                 # AC-3 box might be embedded in the stsd entry data
                 dac3_box = self.__extract_dac3_from_entry()
@@ -224,7 +244,7 @@ class MediaTrackInfoExtractor:
                 raise ValueError('Missing dac3 box for AC-3 audio track')
             return DAC3Parser(dac3_box)
         elif self.stsd_parser.stsd_atom_entries[0].format == b'mp4a':
-            return ESDSParser(MediaBoxExtractor.get_mp4_sub_box(stbl_atom, 'esds'))
+            return ESDSParser(self.__get_sample_entry_box(stbl_node, 'esds'))
         return None
 
     def __extract_dac3_from_entry(self) -> Box:
@@ -5,6 +5,9 @@ class AtomType(Enum):
     MOOV_ATOM_TYPE = 'moov'
     MOOF_ATOM_TYPE = 'moof'
     MFRA_ATOM_TYPE = 'mfra'
+    MFRO_ATOM_TYPE = 'mfro'
+    TFRA_ATOM_TYPE = 'tfra'
+    SIDX_ATOM_TYPE = 'sidx'
     MVEX_ATOM_TYPE = 'mvex'
 
     UNKNOWN = None
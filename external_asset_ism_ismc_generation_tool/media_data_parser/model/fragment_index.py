@@ -0,0 +1,45 @@
+from enum import Enum
+from typing import List, Optional
+
+from external_asset_ism_ismc_generation_tool.common.base_model import BaseModel
+
+
+class FragmentIndexSource(Enum):
+    MFRA = "mfra"
+    SIDX = "sidx"
+
+
+class FragmentIndexEntry(BaseModel):
+    offset: int
+    time: Optional[int]
+    duration: Optional[int]
+    size: Optional[int]
+
+    def __init__(self, offset: int,
+                 time: Optional[int] = None,
+                 duration: Optional[int] = None,
+                 size: Optional[int] = None):
+        self.offset = offset
+        self.time = time
+        self.duration = duration
+        self.size = size
+
+
+class FragmentIndex(BaseModel):
+    """
+    Fragments positions found in the random access (mfra/tfra) or segment index (sidx) boxes.
+    entry.size is the byte span from the fragment's `moof` box to the next fragment (moof + mdat),
+    entry.time and entry.duration are in the index timescale (None if not provided by the index).
+    """
+    source: FragmentIndexSource
+    entries: List[FragmentIndexEntry]
+    timescale: Optional[int]
+
+    def __init__(self, source: FragmentIndexSource, entries: List[FragmentIndexEntry], timescale: Optional[int] = None):
+        self.source = source
+        self.entries = entries
+        self.timescale = timescale
+
+    @property
+    def offsets(self) -> List[int]:
+        return [entry.offset for entry in self.entries]
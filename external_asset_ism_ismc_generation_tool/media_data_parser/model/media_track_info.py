@@ -1,6 +1,7 @@
 from typing import Optional
 
 from external_asset_ism_ismc_generation_tool.common.base_model import BaseModel
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_timeline import TrackTimeline
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_type import TrackType
 
 
@@ -10,7 +11,7 @@ class MediaTrackInfo(BaseModel):
     track_id: int
     chunks: int
     four_cc: str
-    chunk_datas: list
+    chunk_datas: TrackTimeline
     blob_name: str
     codec_private_data: str
     index_blob_name: Optional[str]
@@ -29,7 +30,7 @@ class MediaTrackInfo(BaseModel):
                  track_id: int,
                  chunks: int,
                  four_cc: str,
-                 chunk_datas: list,
+                 chunk_datas: TrackTimeline,
                  blob_name: str,
                  codec_private_data: str = "0",
                  index_blob_name: Optional[str] = None,
@@ -60,11 +61,19 @@ class MediaTrackInfo(BaseModel):
         self.sampling_rate = sampling_rate
         self.language = language
         self.track_name = track_name
+        # The fingerprint is computed once with the track info, e.g. in the worker that parsed the file
+        chunk_datas.get_fingerprint()
+
+    @property
+    def timeline_fingerprint(self) -> str:
+        """Fingerprint of the chunk durations, equal for aligned tracks"""
+        return self.chunk_datas.get_fingerprint()
 
     def is_equal_chunk_data(self, other) -> bool:
         if not other:
             return False
-        return self.chunk_datas == other.chunk_datas
+        # The runs are compared only when the fingerprints are equal
+        return self.timeline_fingerprint == other.timeline_fingerprint and self.chunk_datas == other.chunk_datas
 
     def is_equal_language(self, other) -> bool:
         if not other:
@@ -0,0 +1,39 @@
+from array import array
+
+from external_asset_ism_ismc_generation_tool.common.base_model import BaseModel
+
+
+class TimeToSampleTable(BaseModel):
+    """
+    Entries of an `stts` box: sample_counts[i] consecutive samples last sample_deltas[i] ticks each
+    """
+    sample_counts: array
+    sample_deltas: array
+
+    def __init__(self, sample_counts: array, sample_deltas: array):
+        self.sample_counts = sample_counts
+        self.sample_deltas = sample_deltas
+
+
+class SyncSampleTable(BaseModel):
+    """
+    Entries of an `stss` box: the 1-based numbers of the sync samples (key frames), in increasing order
+    """
+    sample_numbers: array
+
+    def __init__(self, sample_numbers: array):
+        self.sample_numbers = sample_numbers
+
+
+class SampleSizeTable(BaseModel):
+    """
+    Fields of an `stsz` box: entry_sizes is empty when all the samples have the same size `sample_size`
+    """
+    sample_size: int
+    sample_count: int
+    entry_sizes: array
+
+    def __init__(self, sample_size: int, sample_count: int, entry_sizes: array):
+        self.sample_size = sample_size
+        self.sample_count = sample_count
+        self.entry_sizes = entry_sizes
@@ -0,0 +1,33 @@
+from typing import Optional
+
+from external_asset_ism_ismc_generation_tool.common.base_model import BaseModel
+
+
+class TrackFragment(BaseModel):
+    """
+    Fields of one `traf` box needed to build the track timeline.
+    samples_duration and samples_size are the sums of the per-sample values of its `trun` boxes,
+    None if the `trun` boxes do not carry them. default_sample_duration and default_sample_size come from `tfhd`.
+    """
+    track_id: int
+    sample_count: int
+    decode_time: Optional[int]
+    default_sample_duration: Optional[int]
+    default_sample_size: Optional[int]
+    samples_duration: Optional[int]
+    samples_size: Optional[int]
+
+    def __init__(self, track_id: int,
+                 sample_count: int = 0,
+                 decode_time: Optional[int] = None,
+                 default_sample_duration: Optional[int] = None,
+                 default_sample_size: Optional[int] = None,
+                 samples_duration: Optional[int] = None,
+                 samples_size: Optional[int] = None):
+        self.track_id = track_id
+        self.sample_count = sample_count
+        self.decode_time = decode_time
+        self.default_sample_duration = default_sample_duration
+        self.default_sample_size = default_sample_size
+        self.samples_duration = samples_duration
+        self.samples_size = samples_size
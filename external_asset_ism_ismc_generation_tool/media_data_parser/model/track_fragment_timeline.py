@@ -0,0 +1,29 @@
+from typing import List, Optional
+
+from external_asset_ism_ismc_generation_tool.common.base_model import BaseModel
+
+
+class TrackFragmentTimeline(BaseModel):
+    """
+    Fragments of one track collected from the `traf` boxes of all the `moof` boxes of a file, in file order.
+    Durations and decode times are in the timescale of the track (mdhd), sizes in bytes.
+    decode_times holds None for the fragments without a `tfdt` box.
+    """
+    track_id: int
+    durations: List[int]
+    sizes: List[int]
+    decode_times: List[Optional[int]]
+
+    def __init__(self, track_id: int,
+                 durations: Optional[List[int]] = None,
+                 sizes: Optional[List[int]] = None,
+                 decode_times: Optional[List[Optional[int]]] = None):
+        self.track_id = track_id
+        self.durations = durations if durations is not None else []
+        self.sizes = sizes if sizes is not None else []
+        self.decode_times = decode_times if decode_times is not None else []
+
+    def add_fragment(self, duration: int, size: int, decode_time: Optional[int] = None) -> None:
+        self.durations.append(duration)
+        self.sizes.append(size)
+        self.decode_times.append(decode_time)
@@ -0,0 +1,99 @@
+import hashlib
+import struct
+from array import array
+from itertools import repeat
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+class TrackTimeline:
+    """
+    Chunk durations of a track in ticks of the track timescale, run-length encoded:
+    durations[i] is repeated counts[i] times. Consecutive runs always have different durations.
+
+    The runs shall be changed with append() only, so the cached fingerprint stays up to date.
+    """
+    __FINGERPRINT_RUN = struct.Struct('<dq')
+    timescale: int
+    durations: array
+    counts: array
+
+    def __init__(self, timescale: int, durations: Optional[array] = None, counts: Optional[array] = None):
+        self.timescale = timescale
+        self.durations = durations if durations is not None else array('q')
+        self.counts = counts if counts is not None else array('q')
+        self.__fingerprint: Optional[str] = None
+
+    @classmethod
+    def from_durations(cls, timescale: int, durations: Iterable[int]) -> 'TrackTimeline':
+        timeline = cls(timescale)
+        for duration in durations:
+            timeline.append(duration)
+        return timeline
+
+    def append(self, duration: int, count: int = 1) -> None:
+        if count <= 0:
+            return
+        self.__fingerprint = None
+        if self.durations and self.durations[-1] == duration:
+            self.counts[-1] += count
+        else:
+            self.durations.append(duration)
+            self.counts.append(count)
+
+    def runs(self) -> Iterator[Tuple[int, int]]:
+        """Yields the (duration, count) runs"""
+        return zip(self.durations, self.counts)
+
+    def __iter__(self) -> Iterator[int]:
+        for duration, count in self.runs():
+            yield from repeat(duration, count)
+
+    def __len__(self) -> int:
+        return sum(self.counts)
+
+    def __bool__(self) -> bool:
+        return bool(self.durations)
+
+    def get_total_duration(self) -> int:
+        return sum(duration * count for duration, count in self.runs())
+
+    def to_seconds(self) -> List[float]:
+        """Chunk durations in seconds"""
+        return [duration / self.timescale for duration in self]
+
+    def get_fingerprint(self) -> str:
+        """
+        Hash of the chunk durations in seconds, computed once. Equal timelines have the same fingerprint,
+        whatever their timescale, so different fingerprints tell cheaply that two tracks are not aligned.
+        """
+        if self.__fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for seconds, count in self.__get_seconds_runs():
+                digest.update(self.__FINGERPRINT_RUN.pack(seconds, count))
+            self.__fingerprint = digest.hexdigest()
+        return self.__fingerprint
+
+    def __get_seconds_runs(self) -> List[Tuple[float, int]]:
+        # Runs of the chunk durations in seconds, merged when different ticks give the same number of seconds
+        runs = []
+        for duration, count in self.runs():
+            seconds = duration / self.timescale
+            if runs and runs[-1][0] == seconds:
+                runs[-1] = (seconds, runs[-1][1] + count)
+            else:
+                runs.append((seconds, count))
+        return runs
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TrackTimeline):
+            return NotImplemented
+        if self.timescale == other.timescale:
+            return self.durations == other.durations and self.counts == other.counts
+        # Tracks with different timescales have the same timeline if their chunk durations in seconds are the same
+        return self.__get_seconds_runs() == other.__get_seconds_runs()
+
+    def __hash__(self):
+        return hash(self.get_fingerprint())
+
+    def __repr__(self):
+        return f'TrackTimeline(timescale={self.timescale}, runs={list(self.runs())})'
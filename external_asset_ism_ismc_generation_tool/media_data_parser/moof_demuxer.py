@@ -0,0 +1,67 @@
+from typing import Dict, List, Optional
+
+from tools.pymp4.src.pymp4.parser import Box
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_fragment import TrackFragment
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_fragment_timeline import TrackFragmentTimeline
+from external_asset_ism_ismc_generation_tool.media_data_parser.track_fragment_decoder import TrackFragmentDecoder
+
+
+class MoofDemuxer:
+    """
+    Decodes every `moof` box of a file once (see TrackFragmentDecoder) and dispatches its `traf` boxes to per-track timelines keyed by track_ID.
+    """
+    __logger: ILogger = Logger("MoofDemuxer")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    @staticmethod
+    def demux(moof_boxes: Optional[List[bytes]], trex_atoms: List[Box]) -> Dict[int, TrackFragmentTimeline]:
+        """
+        Args:
+            moof_boxes: Complete `moof` boxes of the file in file order
+            trex_atoms: `trex` boxes of the `mvex` box, holding the per-track default sample duration and size
+
+        Returns:
+            Timelines of the tracks found in the `moof` boxes, by track_ID
+        """
+        track_timelines: Dict[int, TrackFragmentTimeline] = {}
+        if not moof_boxes:
+            return track_timelines
+
+        trex_atoms_by_track_id = {trex_atom.track_ID: trex_atom for trex_atom in trex_atoms}
+        for moof_box in moof_boxes:
+            for track_fragment in TrackFragmentDecoder.decode_moof(moof_box):
+                MoofDemuxer.__add_track_fragment(track_timelines, track_fragment, trex_atoms_by_track_id.get(track_fragment.track_id))
+        return track_timelines
+
+    @staticmethod
+    def __add_track_fragment(track_timelines: Dict[int, TrackFragmentTimeline], track_fragment: TrackFragment, trex_atom: Optional[Box]) -> None:
+        track_id = track_fragment.track_id
+        sample_count = track_fragment.sample_count
+
+        if trex_atom and trex_atom.default_sample_duration:
+            duration = trex_atom.default_sample_duration * sample_count
+        elif track_fragment.default_sample_duration:
+            duration = track_fragment.default_sample_duration * sample_count
+        elif track_fragment.samples_duration is not None:
+            duration = track_fragment.samples_duration
+        else:
+            MoofDemuxer.__logger.error(f'No sample durations in the traf box of track {track_id}')
+            raise ValueError(f"Cannot get fragment duration of track {track_id}")
+
+        if trex_atom and trex_atom.default_sample_size:
+            size = trex_atom.default_sample_size * sample_count
+        elif track_fragment.samples_size is not None:
+            size = track_fragment.samples_size
+        elif track_fragment.default_sample_size is not None:
+            size = track_fragment.default_sample_size * sample_count
+        else:
+            MoofDemuxer.__logger.error(f'No sample sizes in the traf box of track {track_id}')
+            raise ValueError(f"Cannot get fragment size of track {track_id}")
+
+        track_timelines.setdefault(track_id, TrackFragmentTimeline(track_id)).add_fragment(duration, size, track_fragment.decode_time)
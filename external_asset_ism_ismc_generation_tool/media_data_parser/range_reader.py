@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Awaitable, Callable, List, Optional, Tuple, Union
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.read_plan import ReadPlan, ReadPlanRunner
+
+
+class RangeReader:
+    """
+    Serves range reads of a file from an aligned read-ahead block cache.
+
+    A read is split into blocks of `block_size` bytes aligned on multiples of `block_size`.
+    Cached blocks are served from memory, adjacent missing blocks are fetched with a single request,
+    and the least recently used blocks are evicted once `max_blocks` blocks are cached.
+    Reading the 8-byte headers of consecutive small boxes therefore costs one request per block instead of one per box.
+    """
+    DEFAULT_BLOCK_SIZE = 65536  # 64 KiB
+    DEFAULT_MAX_BLOCKS = 32
+    __logger: ILogger = Logger("RangeReader")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    def __init__(self, read_part: Callable[[int, int], Union[bytes, Awaitable[bytes]]], size: Optional[int] = None,
+                 block_size: int = DEFAULT_BLOCK_SIZE, max_blocks: int = DEFAULT_MAX_BLOCKS):
+        """
+        Args:
+            read_part: Function (or coroutine function, see read_async()) returning `length` bytes of the file
+                       starting from `offset`: read_part(offset, length). It may return fewer bytes at the end of the file
+            size: Size of the file in bytes, found from the first short read if unknown
+            block_size: Size in bytes of the cached blocks
+            max_blocks: Maximum number of cached blocks
+        """
+        if block_size <= 0 or max_blocks <= 0:
+            RangeReader.__logger.error(f'Invalid block cache settings: block size {block_size}, max blocks {max_blocks}')
+            raise ValueError("Block size and max blocks shall be positive")
+        self.__read_part = read_part
+        self.__size = size
+        self.__block_size = block_size
+        self.__max_blocks = max_blocks
+        self.__blocks: OrderedDict = OrderedDict()
+        self.__lock = Lock()
+        self.requests_count = 0
+
+    @property
+    def size(self) -> Optional[int]:
+        return self.__size
+
+    def read(self, offset: int, length: int) -> bytes:
+        """
+        Read `length` bytes starting from `offset`. Fewer bytes are returned if the read goes past the end of the file.
+        """
+        return ReadPlanRunner.run(self.__read_plan(offset, length), self.__read_part)
+
+    async def read_async(self, offset: int, length: int) -> bytes:
+        """
+        Same as read() for a reader created with a coroutine function as `read_part`
+        """
+        return await ReadPlanRunner.run_async(self.__read_plan(offset, length), self.__read_part)
+
+    def __read_plan(self, offset: int, length: int) -> ReadPlan[bytes]:
+        if length <= 0:
+            return b''
+        stop = offset + length if self.__size is None else min(offset + length, self.__size)
+        if stop <= offset:
+            return b''
+
+        first_block = offset // self.__block_size
+        last_block = (stop - 1) // self.__block_size
+        blocks = {}
+        with self.__lock:
+            for index in range(first_block, last_block + 1):
+                block = self.__blocks.get(index)
+                if block is not None:
+                    self.__blocks.move_to_end(index)
+                    blocks[index] = block
+
+        runs = RangeReader.__get_missing_runs(first_block, last_block, blocks)
+        if runs:
+            datas = yield [(run_first * self.__block_size, (run_last - run_first + 1) * self.__block_size) for run_first, run_last in runs]
+            for (run_first, run_last), data in zip(runs, datas):
+                blocks.update(self.__store_blocks(run_first, run_last, data))
+
+        data = b''.join(blocks[index] for index in range(first_block, last_block + 1) if index in blocks)
+        start = offset - first_block * self.__block_size
+        return data[start:start + stop - offset]
+
+    def __store_blocks(self, first_block: int, last_block: int, data: bytes) -> dict:
+        self.requests_count += 1
+        if len(data) < (last_block - first_block + 1) * self.__block_size:
+            self.__size = first_block * self.__block_size + len(data)
+
+        blocks = {}
+        for index in range(first_block, last_block + 1):
+            block = data[(index - first_block) * self.__block_size:(index - first_block + 1) * self.__block_size]
+            if not block:
+                break
+            blocks[index] = block
+
+        # A read larger than the cache keeps only its last block, which holds the start of the next box
+        cached_indexes = list(blocks)[-1:] if len(blocks) > self.__max_blocks else list(blocks)
+        with self.__lock:
+            for index in cached_indexes:
+                self.__blocks[index] = blocks[index]
+                self.__blocks.move_to_end(index)
+            while len(self.__blocks) > self.__max_blocks:
+                self.__blocks.popitem(last=False)
+        return blocks
+
+    @staticmethod
+    def __get_missing_runs(first_block: int, last_block: int, blocks: dict) -> List[Tuple[int, int]]:
+        runs = []
+        for index in range(first_block, last_block + 1):
+            if index in blocks:
+                continue
+            if runs and runs[-1][1] == index - 1:
+                runs[-1] = (runs[-1][0], index)
+            else:
+                runs.append((index, index))
+        return runs
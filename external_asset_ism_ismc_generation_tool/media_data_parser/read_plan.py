@@ -0,0 +1,88 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Generator, List, Tuple, TypeVar
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+
+T = TypeVar('T')
+ReadRequest = Tuple[int, int]
+# Generator yielding batches of (offset, length) range reads, receiving the read data of each batch
+# and returning its result once all the needed data has been read
+ReadPlan = Generator[List[ReadRequest], List[bytes], T]
+
+
+class ReadPlanRunner:
+    """
+    Runs read plans against a synchronous or an asynchronous source, so the box parsing logic
+    is shared by the thread-based and the asyncio-based I/O paths.
+    The reads of a batch are independent and are issued in parallel.
+    """
+    __logger: ILogger = Logger("ReadPlanRunner")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    @staticmethod
+    def run(read_plan: ReadPlan[T], read_part: Callable[[int, int], bytes], max_workers: int = 1) -> T:
+        """
+        Args:
+            read_plan: Read plan to run
+            read_part: Function returning `length` bytes of the file starting from `offset`: read_part(offset, length)
+            max_workers: Number of threads used to read a batch in parallel
+        """
+        executor = None
+        try:
+            requests = next(read_plan)
+            while True:
+                if executor is None and max_workers > 1 and len(requests) > 1:
+                    executor = ThreadPoolExecutor(max_workers=max_workers)
+                try:
+                    if executor and len(requests) > 1:
+                        datas = list(executor.map(lambda request: ReadPlanRunner.__read(read_part, *request), requests))
+                    else:
+                        datas = [ReadPlanRunner.__read(read_part, offset, length) for offset, length in requests]
+                except Exception as e:
+                    # Read errors are raised inside the plan, so it can handle them like its own errors
+                    requests = read_plan.throw(e)
+                    continue
+                requests = read_plan.send(datas)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            if executor:
+                executor.shutdown()
+
+    @staticmethod
+    async def run_async(read_plan: ReadPlan[T], read_part: Callable[[int, int], Awaitable[bytes]]) -> T:
+        """
+        Args:
+            read_plan: Read plan to run
+            read_part: Coroutine function returning `length` bytes of the file starting from `offset`
+        """
+        try:
+            requests = next(read_plan)
+            while True:
+                try:
+                    datas = await asyncio.gather(*(ReadPlanRunner.__read_async(read_part, offset, length) for offset, length in requests))
+                except Exception as e:
+                    requests = read_plan.throw(e)
+                    continue
+                requests = read_plan.send(list(datas))
+        except StopIteration as stop:
+            return stop.value
+
+    @staticmethod
+    def __read(read_part: Callable[[int, int], bytes], offset: int, length: int) -> bytes:
+        try:
+            return read_part(offset, length)
+        except Exception as e:
+            raise Exception(f"Error reading data at offset {offset}: {str(e)}")
+
+    @staticmethod
+    async def __read_async(read_part: Callable[[int, int], Awaitable[bytes]], offset: int, length: int) -> bytes:
+        try:
+            return await read_part(offset, length)
+        except Exception as e:
+            raise Exception(f"Error reading data at offset {offset}: {str(e)}")
@@ -0,0 +1,46 @@
+from typing import Dict, Optional, Union
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.azure_client.azure_blob_service_client import AzureBlobServiceClient
+from external_asset_ism_ismc_generation_tool.local_file_client.local_file_service_client import LocalFileServiceClient
+from external_asset_ism_ismc_generation_tool.media_data_parser.azure_media_data_parser import AzureMediaDataParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.local_media_data_parser import LocalMediaDataParser
+
+
+class StorageWorker:
+    """
+    Storage access of a worker process parsing media files.
+
+    A worker process receives only the names of the files to parse: its storage client is created once,
+    from the settings, by the initializer of the process, and the `moov` and `moof` boxes are read by the worker itself,
+    so the raw boxes never cross the process boundary.
+    """
+    __logger: ILogger = Logger("StorageWorker")
+    __client: Optional[Union[AzureBlobServiceClient, LocalFileServiceClient]] = None
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    @staticmethod
+    def initialize(settings: dict) -> None:
+        """
+        Initializer of a worker process: creates the storage client of the process,
+        a local directory client if `local_directory` is set, an Azure container client otherwise
+        """
+        if settings.get('local_directory') is not None:
+            StorageWorker.__client = LocalFileServiceClient(settings)
+        else:
+            StorageWorker.__client = AzureBlobServiceClient(settings)
+
+    @staticmethod
+    def get_media_data(blob_name: str) -> Dict[str, any]:
+        """Read the `moov` and `moof` boxes of a media file with the client of the process"""
+        client = StorageWorker.__client
+        if client is None:
+            StorageWorker.__logger.error(f'Storage worker is not initialized, cannot read {blob_name}')
+            raise ValueError("Storage worker is not initialized")
+        if isinstance(client, LocalFileServiceClient):
+            return LocalMediaDataParser.get_media_data(client, blob_name)
+        return AzureMediaDataParser.get_media_data(client, blob_name)
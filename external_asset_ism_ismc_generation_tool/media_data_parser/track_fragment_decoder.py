@@ -0,0 +1,160 @@
+import struct
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_fragment import TrackFragment
+
+_UINT32 = struct.Struct('>I')
+_UINT64 = struct.Struct('>Q')
+_BOX_HEADER = struct.Struct('>I4s')
+
+# tfhd flags
+_BASE_DATA_OFFSET_PRESENT = 0x000001
+_SAMPLE_DESCRIPTION_INDEX_PRESENT = 0x000002
+_DEFAULT_SAMPLE_DURATION_PRESENT = 0x000008
+_DEFAULT_SAMPLE_SIZE_PRESENT = 0x000010
+# trun flags
+_DATA_OFFSET_PRESENT = 0x000001
+_FIRST_SAMPLE_FLAGS_PRESENT = 0x000004
+_SAMPLE_DURATION_PRESENT = 0x000100
+_SAMPLE_SIZE_PRESENT = 0x000200
+_SAMPLE_FLAGS_PRESENT = 0x000400
+_SAMPLE_COMPOSITION_TIME_OFFSETS_PRESENT = 0x000800
+
+
+@lru_cache(maxsize=256)
+def _get_sample_table_struct(values_count: int) -> struct.Struct:
+    return struct.Struct(f'>{values_count}I')
+
+
+class TrackFragmentDecoder:
+    """
+    Decodes the `traf/tfhd`, `traf/tfdt` and `traf/trun` boxes of a `moof` box straight from its bytes.
+
+    Only the fields needed for the track timeline are read: the box headers are walked with struct.unpack_from,
+    and the per-sample table of a `trun` box is unpacked with a single call according to its flags,
+    instead of building a construct container for every sample.
+    """
+    __logger: ILogger = Logger("TrackFragmentDecoder")
+
+    @classmethod
+    def redefine_logger(cls, logger: ILogger):
+        cls.__logger = logger
+
+    @staticmethod
+    def decode_moof(moof_box: bytes) -> List[TrackFragment]:
+        """
+        Args:
+            moof_box: Complete `moof` box (header included)
+
+        Returns:
+            Track fragments of the `traf` boxes in box order
+
+        Raises:
+            ValueError: if the data is not a valid `moof` box
+        """
+        data = memoryview(moof_box)
+        try:
+            boxes = list(TrackFragmentDecoder.__iterate_boxes(data, 0, len(data)))
+            if not boxes or boxes[0][0] != b'moof':
+                raise ValueError("There is no 'moof' atom in mp4 data")
+            _, moof_start, moof_end = boxes[0]
+            return [TrackFragmentDecoder.__decode_traf(data, start, end)
+                    for box_type, start, end in TrackFragmentDecoder.__iterate_boxes(data, moof_start, moof_end) if box_type == b'traf']
+        except (struct.error, ValueError) as e:
+            TrackFragmentDecoder.__logger.error(f'Cannot parse moof box: {e}')
+            raise ValueError(f"Cannot parse moof box: {e}")
+
+    @staticmethod
+    def __iterate_boxes(data: memoryview, position: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+        """Yields (type, payload start, box end) of the boxes between `position` and `end`"""
+        while position + 8 <= end:
+            size, box_type = _BOX_HEADER.unpack_from(data, position)
+            payload_start = position + 8
+            if size == 1:
+                size = _UINT64.unpack_from(data, payload_start)[0]
+                payload_start += 8
+            elif size == 0:
+                size = end - position
+            if size < payload_start - position or position + size > end:
+                raise ValueError(f"Invalid size {size} of the {box_type} box at offset {position}")
+            yield box_type, payload_start, position + size
+            position += size
+
+    @staticmethod
+    def __decode_traf(data: memoryview, traf_start: int, traf_end: int) -> TrackFragment:
+        track_fragment = None
+        decode_time = None
+        sample_count = 0
+        durations: List[Optional[int]] = []
+        sizes: List[Optional[int]] = []
+        for box_type, start, end in TrackFragmentDecoder.__iterate_boxes(data, traf_start, traf_end):
+            if box_type == b'tfhd':
+                track_fragment = TrackFragmentDecoder.__decode_tfhd(data, start)
+            elif box_type == b'tfdt':
+                decode_time = TrackFragmentDecoder.__decode_tfdt(data, start)
+            elif box_type == b'trun':
+                trun_sample_count, duration, size = TrackFragmentDecoder.__decode_trun(data, start, end)
+                sample_count += trun_sample_count
+                durations.append(duration)
+                sizes.append(size)
+        if track_fragment is None:
+            raise ValueError("There is no 'tfhd' atom in traf")
+
+        track_fragment.sample_count = sample_count
+        track_fragment.decode_time = decode_time
+        track_fragment.samples_duration = sum(durations) if durations and None not in durations else None
+        track_fragment.samples_size = sum(sizes) if sizes and None not in sizes else None
+        return track_fragment
+
+    @staticmethod
+    def __decode_tfhd(data: memoryview, position: int) -> TrackFragment:
+        flags = _UINT32.unpack_from(data, position)[0] & 0xFFFFFF
+        track_id = _UINT32.unpack_from(data, position + 4)[0]
+        position += 8
+        if flags & _BASE_DATA_OFFSET_PRESENT:
+            position += 8
+        if flags & _SAMPLE_DESCRIPTION_INDEX_PRESENT:
+            position += 4
+        default_sample_duration = None
+        if flags & _DEFAULT_SAMPLE_DURATION_PRESENT:
+            default_sample_duration = _UINT32.unpack_from(data, position)[0]
+            position += 4
+        default_sample_size = None
+        if flags & _DEFAULT_SAMPLE_SIZE_PRESENT:
+            default_sample_size = _UINT32.unpack_from(data, position)[0]
+        return TrackFragment(track_id, default_sample_duration=default_sample_duration, default_sample_size=default_sample_size)
+
+    @staticmethod
+    def __decode_tfdt(data: memoryview, position: int) -> int:
+        version = data[position]
+        if version == 1:
+            return _UINT64.unpack_from(data, position + 4)[0]
+        return _UINT32.unpack_from(data, position + 4)[0]
+
+    @staticmethod
+    def __decode_trun(data: memoryview, position: int, end: int) -> Tuple[int, Optional[int], Optional[int]]:
+        flags = _UINT32.unpack_from(data, position)[0] & 0xFFFFFF
+        sample_count = _UINT32.unpack_from(data, position + 4)[0]
+        position += 8
+        if flags & _DATA_OFFSET_PRESENT:
+            position += 4
+        if flags & _FIRST_SAMPLE_FLAGS_PRESENT:
+            position += 4
+
+        # Every per-sample field is 4 bytes long, a sample is `fields_count` consecutive 32-bit values
+        has_duration = bool(flags & _SAMPLE_DURATION_PRESENT)
+        has_size = bool(flags & _SAMPLE_SIZE_PRESENT)
+        fields_count = (has_duration + has_size + bool(flags & _SAMPLE_FLAGS_PRESENT)
+                        + bool(flags & _SAMPLE_COMPOSITION_TIME_OFFSETS_PRESENT))
+        if position + sample_count * fields_count * 4 > end:
+            raise ValueError(f"trun sample table of {sample_count} samples exceeds the box")
+        if not (has_duration or has_size) or not sample_count:
+            return sample_count, 0 if has_duration else None, 0 if has_size else None
+
+        values = _get_sample_table_struct(sample_count * fields_count).unpack_from(data, position)
+        duration = sum(values[0::fields_count]) if has_duration else None
+        size = sum(values[int(has_duration)::fields_count]) if has_size else None
+        return sample_count, duration, size
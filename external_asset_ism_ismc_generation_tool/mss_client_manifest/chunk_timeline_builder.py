@@ -0,0 +1,103 @@
+import decimal
+from typing import List
+
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.chunk_data import ChunkData
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_timeline import TrackTimeline
+
+
+class ChunkTimelineBuilder:
+    """
+    Builds the `<c t d r>` chunks of a stream from the run-length encoded track timeline.
+
+    The chunk durations are converted to the manifest timescale as Decimals, the start time of every chunk
+    is the rounded sum of the previous durations, and a chunk duration is adjusted by the rounding difference
+    so the rounded durations add up to the rounded start times. Equal consecutive durations are merged in `r` repeats.
+
+    The sums and the rounding are done on integers scaled by a power of ten so the Decimals are exact integers,
+    and the chunks of a run whose rounding difference is always 0 are merged at once instead of one by one.
+    """
+    @staticmethod
+    def build(timeline: TrackTimeline, timescale: int) -> List[ChunkData]:
+        """
+        Args:
+            timeline: Chunk durations in ticks of the track timescale
+            timescale: Timescale of the manifest
+
+        Returns:
+            Chunks of the stream, the first one with a start time
+        """
+        durations = {ticks: decimal.Decimal(str(ticks / timeline.timescale * timescale)) for ticks in set(timeline.durations)}
+        if not durations:
+            return []
+        scale = 10 ** max(0, max(-duration.as_tuple().exponent for duration in durations.values()))
+        half_scale, odd_scale = divmod(scale, 2)
+        # Scaled duration and rounded duration of each distinct chunk duration
+        scaled_durations = {}
+        for ticks, duration in durations.items():
+            numerator, denominator = duration.as_integer_ratio()
+            scaled_duration = numerator * scale // denominator
+            scaled_durations[ticks] = (scaled_duration, ChunkTimelineBuilder.__round(scaled_duration, scale))
+
+        # Chunks as [duration, scaled duration, repeat]
+        chunks: List[list] = []
+        # Scaled sum of the durations of the chunks before the last added one, and its rounded value
+        time_start = 0
+        time_start_round = 0
+        # Repeat counter of the last added chunk, it is not reset when a chunk is split
+        current_r = 1
+        previous_duration = previous_round = 0
+        for ticks, count in timeline.runs():
+            duration = durations[ticks]
+            scaled_duration, rounded_duration = scaled_durations[ticks]
+            if not chunks:
+                chunks.append([duration, scaled_duration, current_r])
+                previous_duration, previous_round = scaled_duration, rounded_duration
+                count -= 1
+            is_integer_duration = scaled_duration % scale == 0
+            while count > 0:
+                # With an integer duration, the fractional part of the start time does not change along the run:
+                # the rounding difference is 0 unless the start time ends with .5 and an odd duration changes its rounding
+                if is_integer_duration and previous_duration == scaled_duration and \
+                        (odd_scale or time_start % scale != half_scale or rounded_duration % 2 == 0):
+                    time_start += count * scaled_duration
+                    time_start_round += count * rounded_duration
+                    current_r += count
+                    chunks[-1][2] = current_r
+                    break
+
+                # The start time is the sum of the previous chunk durations, the previous chunk is adjusted by the rounding difference
+                time_start += previous_duration
+                quotient, remainder = divmod(time_start, scale)
+                rounded = quotient + 1 if 2 * remainder > scale or (2 * remainder == scale and quotient & 1) else quotient
+                diff = rounded - time_start_round - previous_round
+                time_start_round = rounded
+
+                last_chunk = chunks[-1]
+                if diff != 0:
+                    if last_chunk[2] > 1:
+                        last_chunk[2] -= 1
+                        last_chunk = [last_chunk[0] + diff, last_chunk[1] + diff * scale, 1]
+                        chunks.append(last_chunk)
+                    else:
+                        last_chunk[0] += diff
+                        last_chunk[1] += diff * scale
+
+                if last_chunk[1] == scaled_duration:
+                    current_r += 1
+                    last_chunk[2] = current_r
+                else:
+                    current_r = 1
+                    chunks.append([duration, scaled_duration, current_r])
+                previous_duration, previous_round = scaled_duration, rounded_duration
+                count -= 1
+
+        return [ChunkData(time_start='0' if index == 0 else None, duration=duration, r=str(repeat))
+                for index, (duration, _, repeat) in enumerate(chunks)]
+
+    @staticmethod
+    def __round(value: int, scale: int) -> int:
+        # Same as round() of the Decimal value: half to even
+        quotient, remainder = divmod(value, scale)
+        if 2 * remainder > scale or (2 * remainder == scale and quotient % 2 == 1):
+            return quotient + 1
+        return quotient
@@ -1,14 +1,16 @@
 import decimal
-import xml.etree.ElementTree as ET
+import io
 from itertools import chain
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Tuple, Dict, TextIO
 
 from external_asset_ism_ismc_generation_tool.common.common import Common
 from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
 from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.common.xml_stream_writer import XmlStreamWriter
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.four_cc import FourCC
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_track_info import MediaTrackInfo
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_type import TrackType
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.chunk_timeline_builder import ChunkTimelineBuilder
 from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.chunk_data import ChunkData
 from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.quality_level import QualityLevel
 from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.smooth_streaming_media import SmoothStreamingMedia
@@ -31,6 +33,16 @@ class IsmcGenerator:
 
     @staticmethod
     def generate(duration: int, media_track_infos: List[MediaTrackInfo], text_data_info_list: Optional[List[TextDataInfo]] = None) -> str:
+        sink = io.StringIO()
+        IsmcGenerator.write(sink, duration, media_track_infos, text_data_info_list)
+        return sink.getvalue()
+
+    @staticmethod
+    def write(sink: TextIO, duration: int, media_track_infos: List[MediaTrackInfo], text_data_info_list: Optional[List[TextDataInfo]] = None) -> None:
+        """
+        Write the client manifest to `sink` one element at a time, the chunks are never held as XML elements.
+        The written text is the same as the one returned by generate()
+        """
         IsmcGenerator.__logger.info('Create client (.ismc) manifest')
 
         audio_stream_indexes = IsmcGenerator.__get_stream_indexes(
@@ -51,15 +63,16 @@ class IsmcGenerator:
         for stream_index in stream_indexes:
             ismc_document.add_stream_index(stream_index)
 
-        xml_ismc = ismc_document.to_xml()
-        ET.indent(xml_ismc)
-        return ET.tostring(xml_ismc, encoding="utf-8", method="xml", xml_declaration=True).decode("utf-8")
+        writer = XmlStreamWriter(sink)
+        ismc_document.write_xml(writer)
+        writer.close()
 
     @staticmethod
     def __get_stream_indexes(
             media_track_infos: List[MediaTrackInfo], track_type: TrackType, url_pattern: str, text_data_info_list: Optional[List[TextDataInfo]] = None) -> List[StreamIndex]:
         stream_indexes = []
         filtered_tracks = IsmcGenerator.__get_filtered_tracks(media_track_infos, track_type)
+        IsmcGenerator.__log_unaligned_tracks(filtered_tracks, track_type)
         different_stream_index_tracks = IsmcGenerator.__group_tracks_by_chunks(filtered_tracks)
 
         for id_tracks, tracks in different_stream_index_tracks.items():
@@ -114,6 +127,19 @@ class IsmcGenerator:
             index += 1
         return quality_levels
 
+    @staticmethod
+    def __log_unaligned_tracks(tracks: List[MediaTrackInfo], track_type: TrackType) -> None:
+        # Tracks of the same language with different timelines cannot share a stream index
+        timelines_by_language: Dict[Optional[str], Dict[str, List[str]]] = {}
+        for track in tracks:
+            timelines = timelines_by_language.setdefault(track.language, {})
+            timelines.setdefault(track.timeline_fingerprint, []).append(track.blob_name)
+        for language, timelines in timelines_by_language.items():
+            if len(timelines) > 1:
+                blob_names = '; '.join(f'{fingerprint[:8]}: {", ".join(blob_names)}' for fingerprint, blob_names in timelines.items())
+                IsmcGenerator.__logger.warning(f'{track_type.value} tracks with language {language} are not aligned, '
+                                               f'{len(timelines)} different chunk timelines: {blob_names}')
+
     @staticmethod
     def __group_tracks_by_chunks(tracks: List[MediaTrackInfo]) -> Dict[int, List[MediaTrackInfo]]:
         different_stream_index_tracks = {}
@@ -166,50 +192,15 @@ class IsmcGenerator:
     def __get_chunks(media_track_info: Optional[MediaTrackInfo] = None, text_stream_timings: Optional[Tuple] = None, timescale: int = 0) -> List[ChunkData]:
         c = []
         current_r = 1  # Start with r = 1 for the first chunk
-        time_start = 0
-        time_start_round = 0
 
         if media_track_info:
-            for index, chunk in enumerate(media_track_info.chunk_datas):
-                duration = decimal.Decimal(str(chunk * timescale))
-
-                if index == 0:
-                    IsmcGenerator.__add_new_chunk(c, duration, time_start, str(current_r))
-                else:
-                    time_start += c[-1].duration
-                    time_start_round += round(c[-1].duration)
-
-                    diff = round(time_start) - time_start_round
-                    if diff != 0:
-                        new_chunk = IsmcGenerator.__adjust_previous_chunk_duration(c, diff)
-                        if new_chunk:
-                            c.append(new_chunk)
-                        time_start_round += diff
-
-                    if c[-1].duration == duration:
-                        current_r += 1
-                        c[-1].r = str(current_r)
-                    else:
-                        current_r = 1
-                        IsmcGenerator.__add_new_chunk(c, duration, None, str(current_r))
+            c = ChunkTimelineBuilder.build(media_track_info.chunk_datas, timescale)
         elif text_stream_timings:
             time_start = str(int(text_stream_timings[0] * timescale))
             duration = decimal.Decimal(str(text_stream_timings[1] * timescale))
             IsmcGenerator.__add_new_chunk(c, duration, time_start, str(current_r))
         return c
 
-    @staticmethod
-    def __adjust_previous_chunk_duration(chunks: List[ChunkData], diff: int) -> Optional[ChunkData]:
-        last_chunk = chunks[-1]
-        last_repeat = int(last_chunk.r)
-        if last_repeat > 1:
-            last_chunk.r = str(last_repeat - 1)
-            new_chunk_duration = last_chunk.duration + diff
-            return ChunkData(duration=new_chunk_duration, r='1')
-        else:
-            last_chunk.duration += diff
-        return None
-
     @staticmethod
     def __add_new_chunk(chunks: List[ChunkData], duration: decimal.Decimal, time_start: Optional[str], repeat: str = '1') -> None:
         time_start_str = str(time_start) if time_start is not None else None
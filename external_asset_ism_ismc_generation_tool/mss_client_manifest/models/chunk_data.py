@@ -1,8 +1,9 @@
 import decimal
 import xml.etree.ElementTree as ET
-from typing import Optional
+from typing import Dict, Optional
 
 from external_asset_ism_ismc_generation_tool.common.base_model import BaseModel
+from external_asset_ism_ismc_generation_tool.common.xml_stream_writer import XmlStreamWriter
 
 
 class ChunkData(BaseModel):
@@ -18,13 +19,20 @@ class ChunkData(BaseModel):
         self.r = r
 
     def to_xml(self) -> ET.Element:
-        chunk = ET.Element("c")
+        return ET.Element("c", self.__get_attributes())
+
+    def write_xml(self, writer: XmlStreamWriter) -> None:
+        writer.start("c", self.__get_attributes())
+        writer.end()
+
+    def __get_attributes(self) -> Dict[str, str]:
+        attributes = {}
         if self.time_start:
-            chunk.set("t", self.time_start)
+            attributes["t"] = self.time_start
         if self.number:
-            chunk.set("n", self.number)
+            attributes["n"] = self.number
         if self.duration:
-            chunk.set("d", str(round(self.duration)))
+            attributes["d"] = str(round(self.duration))
         if self.r:
-            chunk.set("r", self.r)
-        return chunk
+            attributes["r"] = self.r
+        return attributes
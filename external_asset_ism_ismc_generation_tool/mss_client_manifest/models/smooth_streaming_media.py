@@ -2,6 +2,7 @@ import xml.etree.ElementTree as ET
 from typing import Optional
 
 from external_asset_ism_ismc_generation_tool.common.base_model import BaseModel
+from external_asset_ism_ismc_generation_tool.common.xml_stream_writer import XmlStreamWriter
 
 
 class SmoothStreamingMedia(BaseModel):
@@ -39,6 +40,25 @@ class SmoothStreamingMedia(BaseModel):
         self.protections.append(protection)
 
     def to_xml(self) -> ET.Element:
+        smooth_streaming_media = self.__get_element()
+        for stream_index in self.stream_indexes:
+            if stream_index:
+                smooth_streaming_media.append(stream_index.to_xml())
+
+        return smooth_streaming_media
+
+    def write_xml(self, writer: XmlStreamWriter) -> None:
+        # The stream indexes are written one by one instead of being added to the element
+        smooth_streaming_media = self.__get_element()
+        writer.start(smooth_streaming_media.tag, smooth_streaming_media.attrib)
+        for protection in smooth_streaming_media:
+            writer.write(protection)
+        for stream_index in self.stream_indexes:
+            if stream_index:
+                stream_index.write_xml(writer)
+        writer.end()
+
+    def __get_element(self) -> ET.Element:
         smooth_streaming_media = ET.Element("SmoothStreamingMedia")
         smooth_streaming_media.set("MajorVersion", str(self.major_version))
         smooth_streaming_media.set("MinorVersion", str(self.minor_version))
@@ -55,9 +75,4 @@ class SmoothStreamingMedia(BaseModel):
         for protection in self.protections:
             if protection:
                 smooth_streaming_media.append(protection.to_xml())
-
-        for stream_index in self.stream_indexes:
-            if stream_index:
-                smooth_streaming_media.append(stream_index.to_xml())
-
         return smooth_streaming_media
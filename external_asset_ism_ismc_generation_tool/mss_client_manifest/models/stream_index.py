@@ -3,6 +3,7 @@ from typing import Optional
 
 from external_asset_ism_ismc_generation_tool.common.base_model import BaseModel
 from external_asset_ism_ismc_generation_tool.common.common import Common
+from external_asset_ism_ismc_generation_tool.common.xml_stream_writer import XmlStreamWriter
 from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.stream_type import StreamType
 
 
@@ -50,6 +51,25 @@ class StreamIndex(BaseModel):
         self.chunk_datas.append(chunk_data)
 
     def to_xml(self) -> ET.Element:
+        stream_index = self.__get_element()
+        for chunk_data in self.chunk_datas:
+            if chunk_data:
+                stream_index.append(chunk_data.to_xml())
+
+        return stream_index
+
+    def write_xml(self, writer: XmlStreamWriter) -> None:
+        # The chunks are written one by one instead of being added to the element
+        stream_index = self.__get_element()
+        writer.start(stream_index.tag, stream_index.attrib)
+        for quality_level in stream_index:
+            writer.write(quality_level)
+        for chunk_data in self.chunk_datas:
+            if chunk_data:
+                chunk_data.write_xml(writer)
+        writer.end()
+
+    def __get_element(self) -> ET.Element:
         stream_index = ET.Element("StreamIndex")
         if self.stream_type.value:
             stream_index.set("Type", self.stream_type.value)
@@ -76,9 +96,4 @@ class StreamIndex(BaseModel):
                 stream_index.append(quality_level.to_xml())
 
         Common.sort_attributes_in_xml(stream_index)
-
-        for chunk_data in self.chunk_datas:
-            if chunk_data:
-                stream_index.append(chunk_data.to_xml())
-
         return stream_index
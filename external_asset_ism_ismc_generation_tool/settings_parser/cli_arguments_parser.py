@@ -17,6 +17,8 @@ class CliArgumentsParser:
         argument_parser.add_argument('-connection_string', metavar='connection_string', type=str, help="Connection string for the Azure Storage account.")
         argument_parser.add_argument('-container_name', metavar="container_name", type=str, help="Azure container name")
         argument_parser.add_argument("-is_multithreading", action="store_true", help="Enable multi-threaded mode. Default is single-threaded mode.")
+        argument_parser.add_argument("-parse_in_workers", action="store_true", help="With -is_multithreading, read and parse the media files in worker processes.")
+        argument_parser.add_argument("-is_async", action="store_true", help="Use the asyncio Azure I/O path with a bounded number of requests in flight.")
         argument_parser.add_argument("-asset_zip_name", metavar="asset_zip_name", type=str, help="Name of the asset zip file.")
         argument_parser.add_argument("-local_copy", action="store_true", help="Create local copy of ISM/ISMC files.")
         argument_parser.add_argument('-local_directory', metavar='local_directory', type=str, help="Local directory containing MP4 files (alternative to Azure)")
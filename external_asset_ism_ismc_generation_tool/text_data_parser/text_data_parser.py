@@ -27,6 +27,16 @@ class TextDataParser:
 
         try:
             blob_contents = az_blob_service_client.download_part_of_blob(blob_name=blob_name)
+        except Exception as e:
+            TextDataParser.__logger.error(f"Failed to process subtitle file {blob_name}: {e}")
+            TextDataParser.__logger.warning(f"Skipping {blob_name} and continuing with other files")
+            return None
+
+        return TextDataParser.get_text_data_info_from_contents(blob_name, blob_contents)
+
+    @staticmethod
+    def get_text_data_info_from_contents(blob_name: str, blob_contents: bytes) -> Optional[TextDataInfo]:
+        try:
             blob_contents = blob_contents.decode("utf-8")
 
             if blob_contents.startswith('\ufeff'):
@@ -1,13 +1,21 @@
+import asyncio
+import io
+import tempfile
+from typing import IO, Callable, Optional, TextIO
+
 from external_asset_ism_ismc_generation_tool.common.common import Common
 from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
 from external_asset_ism_ismc_generation_tool.media_data_parser.media_data_parser import MediaDataParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_data_pipeline import MediaDataPipeline
 from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_data import MediaData
 from external_asset_ism_ismc_generation_tool.blob_data_handler.blob_data_handler import BlobDataHandler
+from external_asset_ism_ismc_generation_tool.blob_data_handler.async_blob_data_handler import AsyncBlobDataHandler
 from external_asset_ism_ismc_generation_tool.mss_client_manifest.ismc_generator import IsmcGenerator
 from external_asset_ism_ismc_generation_tool.mss_server_manifest.ism_generator import IsmGenerator
 from external_asset_ism_ismc_generation_tool.settings_parser.cli_arguments_parser import CliArgumentsParser
 from external_asset_ism_ismc_generation_tool.settings_parser.config_file_parser import ConfigFileParser
 from external_asset_ism_ismc_generation_tool.azure_client.azure_blob_service_client import AzureBlobServiceClient
+from external_asset_ism_ismc_generation_tool.azure_client.async_azure_blob_service_client import AsyncAzureBlobServiceClient
 from external_asset_ism_ismc_generation_tool.blob_data_handler.model.blob_media_data import BlobMediaData
 from external_asset_ism_ismc_generation_tool.local_file_client.local_file_service_client import LocalFileServiceClient
 from external_asset_ism_ismc_generation_tool.local_data_handler.local_data_handler import LocalDataHandler
@@ -54,6 +62,37 @@ def convert_vtt_to_cmft(settings: dict, use_local: bool = False) -> ConversionSu
         # Return empty summary on error
         return ConversionSummary()
 
+# Manifests larger than this are spooled to a temporary file on disk before their upload
+MANIFEST_SPOOL_SIZE = 16 * 1024 * 1024
+
+def write_manifest(write: Callable[[TextIO], None], local_copy_path: Optional[str] = None) -> IO[bytes]:
+    """
+    Stream a manifest to its local copy when requested, or to a spooled temporary file otherwise.
+
+    Args:
+        write: Function writing the manifest to a text stream, e.g. IsmcGenerator.write
+        local_copy_path: Path of the local copy of the manifest
+
+    Returns:
+        The binary file holding the UTF-8 manifest, rewound so it can be uploaded. The caller closes it
+    """
+    manifest_file = open(local_copy_path, 'w+b') if local_copy_path else tempfile.SpooledTemporaryFile(max_size=MANIFEST_SPOOL_SIZE)
+    text_file = io.TextIOWrapper(manifest_file, encoding='utf-8', newline='')
+    write(text_file)
+    text_file.flush()
+    text_file.detach()
+    manifest_file.seek(0)
+    return manifest_file
+
+def get_media_data(blob_media_data: BlobMediaData, settings: dict) -> MediaData:
+    """
+    Parse the media files read by the data handler or, with `parse_in_workers` in multi-threaded mode,
+    read and parse them in worker processes: the data handler then only lists their names.
+    """
+    if settings.get('parse_in_workers', False) and settings.get('is_multithreading', False):
+        return MediaDataParser.get_media_data_in_workers(blob_media_data.media_blob_names, blob_media_data.media_index_blob_names, settings)
+    return MediaDataParser.get_media_data(blob_media_data.media_datas, blob_media_data.media_index_datas, settings.get('is_multithreading', False))
+
 def generate_manifests_azure_use(settings: dict) -> ManifestResult:
     """
     Generate and upload server and client manifests (.ism and .ismc) to the Azure container.
@@ -69,8 +108,14 @@ def generate_manifests_azure_use(settings: dict) -> ManifestResult:
     
     az_blob_service_client: AzureBlobServiceClient = AzureBlobServiceClient(settings)
 
-    blob_media_data: BlobMediaData = BlobDataHandler.get_data_from_blobs(az_blob_service_client, settings)
-    media_data: MediaData = MediaDataParser.get_media_data(blob_media_data.media_datas, blob_media_data.media_index_datas, settings.get('is_multithreading', False))
+    if settings.get('parse_in_workers', False) and settings.get('is_multithreading', False):
+        blob_media_data: BlobMediaData = BlobDataHandler.get_data_from_blobs(az_blob_service_client, settings)
+        media_data: MediaData = get_media_data(blob_media_data, settings)
+    else:
+        # The media blobs are parsed as soon as they are downloaded, while the next ones are downloaded
+        with MediaDataPipeline(settings.get('is_multithreading', False)) as media_data_pipeline:
+            blob_media_data: BlobMediaData = BlobDataHandler.get_data_from_blobs(az_blob_service_client, settings, media_data_pipeline)
+            media_data: MediaData = media_data_pipeline.get_media_data()
 
     result = ManifestResult(manifest_name=blob_media_data.manifest_name)
     
@@ -85,14 +130,12 @@ def generate_manifests_azure_use(settings: dict) -> ManifestResult:
     audios = IsmGenerator.get_audios(media_track_infos=media_data.media_track_info_list)
     videos = IsmGenerator.get_videos(media_track_infos=media_data.media_track_info_list)
     text_streams = IsmGenerator.get_text_streams(media_data.media_track_info_list, blob_media_data.text_data_info_list)
-    ism_xml_string = IsmGenerator.generate(blob_media_data.manifest_name, audios=audios, videos=videos, text_streams=text_streams)
 
     # Create local copy of ISM file
-    if (settings.get('local_copy', False)):
-        with open(server_manifest_name, 'wb') as f:
-            f.write(ism_xml_string.encode('utf-8'))
-
-    az_blob_service_client.upload_blob_to_container(server_manifest_name, ism_xml_string, overwrite=False)
+    local_copy_path = server_manifest_name if settings.get('local_copy', False) else None
+    with write_manifest(lambda sink: IsmGenerator.write(sink, blob_media_data.manifest_name, audios=audios, videos=videos, text_streams=text_streams),
+                        local_copy_path) as ism_file:
+        az_blob_service_client.upload_blob_to_container(server_manifest_name, ism_file, overwrite=False)
     logger.info(f"{server_manifest_name} is created and stored to the {az_blob_service_client.container_client.container_name} container")
     result.ism_created = True
 
@@ -104,20 +147,78 @@ def generate_manifests_azure_use(settings: dict) -> ManifestResult:
         client_manifest_name = f'{blob_media_data.manifest_name}_new.ismc'
         logger.info(f"Existing manifest found, generating new manifest as {client_manifest_name}")
     
-    ismc_xml_string = IsmcGenerator.generate(duration=media_data.media_duration, media_track_infos=media_data.media_track_info_list, text_data_info_list=blob_media_data.text_data_info_list)
-
     # Create local copy of ISMC file
-    if (settings.get('local_copy', False)):
-        with open(client_manifest_name, 'wb') as f:
-            f.write(ismc_xml_string.encode('utf-8'))
-
-    az_blob_service_client.upload_blob_to_container(client_manifest_name, ismc_xml_string, overwrite=False)
+    local_copy_path = client_manifest_name if settings.get('local_copy', False) else None
+    with write_manifest(lambda sink: IsmcGenerator.write(sink, duration=media_data.media_duration, media_track_infos=media_data.media_track_info_list,
+                                                         text_data_info_list=blob_media_data.text_data_info_list),
+                        local_copy_path) as ismc_file:
+        az_blob_service_client.upload_blob_to_container(client_manifest_name, ismc_file, overwrite=False)
     logger.info(f"{client_manifest_name} is created and stored to the {az_blob_service_client.container_client.container_name} container")
 
     result.ismc_created = True
     
     return result
 
+def generate_manifests_azure_async_use(settings: dict) -> ManifestResult:
+    """
+    Generate and upload server and client manifests (.ism and .ismc) to the Azure container
+    using the asyncio Azure I/O path (listing, media parsing and uploads as coroutines).
+
+    Args:
+        settings: Configuration settings including Azure connection info
+
+    Returns:
+        ManifestResult with generation status
+    """
+    return asyncio.run(_generate_manifests_azure_async_use(settings))
+
+async def _generate_manifests_azure_async_use(settings: dict) -> ManifestResult:
+    logger: Logger = Logger("main")
+    logger.info("Starting manifest generation process with async Azure I/O")
+
+    async with AsyncAzureBlobServiceClient(settings) as az_blob_service_client:
+        blob_media_data: BlobMediaData = await AsyncBlobDataHandler.get_data_from_blobs(az_blob_service_client, settings)
+        media_data: MediaData = MediaDataParser.get_media_data(blob_media_data.media_datas, blob_media_data.media_index_datas, settings.get('is_multithreading', False))
+
+        result = ManifestResult(manifest_name=blob_media_data.manifest_name)
+
+        # Generate and upload server manifest (.ism)
+        server_manifest_name = f'{blob_media_data.manifest_name}.ism'
+        client_manifest_name = f'{blob_media_data.manifest_name}.ismc'
+
+        # Check if manifests already exist - if so, generate with '_new' suffix
+        server_manifest_exists, client_manifest_exists = await asyncio.gather(
+            az_blob_service_client.blob_exists(server_manifest_name),
+            az_blob_service_client.blob_exists(client_manifest_name)
+        )
+        if server_manifest_exists:
+            server_manifest_name = f'{blob_media_data.manifest_name}_new.ism'
+            logger.info(f"Existing manifest found, generating new manifest as {server_manifest_name}")
+        if client_manifest_exists:
+            client_manifest_name = f'{blob_media_data.manifest_name}_new.ismc'
+            logger.info(f"Existing manifest found, generating new manifest as {client_manifest_name}")
+
+        audios = IsmGenerator.get_audios(media_track_infos=media_data.media_track_info_list)
+        videos = IsmGenerator.get_videos(media_track_infos=media_data.media_track_info_list)
+        text_streams = IsmGenerator.get_text_streams(media_data.media_track_info_list, blob_media_data.text_data_info_list)
+
+        # Create local copies of ISM/ISMC files
+        local_copy = settings.get('local_copy', False)
+        with write_manifest(lambda sink: IsmGenerator.write(sink, blob_media_data.manifest_name, audios=audios, videos=videos, text_streams=text_streams),
+                            server_manifest_name if local_copy else None) as ism_file, \
+                write_manifest(lambda sink: IsmcGenerator.write(sink, duration=media_data.media_duration, media_track_infos=media_data.media_track_info_list,
+                                                                text_data_info_list=blob_media_data.text_data_info_list),
+                               client_manifest_name if local_copy else None) as ismc_file:
+            await asyncio.gather(
+                az_blob_service_client.upload_blob_to_container(server_manifest_name, ism_file, overwrite=False),
+                az_blob_service_client.upload_blob_to_container(client_manifest_name, ismc_file, overwrite=False)
+            )
+        logger.info(f"{server_manifest_name} and {client_manifest_name} are created and stored to the {az_blob_service_client.container_name} container")
+        result.ism_created = True
+        result.ismc_created = True
+
+    return result
+
 def generate_manifests_local_use(settings: dict) -> ManifestResult:
     """
     Generate and save server and client manifests (.ism and .ismc) to a local directory.
@@ -133,9 +234,9 @@ def generate_manifests_local_use(settings: dict) -> ManifestResult:
 
     logger.info("Using local directory mode")
     local_file_service_client: LocalFileServiceClient = LocalFileServiceClient(settings)
-    blob_media_data: BlobMediaData = LocalDataHandler.get_data_from_local_files(local_file_service_client)
+    blob_media_data: BlobMediaData = LocalDataHandler.get_data_from_local_files(local_file_service_client, settings)
     
-    media_data: MediaData = MediaDataParser.get_media_data(blob_media_data.media_datas, blob_media_data.media_index_datas, settings.get('is_multithreading', False))
+    media_data: MediaData = get_media_data(blob_media_data, settings)
 
     result = ManifestResult(manifest_name=blob_media_data.manifest_name)
     
@@ -145,9 +246,8 @@ def generate_manifests_local_use(settings: dict) -> ManifestResult:
     audios = IsmGenerator.get_audios(media_track_infos=media_data.media_track_info_list)
     videos = IsmGenerator.get_videos(media_track_infos=media_data.media_track_info_list)
     text_streams = IsmGenerator.get_text_streams(media_data.media_track_info_list, blob_media_data.text_data_info_list)
-    ism_xml_string = IsmGenerator.generate(blob_media_data.manifest_name, audios=audios, videos=videos, text_streams=text_streams)
-    
-    local_file_service_client.write_file(server_manifest_name, ism_xml_string)
+
+    local_file_service_client.write_file(server_manifest_name, lambda sink: IsmGenerator.write(sink, blob_media_data.manifest_name, audios=audios, videos=videos, text_streams=text_streams))
     logger.info(f"{server_manifest_name} is created and stored to the {local_file_service_client.local_directory} directory")
 
     result.ism_created = True
@@ -157,8 +257,8 @@ def generate_manifests_local_use(settings: dict) -> ManifestResult:
     client_manifest_name = f'{blob_media_data.manifest_name}.ismc'
     logger.info(f"Generating client manifest: {client_manifest_name}")
 
-    ismc_xml_string = IsmcGenerator.generate(duration=media_data.media_duration, media_track_infos=media_data.media_track_info_list, text_data_info_list=blob_media_data.text_data_info_list)
-    local_file_service_client.write_file(client_manifest_name, ismc_xml_string)
+    local_file_service_client.write_file(client_manifest_name, lambda sink: IsmcGenerator.write(sink, duration=media_data.media_duration, media_track_infos=media_data.media_track_info_list,
+                                                                                              text_data_info_list=blob_media_data.text_data_info_list))
     logger.info(f"{client_manifest_name} is created and stored to the {local_file_service_client.local_directory} directory")
 
     result.ismc_created = True
@@ -184,6 +284,8 @@ if __name__ == '__main__':
     
     if use_local:
         manifest_result = generate_manifests_local_use(settings)
+    elif settings.get('is_async', False):
+        manifest_result = generate_manifests_azure_async_use(settings)
     else:   
         manifest_result = generate_manifests_azure_use(settings)
     
@@ -0,0 +1,100 @@
+"""
+Test module for the asyncio Azure I/O path, with in-memory blobs instead of an Azure container.
+"""
+
+import asyncio
+import os
+
+from external_asset_ism_ismc_generation_tool.azure_client.async_azure_blob_service_client import AsyncAzureBlobServiceClient
+from external_asset_ism_ismc_generation_tool.blob_data_handler.async_blob_data_handler import AsyncBlobDataHandler
+from external_asset_ism_ismc_generation_tool.text_data_parser.cmft_packager import CmftPackager
+
+CONNECTION_STRING = "DefaultEndpointsProtocol=https;AccountName=testaccount;AccountKey=dGVzdGtleQ==;EndpointSuffix=core.windows.net"
+VTT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'asset-test-vtt-syntax_ENG.vtt')
+
+
+class BlobItem:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class InMemoryAsyncBlobServiceClient:
+    """Mimics AsyncAzureBlobServiceClient over a dict of blobs and records the maximum number of concurrent reads"""
+    def __init__(self, blobs: dict):
+        self.blobs = blobs
+        self.container_name = 'asset'
+        self.read_block_size = 4096
+        self.read_cache_blocks = 8
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_list_of_blobs(self):
+        return [BlobItem(name) for name in self.blobs]
+
+    async def download_part_of_blob(self, blob_name: str, offset=None, length=None) -> bytes:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        data = self.blobs[blob_name]
+        if offset is None:
+            return data
+        return data[offset:offset + length] if length is not None else data[offset:]
+
+    async def get_blob_size(self, blob_name: str) -> int:
+        return len(self.blobs[blob_name])
+
+
+def _create_cmft(segments_count: int) -> bytes:
+    segments = [(index * 2.0, "<tt>" + "x" * 1000 + "</tt>") for index in range(segments_count)]
+    return CmftPackager.package(segments, total_duration=segments_count * 2.0, language_code='eng')
+
+
+def test_blobs_are_processed_concurrently():
+    with open(VTT_PATH, 'rb') as vtt_file:
+        vtt_data = vtt_file.read()
+    blobs = {'asset_eng.cmft': _create_cmft(3), 'asset_fra.cmft': _create_cmft(4), 'asset_eng.vtt': vtt_data}
+    client = InMemoryAsyncBlobServiceClient(blobs)
+
+    blob_media_data = asyncio.run(AsyncBlobDataHandler.get_data_from_blobs(client, {'convert_webvtt': False}))
+
+    assert sorted(blob_media_data.media_datas) == ['asset_eng.cmft', 'asset_fra.cmft']
+    assert len(blob_media_data.media_datas['asset_eng.cmft']['moofs']) == 3
+    assert len(blob_media_data.media_datas['asset_fra.cmft']['moofs']) == 4
+    assert [text_data_info.name for text_data_info in blob_media_data.text_data_info_list] == ['asset_eng.vtt']
+    assert client.max_in_flight > 1
+
+
+class FakeStream:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def readall(self) -> bytes:
+        return self.data
+
+
+class FakeAsyncBlobClient:
+    def __init__(self, counter: dict):
+        self.counter = counter
+
+    async def download_blob(self, offset=None, length=None):
+        self.counter['in_flight'] += 1
+        self.counter['max_in_flight'] = max(self.counter['max_in_flight'], self.counter['in_flight'])
+        await asyncio.sleep(0.001)
+        self.counter['in_flight'] -= 1
+        return FakeStream(b'\x00' * length)
+
+
+def test_in_flight_requests_are_bounded():
+    counter = {'in_flight': 0, 'max_in_flight': 0}
+
+    async def read_many():
+        settings = {'connection_string': CONNECTION_STRING, 'container_name': 'asset', 'max_in_flight_requests': 5}
+        async with AsyncAzureBlobServiceClient(settings) as client:
+            client.get_blob_client = lambda blob_name: FakeAsyncBlobClient(counter)
+            return await asyncio.gather(*(client.download_part_of_blob('video.ismv', offset, 8) for offset in range(0, 800, 8)))
+
+    datas = asyncio.run(read_many())
+
+    assert len(datas) == 100
+    assert counter['max_in_flight'] == 5
@@ -0,0 +1,44 @@
+"""
+Test module for the Azure blob service client connection handling (no network access required).
+"""
+
+from external_asset_ism_ismc_generation_tool.azure_client.azure_blob_service_client import AzureBlobServiceClient
+
+CONNECTION_STRING = "DefaultEndpointsProtocol=https;AccountName=testaccount;AccountKey=dGVzdGtleQ==;EndpointSuffix=core.windows.net"
+
+
+def _create_client(**settings) -> AzureBlobServiceClient:
+    return AzureBlobServiceClient({'connection_string': CONNECTION_STRING, 'container_name': 'asset', 'is_multithreading': False, **settings})
+
+
+def test_blob_clients_are_reused():
+    client = _create_client()
+
+    assert client.get_blob_client('video_1.ismv') is client.get_blob_client('video_1.ismv')
+    assert client.get_blob_client('video_1.ismv') is not client.get_blob_client('audio_1.isma')
+
+
+def test_blob_clients_share_the_transport():
+    client = _create_client()
+    transport = client.blob_service_client._pipeline._transport
+
+    blob_transport = client.get_blob_client('video_1.ismv')._pipeline._transport
+    while hasattr(blob_transport, '_transport'):
+        blob_transport = blob_transport._transport
+    assert blob_transport is transport
+
+
+def test_http_pool_settings():
+    client = _create_client(http_pool_size=64, http_connection_timeout=5, http_read_timeout=30)
+    transport = client.blob_service_client._pipeline._transport
+
+    assert client.http_pool_size == 64
+    assert transport.session.get_adapter('https://testaccount.blob.core.windows.net')._pool_maxsize == 64
+    assert transport.connection_config.timeout == 5
+    assert transport.connection_config.read_timeout == 30
+
+
+def test_default_http_pool_size_follows_read_workers():
+    client = _create_client(fragment_read_workers=4)
+
+    assert client.http_pool_size == 4
@@ -0,0 +1,51 @@
+"""
+Test module for the memory-mapped reads of the local file client.
+"""
+
+from external_asset_ism_ismc_generation_tool.local_file_client.local_file_service_client import LocalFileServiceClient
+
+
+def _create_client(tmp_path, files: dict) -> LocalFileServiceClient:
+    for file_name, data in files.items():
+        (tmp_path / file_name).write_bytes(data)
+    return LocalFileServiceClient({'local_directory': str(tmp_path)})
+
+
+def test_read_view_is_a_view_on_the_file(tmp_path):
+    data = bytes(range(256)) * 4
+    client = _create_client(tmp_path, {'video.ismv': data})
+
+    view = client.read_view('video.ismv', 100, 16)
+
+    assert isinstance(view, memoryview)
+    assert view == data[100:116]
+    assert client.read_view('video.ismv', 1020, 16) == data[1020:]
+    assert client.read_view('video.ismv', 2000, 16) == b''
+    assert client.download_part_of_file('video.ismv') == data
+    assert client.download_part_of_file('video.ismv', 8, 4) == data[8:12]
+
+
+def test_empty_file(tmp_path):
+    client = _create_client(tmp_path, {'empty.vtt': b''})
+
+    assert client.download_part_of_file('empty.vtt') == b''
+    assert client.read_view('empty.vtt', 0, 8) == b''
+
+
+def test_written_file_is_mapped_again(tmp_path):
+    client = _create_client(tmp_path, {'asset.ism': b'old'})
+    assert client.download_part_of_file('asset.ism') == b'old'
+
+    client.write_file('asset.ism', 'new content')
+
+    assert client.download_part_of_file('asset.ism') == b'new content'
+
+
+def test_close_with_views_still_referenced(tmp_path):
+    client = _create_client(tmp_path, {'video.ismv': b'\x00' * 64})
+    view = client.read_view('video.ismv', 0, 8)
+
+    client.close()
+
+    assert view == b'\x00' * 8
+    assert client.download_part_of_file('video.ismv', 0, 4) == b'\x00' * 4
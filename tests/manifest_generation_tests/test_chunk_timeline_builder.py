@@ -0,0 +1,89 @@
+"""
+Test module for the ISMC chunks built from the track timeline.
+"""
+
+import decimal
+import random
+from typing import List, Optional
+
+import pytest
+
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.chunk_timeline_builder import ChunkTimelineBuilder
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.chunk_data import ChunkData
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_timeline import TrackTimeline
+
+TIME_SCALE = 10000000
+
+
+def _get_chunks_per_chunk(chunk_durations: List[float], timescale: int) -> List[ChunkData]:
+    # Chunk by chunk Decimal implementation the builder shall match
+    c = []
+    current_r = 1
+    time_start = 0
+    time_start_round = 0
+    for index, chunk in enumerate(chunk_durations):
+        duration = decimal.Decimal(str(chunk * timescale))
+        if index == 0:
+            c.append(ChunkData(time_start=str(time_start), duration=duration, r=str(current_r)))
+            continue
+        time_start += c[-1].duration
+        time_start_round += round(c[-1].duration)
+        diff = round(time_start) - time_start_round
+        if diff != 0:
+            new_chunk: Optional[ChunkData] = None
+            if int(c[-1].r) > 1:
+                c[-1].r = str(int(c[-1].r) - 1)
+                new_chunk = ChunkData(duration=c[-1].duration + diff, r='1')
+            else:
+                c[-1].duration += diff
+            if new_chunk:
+                c.append(new_chunk)
+            time_start_round += diff
+        if c[-1].duration == duration:
+            current_r += 1
+            c[-1].r = str(current_r)
+        else:
+            current_r = 1
+            c.append(ChunkData(duration=duration, r=str(current_r)))
+    return c
+
+
+def _as_tuples(chunks: List[ChunkData]) -> list:
+    return [(chunk.time_start, chunk.duration, str(chunk.duration), chunk.r) for chunk in chunks]
+
+
+def test_constant_duration_is_one_chunk():
+    timeline = TrackTimeline.from_durations(1000, [2000] * 1000 + [1500])
+
+    chunks = ChunkTimelineBuilder.build(timeline, TIME_SCALE)
+
+    assert _as_tuples(chunks) == [('0', decimal.Decimal('20000000.0'), '20000000.0', '1000'),
+                                  (None, decimal.Decimal('15000000.0'), '15000000.0', '1')]
+
+
+def test_rounding_differences_are_spread():
+    # 2.002 s at 30000 Hz: 20020000 ticks, 1001 / 30000 s frames are not integers in the manifest timescale
+    timeline = TrackTimeline.from_durations(30000, [1001] * 10)
+
+    chunks = ChunkTimelineBuilder.build(timeline, TIME_SCALE)
+
+    assert _as_tuples(chunks) == _as_tuples(_get_chunks_per_chunk(timeline.to_seconds(), TIME_SCALE))
+    assert sum(round(chunk.duration) * int(chunk.r) for chunk in chunks) == round(decimal.Decimal('333666.6666666667') * 9) + 333667
+
+
+def test_empty_timeline():
+    assert ChunkTimelineBuilder.build(TrackTimeline(1000), TIME_SCALE) == []
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_same_chunks_as_chunk_by_chunk(seed):
+    generator = random.Random(seed)
+    timescale = generator.choice([1000, 25, 600, 24000, 30000, 44100, 48000, 90000, 10000000, 20000000])
+    timeline = TrackTimeline(timescale)
+    for _ in range(generator.randint(1, 12)):
+        duration = generator.choice([2 * timescale, timescale // 2 or 1, timescale * 3 // 20 or 1, 1001, 1024, 3, generator.randint(1, 5 * timescale)])
+        timeline.append(duration, generator.randint(1, 200))
+
+    chunks = ChunkTimelineBuilder.build(timeline, TIME_SCALE)
+
+    assert _as_tuples(chunks) == _as_tuples(_get_chunks_per_chunk(timeline.to_seconds(), TIME_SCALE))
@@ -0,0 +1,76 @@
+"""
+Test module for the grouping of the tracks in stream indexes by their timeline fingerprint.
+"""
+
+from typing import List
+
+import pytest
+
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.ismc_generator import IsmcGenerator
+from external_asset_ism_ismc_generation_tool.common.logger.i_logger import ILogger
+from external_asset_ism_ismc_generation_tool.common.logger.logger import Logger
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_track_info import MediaTrackInfo
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_timeline import TrackTimeline
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_type import TrackType
+
+
+class _WarningsLogger(ILogger):
+    def __init__(self):
+        self.warnings: List[str] = []
+
+    def log(self, level, msg):
+        pass
+
+    def info(self, msg):
+        pass
+
+    def warning(self, msg):
+        self.warnings.append(msg)
+
+    def error(self, msg):
+        pass
+
+
+@pytest.fixture
+def warnings_logger():
+    logger = _WarningsLogger()
+    IsmcGenerator.redefine_logger(logger)
+    yield logger
+    IsmcGenerator.redefine_logger(Logger("IsmcGenerator"))
+
+
+def _get_video_track(bitrate: int, timeline: TrackTimeline) -> MediaTrackInfo:
+    return MediaTrackInfo(TrackType.VIDEO, str(bitrate), 1, len(timeline), 'avc1', timeline, f'video_{bitrate}.mp4',
+                          codec_private_data='0164001F', width=1280, height=720)
+
+
+def test_is_equal_chunk_data():
+    track_info = _get_video_track(1000000, TrackTimeline.from_durations(25000, [50000] * 10))
+
+    assert track_info.is_equal_chunk_data(_get_video_track(2000000, TrackTimeline.from_durations(90000, [180000] * 10)))
+    assert not track_info.is_equal_chunk_data(_get_video_track(2000000, TrackTimeline.from_durations(25000, [50000] * 9)))
+    assert not track_info.is_equal_chunk_data(None)
+
+
+def test_aligned_tracks_share_a_stream_index(warnings_logger):
+    tracks = [_get_video_track(bitrate, TrackTimeline.from_durations(90000, [180000] * 30)) for bitrate in (1000000, 2000000, 4000000)]
+
+    ismc = IsmcGenerator.generate(duration=60.0, media_track_infos=tracks)
+
+    assert ismc.count('<StreamIndex ') == 1
+    assert ismc.count('<QualityLevel ') == 3
+    assert warnings_logger.warnings == []
+
+
+def test_unaligned_tracks_are_reported(warnings_logger):
+    aligned = TrackTimeline.from_durations(90000, [180000] * 30)
+    unaligned = TrackTimeline.from_durations(90000, [180000] * 29 + [90000, 90000])
+    tracks = [_get_video_track(1000000, aligned), _get_video_track(2000000, unaligned), _get_video_track(4000000, aligned)]
+
+    ismc = IsmcGenerator.generate(duration=60.0, media_track_infos=tracks)
+
+    assert ismc.count('<StreamIndex ') == 3
+    assert len(warnings_logger.warnings) == 1
+    assert '2 different chunk timelines' in warnings_logger.warnings[0]
+    assert f'{unaligned.get_fingerprint()[:8]}: video_2000000.mp4' in warnings_logger.warnings[0]
+    assert f'{aligned.get_fingerprint()[:8]}: video_1000000.mp4, video_4000000.mp4' in warnings_logger.warnings[0]
@@ -0,0 +1,105 @@
+"""
+Test module for the streaming writer of the ISM and ISMC manifests.
+"""
+
+import io
+import random
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from external_asset_ism_ismc_generation_tool.common.xml_stream_writer import XmlStreamWriter
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.ismc_generator import IsmcGenerator
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.models.smooth_streaming_media import SmoothStreamingMedia
+from external_asset_ism_ismc_generation_tool.mss_server_manifest.ism_generator import IsmGenerator
+from external_asset_ism_ismc_generation_tool.mss_server_manifest.models.audio import Audio
+from external_asset_ism_ismc_generation_tool.mss_server_manifest.models.smil import Smil
+from external_asset_ism_ismc_generation_tool.mss_server_manifest.models.video import Video
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.media_track_info import MediaTrackInfo
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_timeline import TrackTimeline
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_type import TrackType
+
+
+def _to_string(element: ET.Element) -> str:
+    # Serialization done by the generators before the streaming writer
+    ET.indent(element)
+    return ET.tostring(element, encoding="utf-8", method="xml", xml_declaration=True).decode("utf-8")
+
+
+def _write(element: ET.Element, buffer_size: int = XmlStreamWriter.DEFAULT_BUFFER_SIZE) -> str:
+    sink = io.StringIO()
+    writer = XmlStreamWriter(sink, buffer_size)
+    writer.write(element)
+    writer.close()
+    return sink.getvalue()
+
+
+def _get_random_element(generator: random.Random, depth: int) -> ET.Element:
+    values = ['0', '20000000', 'und', 'a&b', '<tag>', '"quoted"', 'line\nbreak', 'tab\tcr\r', 'é€', '']
+    element = ET.Element(generator.choice(['c', 'StreamIndex', 'QualityLevel', 'param']))
+    for index in range(generator.randint(0, 4)):
+        element.set(f'Attribute{index}', generator.choice(values))
+    if depth > 0:
+        for _ in range(generator.randint(0, 4)):
+            element.append(_get_random_element(generator, depth - 1))
+    return element
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_same_output_as_element_tree(seed):
+    generator = random.Random(seed)
+    element = _get_random_element(generator, generator.randint(0, 4))
+
+    assert _write(element, buffer_size=generator.choice([1, 7, 65536])) == _to_string(element)
+
+
+def test_start_and_end_elements():
+    sink = io.StringIO()
+    writer = XmlStreamWriter(sink)
+    writer.start('smil', {'xmlns': 'http://www.w3.org/2001/SMIL20/Language'})
+    writer.start('body', {})
+    writer.start('switch', {})
+    writer.end()
+    writer.close()
+
+    assert sink.getvalue() == ("<?xml version='1.0' encoding='utf-8'?>\n"
+                               '<smil xmlns="http://www.w3.org/2001/SMIL20/Language">\n'
+                               '  <body>\n'
+                               '    <switch />\n'
+                               '  </body>\n'
+                               '</smil>')
+
+
+def test_ismc_same_output_as_element_tree(monkeypatch):
+    video_tracks = [
+        MediaTrackInfo(TrackType.VIDEO, str(bitrate), 1, 3, 'avc1', TrackTimeline.from_durations(30000, [60060, 60060, 30030]),
+                       f'video_{bitrate}.mp4', codec_private_data='0164001F', width=1280, height=720)
+        for bitrate in (1000000, 2000000)
+    ]
+    audio_track = MediaTrackInfo(TrackType.AUDIO, '128000', 2, 4, 'mp4a', TrackTimeline.from_durations(48000, [96256, 96256, 95232, 48000]),
+                                 'audio.mp4', codec_private_data='1190', bits_per_sample=16, audio_tag='255', channels='2',
+                                 packet_size='4', sampling_rate='48000', language='fra')
+    documents = []
+    write_xml = SmoothStreamingMedia.write_xml
+    monkeypatch.setattr(SmoothStreamingMedia, 'write_xml', lambda self, writer: (documents.append(self), write_xml(self, writer)))
+
+    ismc = IsmcGenerator.generate(duration=5.0, media_track_infos=video_tracks + [audio_track])
+
+    assert ismc == _to_string(documents[0].to_xml())
+    assert ismc.count('<c t="0"') == 2
+
+
+def test_ism_same_output_as_element_tree(monkeypatch):
+    audio = Audio(src='audio.mp4', system_bitrate='128000', system_language='fra')
+    audio.add_param(name='trackID', value='2', value_type='data')
+    audio.add_param(name='trackName', value='Français & co', value_type='data')
+    video = Video(src='video.mp4', system_bitrate='1000000')
+    video.add_param(name='trackID', value='1', value_type='data')
+    documents = []
+    to_xml = Smil.to_xml
+    monkeypatch.setattr(Smil, 'to_xml', lambda self: (documents.append(self), to_xml(self))[1])
+
+    ism = IsmGenerator.generate('manifest', audios=[audio], videos=[video])
+
+    assert ism == _to_string(to_xml(documents[0]))
+    assert '<param name="trackName" value="Français &amp; co" valuetype="data" />' in ism
@@ -0,0 +1,101 @@
+"""
+Test module for the box index built over the moov box.
+"""
+
+import struct
+
+import pytest
+
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.box_index import BoxIndex
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.media_box_extractor import MediaBoxExtractor
+from tests.test_utils.common.common import Common
+from tests.test_utils.common.mp4_box_builder import Mp4BoxBuilder
+
+
+def _stsz(entry_sizes) -> bytes:
+    return Mp4BoxBuilder.box(b'stsz', struct.pack(f'>III{len(entry_sizes)}I', 0, 0, len(entry_sizes), *entry_sizes))
+
+
+def _tkhd(track_id: int) -> bytes:
+    return Mp4BoxBuilder.box(b'tkhd', struct.pack('>III', 0, 0, 0) + struct.pack('>I', track_id) + b'\x00' * 68)
+
+
+def _mp4a_stsd() -> bytes:
+    esds = Mp4BoxBuilder.box(b'esds', b'\x00\x00\x00\x00' + b'\x03\x00')
+    mp4a = Mp4BoxBuilder.box(b'mp4a', b'\x00' * 6 + struct.pack('>H', 1) + b'\x00' * 8 + struct.pack('>HHHHHH', 2, 16, 0, 0, 48000, 0) + esds)
+    return Mp4BoxBuilder.box(b'stsd', struct.pack('>II', 0, 1) + mp4a)
+
+
+def _moov(large_size_stbl: bool = False) -> bytes:
+    traks = []
+    for track_id, entry_sizes in ((1, [10, 20, 30]), (2, [5, 6])):
+        stbl = Mp4BoxBuilder.box(b'stbl', _mp4a_stsd() + _stsz(entry_sizes), large_size=large_size_stbl)
+        minf = Mp4BoxBuilder.box(b'minf', stbl)
+        mdia = Mp4BoxBuilder.box(b'mdia', minf)
+        traks.append(Mp4BoxBuilder.box(b'trak', _tkhd(track_id) + mdia))
+    mvex = Mp4BoxBuilder.box(b'mvex', Mp4BoxBuilder.trex(1) + Mp4BoxBuilder.trex(2))
+    return Mp4BoxBuilder.box(b'moov', b''.join(traks) + mvex)
+
+
+@pytest.mark.parametrize("large_size_stbl", [False, True])
+def test_path_queries(large_size_stbl):
+    box_index = BoxIndex(_moov(large_size_stbl))
+
+    stsz_atoms = box_index.get_all_boxes('moov/trak[*]/mdia/minf/stbl/stsz')
+    assert [list(stsz_atom.entry_sizes) for stsz_atom in stsz_atoms] == [[10, 20, 30], [5, 6]]
+    assert box_index.get_box('moov/trak[1]/tkhd').track_ID == 2
+    assert [trex_atom.track_ID for trex_atom in box_index.get_all_boxes('moov/mvex/trex')] == [1, 2]
+    assert box_index.find('moov/trak[2]') is None
+    assert box_index.get_box('moov/mvex/mehd') is None
+
+
+def test_queries_relative_to_a_node():
+    box_index = BoxIndex(_moov())
+    stbl_node = box_index.find('moov/trak[1]/mdia/minf/stbl')
+
+    esds_node = box_index.find('stsd/mp4a/esds', stbl_node)
+
+    assert esds_node.type == 'esds'
+    assert bytes(box_index.get_data(esds_node))[4:8] == b'esds'
+    assert box_index.get_box('stsz', stbl_node).sample_count == 2
+
+
+def test_only_requested_boxes_are_decoded_once():
+    box_index = BoxIndex(_moov())
+
+    stsz_atom = box_index.get_box('moov/trak/mdia/minf/stbl/stsz')
+
+    assert box_index.get_box('moov/trak/mdia/minf/stbl/stsz') is stsz_atom
+
+
+def test_invalid_box_size():
+    moov = bytearray(_moov())
+    moov[0:4] = struct.pack('>I', len(moov) + 1)
+
+    with pytest.raises(ValueError):
+        BoxIndex(bytes(moov))
+
+
+def test_invalid_path():
+    with pytest.raises(ValueError):
+        BoxIndex(_moov()).find('moov/trak[x]')
+
+
+def test_matches_pymp4_parsing_of_the_whole_moov():
+    media_datas = Common.get_test_data_from_json(Common.get_data_file_path('test_timescale_0_data.json'))['media_datas']
+
+    for media_data in media_datas.values():
+        box_index = BoxIndex(media_data['moov'])
+        moov_atom = MediaBoxExtractor.get_mp4_box(MediaBoxExtractor.extract_media_boxes(media_data['moov']), 'moov')
+        trak_atoms = MediaBoxExtractor.get_all_mp4_sub_boxes(moov_atom, 'trak')
+        trak_nodes = box_index.find_all('moov/trak[*]')
+        assert len(trak_nodes) == len(trak_atoms)
+        for trak_node, trak_atom in zip(trak_nodes, trak_atoms):
+            stbl_atom = MediaBoxExtractor.get_mp4_sub_box(MediaBoxExtractor.get_mp4_sub_box(
+                MediaBoxExtractor.get_mp4_sub_box(trak_atom, 'mdia'), 'minf'), 'stbl')
+            for box_name in ('stts', 'stsz', 'stsd'):
+                box = box_index.get_box(f'mdia/minf/stbl/{box_name}', trak_node)
+                assert box.type == MediaBoxExtractor.get_mp4_sub_box(stbl_atom, box_name).type
+            assert box_index.get_box('tkhd', trak_node).track_ID == MediaBoxExtractor.get_mp4_sub_box(trak_atom, 'tkhd').track_ID
+            assert list(box_index.get_box('mdia/minf/stbl/stsz', trak_node).entry_sizes or []) == \
+                list(MediaBoxExtractor.get_mp4_sub_box(stbl_atom, 'stsz').entry_sizes or [])
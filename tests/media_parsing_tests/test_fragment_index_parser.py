@@ -0,0 +1,128 @@
+"""
+Test module for the mfra/tfra and sidx fragment indexes used to locate moof boxes.
+"""
+
+import asyncio
+
+from external_asset_ism_ismc_generation_tool.media_data_parser.fragment_index_parser import FragmentIndexParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.fragment_walker import FragmentWalker
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.fragment_index import FragmentIndex, FragmentIndexEntry, FragmentIndexSource
+from external_asset_ism_ismc_generation_tool.media_data_parser.read_plan import ReadPlanRunner
+from external_asset_ism_ismc_generation_tool.text_data_parser.cmft_packager import CmftPackager
+
+
+def _create_cmft(segments_count: int = 5) -> bytes:
+    segments = [(index * 4.0, "<tt>" + "x" * 10000 + "</tt>") for index in range(segments_count)]
+    return CmftPackager.package(segments, total_duration=segments_count * 4.0, language_code='eng')
+
+
+def _get_top_level_boxes(data: bytes):
+    boxes = []
+    position = 0
+    while position < len(data):
+        size = int.from_bytes(data[position:position + 4], 'big')
+        boxes.append((position, data[position + 4:position + 8].decode(), size))
+        position += size
+    return boxes
+
+
+def _get_moov_end(data: bytes) -> int:
+    return next(position + size for position, box_type, size in _get_top_level_boxes(data) if box_type == 'moov')
+
+
+def _get_moof_boxes(data: bytes):
+    return [data[position:position + size] for position, box_type, size in _get_top_level_boxes(data) if box_type == 'moof']
+
+
+def _find_fragment_index(data: bytes, moov_end: int):
+    return ReadPlanRunner.run(FragmentIndexParser.find_fragment_index(moov_end, len(data)), lambda offset, length: data[offset:offset + length])
+
+
+def _collect_indexed_moof_boxes(data: bytes, fragment_index, moov_end: int, max_workers: int = 1):
+    walker = FragmentWalker(len(data))
+    return ReadPlanRunner.run(walker.walk_indexed_moof_boxes(fragment_index, moov_end), lambda offset, length: data[offset:offset + length], max_workers)
+
+
+def _build_sidx(moofs_positions, first_offset: int, end: int) -> bytes:
+    references = b''
+    stops = moofs_positions[1:] + [end]
+    for position, stop in zip(moofs_positions, stops):
+        references += (stop - position).to_bytes(4, 'big') + (4000).to_bytes(4, 'big') + (0x90000000).to_bytes(4, 'big')
+    payload = b'\x00\x00\x00\x00' + (1).to_bytes(4, 'big') + (1000).to_bytes(4, 'big') + (0).to_bytes(4, 'big') \
+        + first_offset.to_bytes(4, 'big') + b'\x00\x00' + len(moofs_positions).to_bytes(2, 'big') + references
+    return (len(payload) + 8).to_bytes(4, 'big') + b'sidx' + payload
+
+
+def test_mfra_index_locates_all_fragments():
+    data = _create_cmft()
+    moov_end = _get_moov_end(data)
+
+    fragment_index = _find_fragment_index(data, moov_end)
+
+    assert fragment_index.source == FragmentIndexSource.MFRA
+    moof_positions = [position for position, box_type, _ in _get_top_level_boxes(data) if box_type == 'moof']
+    assert fragment_index.offsets == moof_positions
+    assert fragment_index.entries[1].time == 40000000
+
+    assert _collect_indexed_moof_boxes(data, fragment_index, moov_end, max_workers=4) == _get_moof_boxes(data)
+
+
+def test_sidx_index_locates_all_fragments():
+    data = _create_cmft()
+    # Drop the mfra box and insert a sidx box right after the moov box
+    boxes = [box for box in _get_top_level_boxes(data) if box[1] != 'mfra']
+    moov_end = _get_moov_end(data)
+    fragments = b''.join(data[position:position + size] for position, box_type, size in boxes if position >= moov_end)
+    fragments_positions = [position - moov_end for position, box_type, _ in boxes if box_type == 'moof']
+    sidx_box = _build_sidx(fragments_positions, 0, len(fragments))
+    data = data[:moov_end] + sidx_box + fragments
+
+    fragment_index = _find_fragment_index(data, moov_end)
+
+    assert fragment_index.source == FragmentIndexSource.SIDX
+    assert fragment_index.timescale == 1000
+    assert [entry.time for entry in fragment_index.entries] == [0, 4000, 8000, 12000, 16000]
+
+    assert _collect_indexed_moof_boxes(data, fragment_index, moov_end) == _get_moof_boxes(data)
+
+
+def test_sparse_index_walks_gaps_between_fragments():
+    data = _create_cmft()
+    moov_end = _get_moov_end(data)
+    full_index = _find_fragment_index(data, moov_end)
+    sparse_index = FragmentIndex(FragmentIndexSource.MFRA, [full_index.entries[1], full_index.entries[3], full_index.entries[4]])
+
+    assert _collect_indexed_moof_boxes(data, sparse_index, moov_end) == _get_moof_boxes(data)
+
+
+def test_inconsistent_index_is_rejected():
+    data = _create_cmft()
+    moov_end = _get_moov_end(data)
+    broken_index = FragmentIndex(FragmentIndexSource.MFRA, [FragmentIndexEntry(moov_end + 8, 0)])
+
+    try:
+        _collect_indexed_moof_boxes(data, broken_index, moov_end)
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+
+
+def test_file_without_index():
+    data = _create_cmft()
+    data = b''.join(data[position:position + size] for position, box_type, size in _get_top_level_boxes(data) if box_type != 'mfra')
+
+    assert _find_fragment_index(data, _get_moov_end(data)) is None
+
+
+def test_read_plans_run_on_async_source():
+    data = _create_cmft()
+    moov_end = _get_moov_end(data)
+
+    async def read_part(offset: int, length: int) -> bytes:
+        return data[offset:offset + length]
+
+    async def collect_moof_boxes():
+        fragment_index = await ReadPlanRunner.run_async(FragmentIndexParser.find_fragment_index(moov_end, len(data)), read_part)
+        return await ReadPlanRunner.run_async(FragmentWalker(len(data)).walk_indexed_moof_boxes(fragment_index, moov_end), read_part)
+
+    assert asyncio.run(collect_moof_boxes()) == _get_moof_boxes(data)
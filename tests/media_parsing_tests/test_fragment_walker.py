@@ -0,0 +1,79 @@
+"""
+Test module for the header-hopping fragment walker used by the media data parsers.
+"""
+
+from typing import List
+
+from external_asset_ism_ismc_generation_tool.local_file_client.local_file_service_client import LocalFileServiceClient
+from external_asset_ism_ismc_generation_tool.media_data_parser.fragment_walker import FragmentWalker
+from external_asset_ism_ismc_generation_tool.media_data_parser.local_media_data_parser import LocalMediaDataParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.read_plan import ReadPlanRunner
+from external_asset_ism_ismc_generation_tool.text_data_parser.cmft_packager import CmftPackager
+
+SEGMENT_PAYLOAD = "<tt>" + "x" * 100000 + "</tt>"
+
+
+def _create_cmft(directory, file_name: str = "fragmented_eng.cmft", segments_count: int = 5) -> bytes:
+    segments = [(index * 4.0, SEGMENT_PAYLOAD) for index in range(segments_count)]
+    cmft_data = CmftPackager.package(segments, total_duration=segments_count * 4.0, language_code='eng')
+    with open(directory / file_name, 'wb') as cmft_file:
+        cmft_file.write(cmft_data)
+    return cmft_data
+
+
+def _get_moof_boxes_by_full_scan(data: bytes) -> List[bytes]:
+    moof_boxes = []
+    position = 0
+    while position < len(data):
+        size = int.from_bytes(data[position:position + 4], 'big')
+        box_type = data[position + 4:position + 8]
+        if box_type == b'moof':
+            moof_boxes.append(data[position:position + size])
+        elif box_type == b'mfra':
+            break
+        position += size
+    return moof_boxes
+
+
+class CountingLocalFileServiceClient(LocalFileServiceClient):
+    def __init__(self, settings: dict):
+        super().__init__(settings)
+        self.read_bytes = 0
+        self.read_requests = 0
+
+    def download_part_of_file(self, file_name, offset=None, length=None):
+        data = super().download_part_of_file(file_name, offset, length)
+        self.read_bytes += len(data)
+        self.read_requests += 1
+        return data
+
+
+def test_moof_boxes_match_full_scan(tmp_path):
+    cmft_data = _create_cmft(tmp_path)
+    client = LocalFileServiceClient({'local_directory': str(tmp_path)})
+
+    media_data = LocalMediaDataParser.get_media_data(client, "fragmented_eng.cmft")
+
+    assert media_data['moofs'] == _get_moof_boxes_by_full_scan(cmft_data)
+    assert len(media_data['moofs']) == 5
+
+
+def test_mdat_payload_is_not_read(tmp_path):
+    cmft_data = _create_cmft(tmp_path)
+    client = CountingLocalFileServiceClient({'local_directory': str(tmp_path), 'read_block_size': 256})
+
+    media_data = LocalMediaDataParser.get_media_data(client, "fragmented_eng.cmft")
+
+    moofs_size = sum(len(moof) for moof in media_data['moofs'])
+    assert client.read_bytes < moofs_size + len(media_data['moov']) + 1024
+    assert client.read_bytes < len(cmft_data) / 10
+
+
+def test_walker_handles_large_size_header():
+    moof_box = (16).to_bytes(4, 'big') + b'moof' + b'\x00' * 8
+    mdat_box = (1).to_bytes(4, 'big') + b'mdat' + (24).to_bytes(8, 'big') + b'\x00' * 8
+    data = moof_box + mdat_box + moof_box
+
+    walker = FragmentWalker(len(data))
+
+    assert ReadPlanRunner.run(walker.walk_moof_boxes(0), lambda offset, length: data[offset:offset + length]) == [moof_box, moof_box]
@@ -0,0 +1,87 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from external_asset_ism_ismc_generation_tool.common.common import Common
+from external_asset_ism_ismc_generation_tool.blob_data_handler.blob_data_handler import BlobDataHandler
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_data_parser import MediaDataParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_data_pipeline import MediaDataPipeline
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.ismc_generator import IsmcGenerator
+from tests.test_utils.common.common import Common as TestCommon
+
+
+class _InMemoryBlobServiceClient:
+    """Serves the range reads of the blobs from memory"""
+    def __init__(self, blobs: dict, is_multithreading: bool):
+        self.__blobs = blobs
+        self.is_multithreading = is_multithreading
+        self.fragment_read_workers = 1
+        self.read_block_size = 65536
+        self.read_cache_blocks = 32
+
+    def get_list_of_blobs(self):
+        return [SimpleNamespace(name=blob_name) for blob_name in self.__blobs]
+
+    def get_blob_size(self, blob_name: str) -> int:
+        return len(self.__blobs[blob_name])
+
+    def download_part_of_blob(self, blob_name: str, offset=None, length=None):
+        return self.__blobs[blob_name][offset:offset + length]
+
+
+def _get_media_datas() -> dict:
+    return TestCommon.get_test_data_from_json(TestCommon.get_data_file_path('test_timescale_0_data.json'))['media_datas']
+
+
+@pytest.mark.parametrize('is_multithreading', [False, True])
+def test_blobs_parsed_in_pipeline_give_the_same_manifest(is_multithreading):
+    media_datas = _get_media_datas()
+    blobs = {blob_name: media_data['moov'] + b''.join(media_data['moofs']) for blob_name, media_data in media_datas.items()}
+
+    with MediaDataPipeline(is_multithreading) as media_data_pipeline:
+        blob_media_data = BlobDataHandler.get_data_from_blobs(_InMemoryBlobServiceClient(blobs, is_multithreading), {}, media_data_pipeline)
+        media_data = media_data_pipeline.get_media_data()
+    expected_media_data = MediaDataParser.get_media_data(media_datas)
+
+    assert not blob_media_data.media_datas
+    assert blob_media_data.manifest_name
+    assert media_data.media_duration == expected_media_data.media_duration
+    assert IsmcGenerator.generate(duration=media_data.media_duration, media_track_infos=media_data.media_track_info_list) == \
+        IsmcGenerator.generate(duration=expected_media_data.media_duration, media_track_infos=expected_media_data.media_track_info_list)
+
+
+def test_unparsable_blob_is_skipped():
+    media_datas = _get_media_datas()
+    with MediaDataPipeline() as media_data_pipeline:
+        media_data_pipeline.submit('broken.mp4', {'moov': b'\x00\x00\x00\x08free', 'moofs': []})
+        for blob_name, media_data in media_datas.items():
+            media_data_pipeline.submit(blob_name, media_data)
+        media_data = media_data_pipeline.get_media_data()
+
+    assert len(media_data.media_track_info_list) == len(MediaDataParser.get_media_data(media_datas).media_track_info_list)
+
+
+def test_bounded_tasks_are_submitted_as_the_results_are_consumed():
+    lock = threading.Lock()
+    running = []
+    max_running = [0]
+
+    def task(item):
+        with lock:
+            running.append(item)
+            max_running[0] = max(max_running[0], len(running))
+        time.sleep(0.001)
+        return item * 2
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = []
+        for item, future in Common.get_bounded_completed_tasks(range(50), task, executor, 3):
+            results.append((item, future.result()))
+            with lock:
+                running.remove(item)
+
+    assert sorted(results) == [(item, item * 2) for item in range(50)]
+    assert max_running[0] <= 3
@@ -0,0 +1,66 @@
+"""
+Test module for the single-pass demultiplexing of moof boxes by track ID.
+"""
+
+from typing import List, Optional, Tuple
+
+import pytest
+from tools.pymp4.src.pymp4.parser import Box
+
+from external_asset_ism_ismc_generation_tool.media_data_parser.moof_demuxer import MoofDemuxer
+from tests.test_utils.common.mp4_box_builder import Mp4BoxBuilder
+
+
+def _traf(track_id: int, samples: List[Tuple[int, int]], decode_time: Optional[int] = None,
+          default_sample_duration: Optional[int] = None) -> bytes:
+    boxes = [Mp4BoxBuilder.tfhd(track_id, default_sample_duration=default_sample_duration)]
+    if decode_time is not None:
+        boxes.append(Mp4BoxBuilder.tfdt(decode_time))
+    boxes.append(Mp4BoxBuilder.trun([duration for duration, _ in samples], [size for _, size in samples]))
+    return Mp4BoxBuilder.traf(*boxes)
+
+
+def _trex(track_id: int, default_sample_duration: int = 0, default_sample_size: int = 0) -> Box:
+    return Box.parse(Mp4BoxBuilder.trex(track_id, default_sample_duration, default_sample_size))
+
+
+def test_interleaved_tracks_are_demultiplexed_by_track_id():
+    moof_boxes = [
+        Mp4BoxBuilder.moof(_traf(1, [(1000, 10), (1000, 20)], decode_time=0), _traf(2, [(512, 5)] * 4, decode_time=0)),
+        Mp4BoxBuilder.moof(_traf(1, [(1000, 30)], decode_time=2000), _traf(2, [(512, 5)] * 2, decode_time=2048)),
+    ]
+
+    track_timelines = MoofDemuxer.demux(moof_boxes, [_trex(1), _trex(2)])
+
+    assert sorted(track_timelines) == [1, 2]
+    assert track_timelines[1].durations == [2000, 1000]
+    assert track_timelines[1].sizes == [30, 30]
+    assert track_timelines[1].decode_times == [0, 2000]
+    assert track_timelines[2].durations == [2048, 1024]
+    assert track_timelines[2].sizes == [20, 10]
+    assert track_timelines[2].decode_times == [0, 2048]
+
+
+def test_default_sample_values_are_taken_from_the_trex_of_the_track():
+    moof_boxes = [Mp4BoxBuilder.moof(_traf(1, [(1000, 10)] * 3), _traf(2, [(512, 5)] * 3, default_sample_duration=400))]
+
+    track_timelines = MoofDemuxer.demux(moof_boxes, [_trex(1, default_sample_duration=900, default_sample_size=7), _trex(2)])
+
+    # trex defaults apply to their own track only, tfhd defaults override the trun durations
+    assert track_timelines[1].durations == [2700]
+    assert track_timelines[1].sizes == [21]
+    assert track_timelines[2].durations == [1200]
+    assert track_timelines[2].sizes == [15]
+    assert track_timelines[2].decode_times == [None]
+
+
+def test_missing_sample_durations():
+    traf = Mp4BoxBuilder.traf(Mp4BoxBuilder.tfhd(1), Mp4BoxBuilder.trun(sizes=[10, 20]))
+
+    with pytest.raises(ValueError):
+        MoofDemuxer.demux([Mp4BoxBuilder.moof(traf)], [_trex(1)])
+
+
+def test_no_moof_boxes():
+    assert MoofDemuxer.demux(None, []) == {}
+    assert MoofDemuxer.demux([], [_trex(1)]) == {}
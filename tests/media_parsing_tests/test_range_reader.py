@@ -0,0 +1,73 @@
+"""
+Test module for the block cache used to read the top-level boxes of media files.
+"""
+
+from external_asset_ism_ismc_generation_tool.media_data_parser.range_reader import RangeReader
+
+DATA = bytes(range(256)) * 40  # 10240 bytes
+
+
+class CountingSource:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.reads = []
+
+    def read_part(self, offset: int, length: int) -> bytes:
+        self.reads.append((offset, length))
+        return self.data[offset:offset + length]
+
+
+def test_small_reads_are_served_from_one_block():
+    source = CountingSource(DATA)
+    range_reader = RangeReader(source.read_part, block_size=1024, max_blocks=4)
+
+    assert range_reader.read(0, 8) == DATA[0:8]
+    assert range_reader.read(24, 8) == DATA[24:32]
+    assert range_reader.read(500, 100) == DATA[500:600]
+
+    assert source.reads == [(0, 1024)]
+
+
+def test_adjacent_missing_blocks_are_coalesced():
+    source = CountingSource(DATA)
+    range_reader = RangeReader(source.read_part, block_size=1024, max_blocks=8)
+    range_reader.read(2048, 8)
+
+    assert range_reader.read(100, 4000) == DATA[100:4100]
+
+    assert source.reads == [(2048, 1024), (0, 2048), (3072, 2048)]
+
+
+def test_least_recently_used_blocks_are_evicted():
+    source = CountingSource(DATA)
+    range_reader = RangeReader(source.read_part, block_size=1024, max_blocks=2)
+    range_reader.read(0, 8)
+    range_reader.read(1024, 8)
+    range_reader.read(0, 8)
+    range_reader.read(2048, 8)
+
+    range_reader.read(0, 8)
+    range_reader.read(1024, 8)
+
+    assert source.reads == [(0, 1024), (1024, 1024), (2048, 1024), (1024, 1024)]
+
+
+def test_reads_past_end_of_file_are_truncated():
+    source = CountingSource(DATA)
+    range_reader = RangeReader(source.read_part, block_size=4096, max_blocks=4)
+
+    assert range_reader.read(10000, 1000) == DATA[10000:]
+    assert range_reader.size == len(DATA)
+    assert range_reader.read(len(DATA), 8) == b''
+    assert len(source.reads) == 1
+
+
+def test_large_read_keeps_only_its_last_block():
+    source = CountingSource(DATA)
+    range_reader = RangeReader(source.read_part, block_size=1024, max_blocks=2)
+
+    assert range_reader.read(0, 5000) == DATA[:5000]
+    assert range_reader.read(4500, 100) == DATA[4500:4600]
+    assert range_reader.read(0, 8) == DATA[:8]
+
+    assert source.reads == [(0, 5120), (0, 1024)]
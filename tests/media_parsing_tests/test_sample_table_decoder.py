@@ -0,0 +1,85 @@
+"""
+Test module for the decoding of the stts, stss and stsz sample tables into typed arrays.
+"""
+
+import struct
+from array import array
+
+import pytest
+from tools.pymp4.src.pymp4.parser import Box
+
+from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.sample_table_decoder import SampleTableDecoder
+from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.stsz_parser import STSZParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.stts_parser import STTSParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.box_index import BoxIndex
+from tests.test_utils.common.mp4_box_builder import Mp4BoxBuilder
+
+STTS_ENTRIES = [(1000, 1001), (1, 2002), (59999, 1001)]
+KEY_FRAMES = [1, 49, 97, 4000000000]
+SAMPLE_SIZES = [70000, 1200, 0, 4294967295]
+
+
+def _stts() -> bytes:
+    return Mp4BoxBuilder.box(b'stts', struct.pack('>II', 0, len(STTS_ENTRIES)) + b''.join(struct.pack('>II', *entry) for entry in STTS_ENTRIES))
+
+
+def _stss() -> bytes:
+    return Mp4BoxBuilder.box(b'stss', struct.pack(f'>II{len(KEY_FRAMES)}I', 0, len(KEY_FRAMES), *KEY_FRAMES))
+
+
+def _stsz(sample_size: int = 0) -> bytes:
+    entry_sizes = SAMPLE_SIZES if sample_size == 0 else []
+    return Mp4BoxBuilder.box(b'stsz', struct.pack(f'>III{len(entry_sizes)}I', 0, sample_size, len(SAMPLE_SIZES), *entry_sizes))
+
+
+def _decode(box: bytes, decoder):
+    return decoder(memoryview(box)[8:])
+
+
+def test_stts_matches_pymp4():
+    stts_table = _decode(_stts(), SampleTableDecoder.decode_stts)
+
+    stts_atom = Box.parse(_stts())
+    assert isinstance(stts_table.sample_counts, array)
+    assert list(stts_table.sample_counts) == [entry.sample_count for entry in stts_atom.entries]
+    assert list(stts_table.sample_deltas) == [entry.sample_delta for entry in stts_atom.entries]
+    assert STTSParser(stts_table).get_sample_count() == 61000
+
+
+def test_stss_matches_pymp4():
+    stss_table = _decode(_stss(), SampleTableDecoder.decode_stss)
+
+    assert list(stss_table.sample_numbers) == [entry.sample_number for entry in Box.parse(_stss()).entries]
+
+
+@pytest.mark.parametrize("sample_size", [0, 512])
+def test_stsz_matches_pymp4(sample_size):
+    stsz_table = _decode(_stsz(sample_size), SampleTableDecoder.decode_stsz)
+
+    stsz_atom = Box.parse(_stsz(sample_size))
+    assert stsz_table.sample_size == stsz_atom.sample_size
+    assert stsz_table.sample_count == stsz_atom.sample_count
+    assert list(stsz_table.entry_sizes) == list(stsz_atom.entry_sizes or [])
+    assert STSZParser(stsz_table).get_track_size() == (sum(SAMPLE_SIZES) if sample_size == 0 else sample_size * len(SAMPLE_SIZES))
+
+
+@pytest.mark.parametrize("box, decoder", [
+    (_stts()[:-4], SampleTableDecoder.decode_stts),
+    (_stss()[:10], SampleTableDecoder.decode_stss),
+    (_stsz()[:-1], SampleTableDecoder.decode_stsz),
+])
+def test_truncated_tables(box, decoder):
+    with pytest.raises(ValueError):
+        _decode(box, decoder)
+
+
+def test_box_index_parse_profile():
+    stco = Mp4BoxBuilder.box(b'stco', struct.pack('>III', 0, 1, 48))
+    stbl = Mp4BoxBuilder.box(b'stbl', _stts() + _stss() + _stsz() + stco)
+
+    box_index = BoxIndex(stbl, SampleTableDecoder.get_decoders())
+
+    assert list(box_index.get_box('stbl/stss').sample_numbers) == KEY_FRAMES
+    assert list(box_index.get_box('stbl/stsz').entry_sizes) == SAMPLE_SIZES
+    # Tables without decoder in the profile are decoded by pymp4 only if requested
+    assert box_index.get_box('stbl/stco').type == b'stco'
@@ -0,0 +1,85 @@
+"""
+Test module for the run-length chunking of the stts entries.
+"""
+
+import random
+from array import array
+from typing import List, Optional, Tuple
+
+import pytest
+
+from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.stss_parser import STSSParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.atom_parser.stts_parser import STTSParser
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.sample_table import SyncSampleTable, TimeToSampleTable
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_type import TrackType
+
+
+def _get_chunk_durations_per_sample(stts_entries: List[Tuple[int, int]], track_type: TrackType, timescale: int,
+                                    key_frames_numbers: Optional[List[int]] = None) -> list:
+    # Sample by sample implementation the chunking shall match
+    key_frames = [str(key_frame) for key_frame in key_frames_numbers or []]
+    chunk_durations = []
+    sample_number = 1
+    chunk_duration = 0
+    cumulative = 0
+    for sample_count, sample_duration in stts_entries:
+        cumulative += sample_count
+        while sample_number <= cumulative:
+            if track_type == TrackType.VIDEO and chunk_duration >= 2 * timescale and str(sample_number) in key_frames:
+                chunk_durations.append(chunk_duration / timescale)
+                chunk_duration = 0
+            elif chunk_duration > 2 * timescale:
+                chunk_durations.append(chunk_duration / timescale)
+                chunk_duration = 0
+            chunk_duration += sample_duration
+            sample_number += 1
+    chunk_durations.append(chunk_duration / timescale)
+    return chunk_durations
+
+
+def _stts_parser(stts_entries: List[Tuple[int, int]]) -> STTSParser:
+    return STTSParser(TimeToSampleTable(array('I', [count for count, _ in stts_entries]), array('I', [delta for _, delta in stts_entries])))
+
+
+@pytest.mark.parametrize("stts_entries, key_frames_numbers", [
+    # 25 fps, key frame every 2 seconds: chunks are cut at the key frames
+    ([(500, 1000)], list(range(1, 501, 50))),
+    # 29.97 fps, key frame every 60 frames
+    ([(1800, 1001)], list(range(1, 1801, 60))),
+    # Irregular key frames and a variable frame duration
+    ([(10, 1000), (3, 0), (40, 500), (1, 25000), (100, 1000)], [1, 20, 41, 42, 43, 60, 100, 150]),
+    # Zero durations reaching the segment duration exactly
+    ([(50, 1000), (5, 0), (20, 1000)], [1, 52, 54]),
+    ([(50, 1000), (5, 0), (20, 1000)], [1, 70]),
+])
+def test_video_chunks_match_sample_by_sample_chunking(stts_entries, key_frames_numbers):
+    chunk_durations = _stts_parser(stts_entries).get_chunk_durations_from_stts(TrackType.VIDEO, 25000, array('I', key_frames_numbers))
+
+    assert chunk_durations.to_seconds() == _get_chunk_durations_per_sample(stts_entries, TrackType.VIDEO, 25000, key_frames_numbers)
+
+
+def test_audio_chunks_match_sample_by_sample_chunking():
+    stts_entries = [(4000, 1024), (1, 512), (0, 1024), (300, 1024)]
+
+    chunk_durations = _stts_parser(stts_entries).get_chunk_durations_from_stts(TrackType.AUDIO, 48000)
+
+    assert chunk_durations.to_seconds() == _get_chunk_durations_per_sample(stts_entries, TrackType.AUDIO, 48000)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_tracks_match_sample_by_sample_chunking(seed):
+    generator = random.Random(seed)
+    timescale = generator.choice([600, 1000, 24000, 90000])
+    stts_entries = [(generator.randint(0, 200), generator.choice([0, 1, timescale // 50, timescale // 25, timescale // 2, generator.randint(1, timescale)]))
+                    for _ in range(generator.randint(1, 30))]
+    samples_count = sum(count for count, _ in stts_entries)
+    key_frames_numbers = sorted(generator.sample(range(1, samples_count + 2), min(samples_count + 1, generator.randint(1, 60))))
+
+    chunk_durations = _stts_parser(stts_entries).get_chunk_durations_from_stts(TrackType.VIDEO, timescale, array('I', key_frames_numbers))
+
+    assert chunk_durations.to_seconds() == _get_chunk_durations_per_sample(stts_entries, TrackType.VIDEO, timescale, key_frames_numbers)
+
+
+def test_key_frames_numbers_are_sorted_integers():
+    assert list(STSSParser(SyncSampleTable(array('I', [1, 61, 31]))).get_key_frames_numbers_from_stss()) == [1, 31, 61]
+    assert STSSParser(None).get_key_frames_numbers_from_stss() is None
@@ -0,0 +1,96 @@
+"""
+Test module for the struct-based decoder of the traf boxes of moof boxes.
+"""
+
+import pytest
+
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_box_extractor.media_box_extractor import MediaBoxExtractor
+from external_asset_ism_ismc_generation_tool.media_data_parser.track_fragment_decoder import TrackFragmentDecoder
+from external_asset_ism_ismc_generation_tool.text_data_parser.cmft_packager import CmftPackager
+from tests.test_utils.common.mp4_box_builder import Mp4BoxBuilder
+
+DURATIONS = [1001, 1002, 1003, 1004]
+SIZES = [4000, 300, 200, 100]
+
+
+@pytest.mark.parametrize("trun_options", [
+    {},
+    {'sample_flags': True},
+    {'composition_time_offsets': True},
+    {'sample_flags': True, 'composition_time_offsets': True, 'data_offset': 120, 'first_sample_flags': 0x02000000},
+])
+def test_trun_sample_table_layouts(trun_options):
+    moof_box = Mp4BoxBuilder.moof(Mp4BoxBuilder.traf(
+        Mp4BoxBuilder.tfhd(3, base_data_offset=0, sample_description_index=1),
+        Mp4BoxBuilder.tfdt(90000, version=0),
+        Mp4BoxBuilder.trun(DURATIONS, SIZES, **trun_options),
+    ))
+
+    track_fragments = TrackFragmentDecoder.decode_moof(moof_box)
+
+    assert len(track_fragments) == 1
+    track_fragment = track_fragments[0]
+    assert track_fragment.track_id == 3
+    assert track_fragment.sample_count == 4
+    assert track_fragment.decode_time == 90000
+    assert track_fragment.samples_duration == sum(DURATIONS)
+    assert track_fragment.samples_size == sum(SIZES)
+    assert track_fragment.default_sample_duration is None
+
+
+def test_matches_pymp4_parsing():
+    moof_box = Mp4BoxBuilder.moof(
+        Mp4BoxBuilder.traf(Mp4BoxBuilder.tfhd(1, default_sample_duration=512, default_sample_size=17),
+                           Mp4BoxBuilder.tfdt(2 ** 40), Mp4BoxBuilder.trun(sample_count=6)),
+        Mp4BoxBuilder.traf(Mp4BoxBuilder.tfhd(2), Mp4BoxBuilder.trun(DURATIONS, SIZES, sample_flags=True)),
+    )
+    moof_atom = MediaBoxExtractor.get_mp4_box(MediaBoxExtractor.extract_media_boxes(moof_box), 'moof')
+
+    track_fragments = TrackFragmentDecoder.decode_moof(moof_box)
+
+    traf_atoms = MediaBoxExtractor.get_all_mp4_sub_boxes(moof_atom, 'traf')
+    assert len(track_fragments) == len(traf_atoms)
+    for track_fragment, traf_atom in zip(track_fragments, traf_atoms):
+        tfhd_atom = MediaBoxExtractor.get_mp4_sub_box(traf_atom, 'tfhd')
+        tfdt_atom = MediaBoxExtractor.get_mp4_sub_box(traf_atom, 'tfdt')
+        trun_atom = MediaBoxExtractor.get_mp4_sub_box(traf_atom, 'trun')
+        assert track_fragment.track_id == tfhd_atom.track_ID
+        assert track_fragment.default_sample_duration == tfhd_atom.default_sample_duration
+        assert track_fragment.default_sample_size == tfhd_atom.default_sample_size
+        assert track_fragment.decode_time == (tfdt_atom.baseMediaDecodeTime if tfdt_atom else None)
+        assert track_fragment.sample_count == trun_atom.sample_count
+    assert track_fragments[0].samples_duration is None
+    assert track_fragments[0].samples_size is None
+    assert track_fragments[1].samples_duration == sum(sample.sample_duration for sample in trun_atom.sample_info)
+    assert track_fragments[1].samples_size == sum(sample.sample_size for sample in trun_atom.sample_info)
+
+
+def test_cmft_moof_boxes():
+    cmft_data = CmftPackager.package([(0.0, "<tt>a</tt>"), (2.0, "<tt>bb</tt>")], total_duration=4.0)
+    moof_boxes = [cmft_data[box.offset:box.end] for box in MediaBoxExtractor.extract_media_boxes(cmft_data) if box.type == b'moof']
+
+    track_fragments = [TrackFragmentDecoder.decode_moof(moof_box)[0] for moof_box in moof_boxes]
+
+    assert [track_fragment.samples_duration for track_fragment in track_fragments] == [20000000, 20000000]
+    assert all(track_fragment.sample_count == 1 and track_fragment.decode_time is None for track_fragment in track_fragments)
+
+
+def test_large_size_traf_and_multiple_truns():
+    traf = Mp4BoxBuilder.box(b'traf', Mp4BoxBuilder.tfhd(1) + Mp4BoxBuilder.trun(DURATIONS, SIZES) + Mp4BoxBuilder.trun([10], [20]),
+                             large_size=True)
+
+    track_fragment = TrackFragmentDecoder.decode_moof(Mp4BoxBuilder.moof(traf))[0]
+
+    assert track_fragment.sample_count == 5
+    assert track_fragment.samples_duration == sum(DURATIONS) + 10
+    assert track_fragment.samples_size == sum(SIZES) + 20
+
+
+@pytest.mark.parametrize("data", [
+    Mp4BoxBuilder.box(b'mdat', b'\x00' * 8),
+    Mp4BoxBuilder.moof(Mp4BoxBuilder.traf(Mp4BoxBuilder.trun(DURATIONS, SIZES))),
+    Mp4BoxBuilder.moof(Mp4BoxBuilder.traf(Mp4BoxBuilder.tfhd(1), Mp4BoxBuilder.trun(DURATIONS, SIZES)))[:-4],
+])
+def test_invalid_moof_box(data):
+    with pytest.raises(ValueError):
+        TrackFragmentDecoder.decode_moof(data)
@@ -0,0 +1,55 @@
+"""
+Test module for the run-length encoded track timeline.
+"""
+
+from array import array
+
+from external_asset_ism_ismc_generation_tool.media_data_parser.model.track_timeline import TrackTimeline
+
+
+def test_from_durations_merges_equal_consecutive_durations():
+    timeline = TrackTimeline.from_durations(48000, [96256, 96256, 96256, 95232, 96256, 96256])
+
+    assert timeline.durations == array('q', [96256, 95232, 96256])
+    assert timeline.counts == array('q', [3, 1, 2])
+    assert list(timeline.runs()) == [(96256, 3), (95232, 1), (96256, 2)]
+    assert len(timeline) == 6
+    assert list(timeline) == [96256, 96256, 96256, 95232, 96256, 96256]
+    assert timeline.get_total_duration() == 96256 * 5 + 95232
+
+
+def test_to_seconds():
+    timeline = TrackTimeline(25000)
+    timeline.append(50000, 2)
+    timeline.append(30000)
+
+    assert timeline.to_seconds() == [2.0, 2.0, 1.2]
+
+
+def test_empty_timeline():
+    timeline = TrackTimeline(1000)
+    timeline.append(2000, 0)
+
+    assert not timeline
+    assert len(timeline) == 0
+    assert timeline.to_seconds() == []
+
+
+def test_equality_across_timescales():
+    assert TrackTimeline.from_durations(1000, [2000, 2000, 1000]) == TrackTimeline.from_durations(10000000, [20000000, 20000000, 10000000])
+    assert TrackTimeline.from_durations(1000, [2000, 2000]) != TrackTimeline.from_durations(1000, [2000, 2001])
+    assert TrackTimeline.from_durations(1000, [2000]) != TrackTimeline.from_durations(2000, [4000, 4000])
+
+
+def test_fingerprint():
+    timeline = TrackTimeline.from_durations(1000, [2000, 2000, 1000])
+    fingerprint = timeline.get_fingerprint()
+
+    assert fingerprint == TrackTimeline.from_durations(10000000, [20000000, 20000000, 10000000]).get_fingerprint()
+    assert fingerprint != TrackTimeline.from_durations(1000, [2000, 1000, 2000]).get_fingerprint()
+    assert hash(timeline) == hash(TrackTimeline.from_durations(90000, [180000, 180000, 90000]))
+
+    timeline.append(1000)
+    assert timeline.get_fingerprint() != fingerprint
+    assert timeline.get_fingerprint() == TrackTimeline.from_durations(1000, [2000, 2000, 1000, 1000]).get_fingerprint()
+
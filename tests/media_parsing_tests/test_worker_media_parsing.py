@@ -0,0 +1,43 @@
+from external_asset_ism_ismc_generation_tool.media_data_parser.media_data_parser import MediaDataParser
+from external_asset_ism_ismc_generation_tool.local_data_handler.local_data_handler import LocalDataHandler
+from external_asset_ism_ismc_generation_tool.local_file_client.local_file_service_client import LocalFileServiceClient
+from external_asset_ism_ismc_generation_tool.mss_client_manifest.ismc_generator import IsmcGenerator
+from tests.test_utils.common.common import Common
+
+
+def _write_media_files(directory) -> dict:
+    media_datas = Common.get_test_data_from_json(Common.get_data_file_path('test_timescale_0_data.json'))['media_datas']
+    for file_name, media_data in media_datas.items():
+        # The fragments follow the moov box, as in a fragmented file without mdat payload
+        (directory / file_name).write_bytes(media_data['moov'] + b''.join(media_data['moofs']))
+    return media_datas
+
+
+def test_workers_parse_the_same_media_data_as_the_parent_process(tmp_path):
+    media_datas = _write_media_files(tmp_path)
+    settings = {'local_directory': str(tmp_path), 'is_multithreading': True, 'parse_in_workers': True}
+
+    media_data = MediaDataParser.get_media_data_in_workers(sorted(media_datas), [], settings)
+    expected_media_data = MediaDataParser.get_media_data(media_datas)
+
+    assert media_data.media_duration == expected_media_data.media_duration
+    assert IsmcGenerator.generate(duration=media_data.media_duration, media_track_infos=media_data.media_track_info_list) == \
+        IsmcGenerator.generate(duration=expected_media_data.media_duration, media_track_infos=expected_media_data.media_track_info_list)
+
+
+def test_data_handler_lists_the_media_files_parsed_in_workers(tmp_path):
+    media_datas = _write_media_files(tmp_path)
+    settings = {'local_directory': str(tmp_path), 'is_multithreading': True, 'parse_in_workers': True}
+
+    blob_media_data = LocalDataHandler.get_data_from_local_files(LocalFileServiceClient(settings), settings)
+
+    assert sorted(blob_media_data.media_blob_names) == sorted(media_datas)
+    assert not blob_media_data.media_datas
+    assert blob_media_data.media_index_blob_names == []
+
+
+def test_parse_in_workers_requires_multithreading():
+    assert MediaDataParser.is_parse_in_workers({'parse_in_workers': True, 'is_multithreading': True})
+    assert not MediaDataParser.is_parse_in_workers({'parse_in_workers': True})
+    assert not MediaDataParser.is_parse_in_workers({'is_multithreading': True})
+    assert not MediaDataParser.is_parse_in_workers(None)
@@ -0,0 +1,75 @@
+import struct
+from typing import List, Optional, Sequence
+
+
+class Mp4BoxBuilder:
+    """
+    Builds the raw bytes of the fragment boxes used by the media parsing tests.
+    """
+
+    @staticmethod
+    def box(box_type: bytes, payload: bytes, large_size: bool = False) -> bytes:
+        if large_size:
+            return struct.pack('>I4sQ', 1, box_type, len(payload) + 16) + payload
+        return struct.pack('>I4s', len(payload) + 8, box_type) + payload
+
+    @staticmethod
+    def tfhd(track_id: int, default_sample_duration: Optional[int] = None, default_sample_size: Optional[int] = None,
+             base_data_offset: Optional[int] = None, sample_description_index: Optional[int] = None) -> bytes:
+        flags = 0
+        fields = b''
+        if base_data_offset is not None:
+            flags |= 0x000001
+            fields += struct.pack('>Q', base_data_offset)
+        if sample_description_index is not None:
+            flags |= 0x000002
+            fields += struct.pack('>I', sample_description_index)
+        if default_sample_duration is not None:
+            flags |= 0x000008
+            fields += struct.pack('>I', default_sample_duration)
+        if default_sample_size is not None:
+            flags |= 0x000010
+            fields += struct.pack('>I', default_sample_size)
+        return Mp4BoxBuilder.box(b'tfhd', struct.pack('>II', flags, track_id) + fields)
+
+    @staticmethod
+    def tfdt(decode_time: int, version: int = 1) -> bytes:
+        time_format = '>Q' if version == 1 else '>I'
+        return Mp4BoxBuilder.box(b'tfdt', struct.pack('>I', version << 24) + struct.pack(time_format, decode_time))
+
+    @staticmethod
+    def trun(durations: Optional[Sequence[int]] = None, sizes: Optional[Sequence[int]] = None, sample_count: Optional[int] = None,
+             sample_flags: bool = False, composition_time_offsets: bool = False,
+             data_offset: Optional[int] = None, first_sample_flags: Optional[int] = None) -> bytes:
+        if sample_count is None:
+            sample_count = len(durations if durations is not None else sizes)
+        flags = 0
+        header = b''
+        if data_offset is not None:
+            flags |= 0x000001
+            header += struct.pack('>i', data_offset)
+        if first_sample_flags is not None:
+            flags |= 0x000004
+            header += struct.pack('>I', first_sample_flags)
+        columns: List[Sequence[int]] = []
+        for flag, column in ((0x000100, durations), (0x000200, sizes),
+                             (0x000400, [0x01010000] * sample_count if sample_flags else None),
+                             (0x000800, list(range(sample_count)) if composition_time_offsets else None)):
+            if column is not None:
+                flags |= flag
+                columns.append(column)
+        samples = b''.join(struct.pack(f'>{len(columns)}I', *values) for values in zip(*columns)) if columns else b''
+        return Mp4BoxBuilder.box(b'trun', struct.pack('>II', flags, sample_count) + header + samples)
+
+    @staticmethod
+    def traf(*boxes: bytes) -> bytes:
+        return Mp4BoxBuilder.box(b'traf', b''.join(boxes))
+
+    @staticmethod
+    def moof(*trafs: bytes, sequence_number: int = 1) -> bytes:
+        mfhd = Mp4BoxBuilder.box(b'mfhd', struct.pack('>II', 0, sequence_number))
+        return Mp4BoxBuilder.box(b'moof', mfhd + b''.join(trafs))
+
+    @staticmethod
+    def trex(track_id: int, default_sample_duration: int = 0, default_sample_size: int = 0) -> bytes:
+        return Mp4BoxBuilder.box(b'trex', struct.pack('>IIIIII', 0, track_id, 1, default_sample_duration, default_sample_size, 0))